@@ -0,0 +1,26 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+
+
+def _load(name: str, filename: str):
+    spec = importlib.util.spec_from_file_location(name, TOOLS / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def tarayici():
+    pytest.importorskip("PySide6.QtWebEngineCore")
+    return _load("tarayici", "tarayıcı.py")
+
+
+@pytest.fixture(scope="session")
+def asistan():
+    for mod in ("speech_recognition", "pyttsx3", "requests"):
+        pytest.importorskip(mod)
+    return _load("sesli_asistan", "sesli_asistan.py")
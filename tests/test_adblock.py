@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture
+def blocker(tarayici):
+    def make(*rules):
+        b = tarayici.ContentBlocker()
+        for rule in rules:
+            b.add_rule(rule)
+        return b
+    return make
+
+
+def test_bare_domain_blocks_host_and_subdomains(blocker):
+    b = blocker("ads.example.com")
+    assert b.should_block("https://ads.example.com/x.js", "ads.example.com", "site.com", "script")
+    assert b.should_block("https://cdn.ads.example.com/x.js", "cdn.ads.example.com", "site.com", "script")
+    assert not b.should_block("https://example.com/x.js", "example.com", "site.com", "script")
+
+
+@pytest.mark.parametrize("rule, url, host", [
+    ("-ad-banner.", "https://site.com/img/top-ad-banner.gif", "site.com"),
+    (".adriver.", "https://foo.adriver.ru/x", "foo.adriver.ru"),
+])
+def test_substring_rules_are_patterns_not_domains(blocker, rule, url, host):
+    b = blocker(rule)
+    assert b.should_block(url, host, "site.com", "image")
+    assert not b.should_block("https://site.com/index.html", "site.com", "site.com", "image")
+
+
+def test_hosts_file_skips_local_entries(blocker):
+    b = blocker("127.0.0.1 localhost", "::1 ip6-localhost", "0.0.0.0 0.0.0.0", "0.0.0.0 tracker.net")
+    assert not b.should_block("http://localhost:8000/app.js", "localhost", "localhost", "script")
+    assert b.should_block("http://tracker.net/p.gif", "tracker.net", "site.com", "image")
+
+
+def test_negated_type_excludes_only_that_type(blocker):
+    b = blocker("||cdn.com^$~script")
+    assert not b.should_block("https://cdn.com/a.js", "cdn.com", "site.com", "script")
+    assert b.should_block("https://cdn.com/a.png", "cdn.com", "site.com", "image")
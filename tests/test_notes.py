@@ -0,0 +1,14 @@
+def test_search_returns_newest_matches_first(asistan, tmp_path):
+    store = asistan.NotesStore(str(tmp_path / "notes.jsonl"))
+    for i in range(30):
+        store.add(f"market listesi {i}" if i % 3 else f"market ekmek {i}")
+    store.add("ekmek al")
+    results = store.search("market ekmek", limit=3)
+    assert [r["note"] for r in results] == ["market ekmek 27", "market ekmek 24", "market ekmek 21"]
+    assert store.search("ekmek süt") == []
+
+
+def test_search_reloads_from_disk(asistan, tmp_path):
+    path = str(tmp_path / "notes.jsonl")
+    asistan.NotesStore(path).add("doktor randevusu")
+    assert [r["note"] for r in asistan.NotesStore(path).search("randevusu")] == ["doktor randevusu"]
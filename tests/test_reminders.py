@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import pytest
+
+NOW = datetime(2026, 10, 19, 10, 0)
+
+
+@pytest.mark.parametrize("text, due, message", [
+    ("3'te ilacı al", datetime(2026, 10, 19, 15, 0), "ilacı al"),
+    ("8'de ara", datetime(2026, 10, 19, 20, 0), "ara"),
+    ("sabah 8'de koş", datetime(2026, 10, 20, 8, 0), "koş"),
+    ("saat 14:30'da toplantı", datetime(2026, 10, 19, 14, 30), "toplantı"),
+    ("14.30da toplantı", datetime(2026, 10, 19, 14, 30), "toplantı"),
+    ("gece 12'de ilaç", datetime(2026, 10, 20, 0, 0), "ilaç"),
+    ("yarın gece 12'de ilaç", datetime(2026, 10, 21, 0, 0), "ilaç"),
+    ("20 dakika sonra çay", datetime(2026, 10, 19, 10, 20), "çay"),
+])
+def test_clock_times(asistan, text, due, message):
+    assert asistan.parse_reminder_time(text, NOW) == (due, message)
+
+
+def test_bare_number_is_not_a_clock_time(asistan):
+    # "2 de olsa ara": saat değil, varsayılan 5 dakika sonrası
+    due, message = asistan.parse_reminder_time("2 de olsa ara", NOW)
+    assert due == datetime(2026, 10, 19, 10, 5)
+    assert message == "2 de olsa ara"
+
+
+def test_past_time_today_is_never_in_the_past(asistan):
+    due, _ = asistan.parse_reminder_time("bugün sabah 8'de rapor", NOW)
+    assert due == datetime(2026, 10, 20, 8, 0)
@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture
+def router(asistan):
+    router = asistan.IntentRouter()
+    router.register(r"hesapla\s*(.*)|matematik\s*(.*)", lambda param="": param, "calc")
+    router.register(r"((?:hava)\s*durumu)\s*(\w+)?", lambda param="": param, "weather")
+    router.register(r"(çal|oynat)\s+(?P<param>.+)", lambda param="": param, "play")
+    return router
+
+
+@pytest.mark.parametrize("text, name, param", [
+    ("hesapla 2 artı 2", "calc", "2 artı 2"),
+    ("matematik 3 çarpı 4", "calc", "3 çarpı 4"),
+    # İç içe gruplarda ilk boş olmayan grup döner, son grup değil
+    ("hava durumu ankara", "weather", "hava durumu"),
+    ("oynat caz müziği", "play", "caz müziği"),
+])
+def test_parameter_rule(router, text, name, param):
+    item, found = router.match(text)
+    assert (item.name, found) == (name, param)
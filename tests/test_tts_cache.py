@@ -0,0 +1,32 @@
+import os
+import threading
+
+
+def _speech(asistan, tmp_path, **config):
+    return asistan.SpeechOutput(dict(config, cache_dir=str(tmp_path)), threading.Event())
+
+
+def test_dynamic_replies_are_not_cached(asistan, tmp_path):
+    tts = _speech(asistan, tmp_path, cache_after=1)
+    assert not tts._should_cache("Şu an saat 08:21")
+    assert not tts._should_cache("Hatırlatma: süt al")
+    assert not tts._should_cache("Not bir: süt al")
+    assert tts._should_cache("Tamam.")
+
+
+def test_repeat_counts_are_bounded(asistan, tmp_path):
+    tts = _speech(asistan, tmp_path)
+    for i in range(tts.COUNTS_LIMIT + 50):
+        tts._should_cache("cümle " + "a" * (i % 40) + "b" * (i // 40))
+    assert len(tts._counts) == tts.COUNTS_LIMIT
+
+
+def test_eviction_keeps_recently_played(asistan, tmp_path):
+    tts = _speech(asistan, tmp_path, cache_max_files=3)
+    (tmp_path / "voice.txt").write_text("x")
+    for i in range(6):
+        path = tmp_path / f"{i}.wav"
+        path.write_bytes(b"0" * 100)
+        os.utime(path, (i, i))
+    tts._evict()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["3.wav", "4.wav", "5.wav", "voice.txt"]
@@ -14,7 +14,7 @@ Gelişmiş Sesli Asistan
 - Güvenlik kontrolü
 
 Gereksinimler:
-pip install speechrecognition pyttsx3 pyaudio requests wikipedia-api
+pip install speechrecognition pyttsx3 pyaudio requests
 
 Kullanım:
 python sesli_asistan.py
@@ -24,22 +24,44 @@ import os
 import sys
 import json
 import re
+import ast
+import math
+import operator
+import functools
+import inspect
+import wave
+import hashlib
+import sqlite3
+import heapq
+import bisect
 import time
+import queue
 import threading
 import subprocess
 import webbrowser
+from array import array
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 import logging
 
+try:
+    import audioop  # Python 3.13'te standart kütüphaneden kaldırıldı
+except ImportError:
+    audioop = None
+
+try:
+    import psutil  # İsteğe bağlı: sistem bilgisi ve örnekleyici için
+except ImportError:
+    psutil = None
+
 try:
     import speech_recognition as sr
     import pyttsx3
     import requests
-    import wikipediaapi as wikipedia
 except ImportError as e:
     print(f"❌ Gerekli kütüphane eksik: {e}")
-    print("Kurmak için: pip install speechrecognition pyttsx3 pyaudio requests wikipedia-api")
+    print("Kurmak için: pip install speechrecognition pyttsx3 pyaudio requests")
     sys.exit(1)
 
 # Logging yapılandırması
@@ -53,149 +75,2221 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Kullanıcı ayarları (çalışma dizinindeki JSON dosyası varsayılanların üzerine yazılır)
+CONFIG_FILE = "assistant_config.json"
+DEFAULT_CONFIG: Dict[str, Dict[str, Any]] = {
+    "assistant": {
+        "data_dir": ".",  # Notlar ve hatırlatıcılar bu klasörde tutulur
+        "transcript_log": "assistant_transcripts.log",  # Yeniden oynatma için duyulan komutlar
+    },
+    "recognizer": {
+        # Sırayla denenir; erişilemeyen motor atlanıp bir sonrakine geçilir
+        "backends": ["google"],
+        "language": "tr-TR",
+        "vosk_model": "models/vosk-model-small-tr-0.3",
+        "whisper_model": "small",
+        "retry_after": 30,  # Hata veren motoru kaç saniye atla
+    },
+    "vad": {
+        # Sabit başlangıç kalibrasyonu yerine gürültü tabanı sürekli izlenir
+        "threshold": 300,          # İlk eşik; ilk yarım saniyede ortama hızla uyar
+        "dynamic_threshold": True,
+        "noise_ratio": 1.5,        # Eşik = gürültü tabanı × oran
+        "damping": 0.15,           # Saniye başına eski eşiğin korunan payı (küçük = hızlı uyum)
+        "min_threshold": 50,
+        "warmup": 0.5,             # saniye
+    },
+    "fuzzy": {
+        # Hiçbir desen eşleşmezse örnek cümlelere en yakın komut denenir
+        "enabled": True,
+        "min_confidence": 0.8,
+    },
+    "pipeline": {
+        "command_queue": 4,        # Yürütülmeyi bekleyen en fazla komut
+        "followup_timeout": 10,    # Tek başına uyandırma kelimesinden sonra komut bekleme süresi
+        "barge_in": False,         # Asistan konuşurken araya girince sözü kes
+        "barge_in_ratio": 3.0,     # Kesme için gereken enerji (eşiğin katı); hoparlör yankısına karşı
+        "barge_in_frames": 3,      # Üst üste bu kadar yüksek kare kesme sayılır
+    },
+    "system": {
+        "sample_interval": 5,   # saniye; 0 ise arka plan örnekleyici kapalı
+        "history_minutes": 30,  # Halka tamponlarda tutulan geçmiş
+        "trend_minutes": 5,     # system_info'nun söylediği ortalama penceresi
+    },
+    "metrics": {
+        "dump_file": "assistant_metrics.json",  # Aşama süreleri histogramları; boşsa yazılmaz
+        "dump_interval": 60,  # saniye
+    },
+    "tts": {
+        "rate": 180,
+        "volume": 0.8,
+        "cache_dir": "~/.sesli_asistan/tts_cache",
+        "cache_after": 2,  # Bu kadar tekrarlanan kısa cümleler de önbelleğe alınır
+        "cache_max_chars": 80,
+        "cache_max_files": 200,  # Aşılırsa en uzun süredir çalınmayan WAV dosyaları silinir
+        "cache_max_mb": 50,
+    },
+    "wikipedia": {
+        "api_url": "https://tr.wikipedia.org/w/api.php",
+        "cache_file": "~/.sesli_asistan/wiki_cache.db",
+        "ttl_hours": 168,
+        "miss_ttl_hours": 6,  # "Bulunamadı" yanıtları daha kısa süre saklanır
+        "max_entries": 2000,
+        "timeout": 5,
+    },
+}
+
+
+def load_config(path: str = CONFIG_FILE) -> Dict[str, Dict[str, Any]]:
+    """Varsayılan ayarları dosyadaki değerlerle birleştir"""
+    config = {section: dict(values) for section, values in DEFAULT_CONFIG.items()}
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for section, values in json.load(f).items():
+                    if isinstance(values, dict):
+                        config.setdefault(section, {}).update(values)
+    except Exception as e:
+        logger.error(f"Ayar dosyası okunamadı: {e}")
+    return config
 
-class VoiceAssistant:
-    """Gelişmiş Sesli Asistan Sınıfı"""
 
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.tts_engine = pyttsx3.init()
-        self.is_listening = False
-        self.wake_words = ["asistan", "hey asistan", "bilgisayar"]
-        self.exit_words = ["çık", "kapat", "durdur", "bitir"]
+class LatencyHistogram:
+    """Logaritmik kovalı süre histogramı (milisaniye)
 
-        # Komut eşleştirme desenleri
-        self.command_patterns = {
-            r"saat\s*kaç|saati\s*söyle": self.get_time,
-            r"tarih\s*ne|bugün\s*ne": self.get_date,
-            r"hava\s*durumu|hava\s*nasıl": self.get_weather,
-            r"hesapla\s*(.*)|matematik\s*(.*)": self.calculate,
-            r"arama\s*yap\s*(.*)|google.*arama\s*(.*)": self.web_search,
-            r"wikipedia.*ara\s*(.*)|vikipedi.*ara\s*(.*)": self.wikipedia_search,
-            r"müzik\s*aç|youtube.*müzik": self.play_music,
-            r"not\s*al\s*(.*)|kaydet\s*(.*)": self.take_note,
-            r"notları\s*oku|notları\s*göster": self.read_notes,
-            r"sistem\s*bilgisi|bilgisayar\s*durumu": self.system_info,
-            r"uygulama\s*aç\s*(.*)|program\s*aç\s*(.*)": self.open_application,
-            r"dosya\s*aç\s*(.*)|klasör\s*aç\s*(.*)": self.open_file,
-            r"ses\s*seviyesi\s*(.*)|volume\s*(.*)": self.volume_control,
-            r"ekran\s*görüntüsü|screenshot": self.take_screenshot,
-            r"hatırlatıcı\s*kur\s*(.*)|alarm\s*kur\s*(.*)": self.set_reminder,
-            r"yardım|komutlar|neler\s*yapabilirsin": self.show_help,
+    Tüm örnekleri saklamak yerine sabit kovalarda sayar; yüzdelikler kova
+    üst sınırından tahmin edilir, en küçük/en büyük değerler kesindir.
+    """
+
+    BOUNDS_MS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500,
+                 1000, 2000, 5000, 10000, 20000, 60000]
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, ms: float):
+        idx = 0
+        while idx < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[idx]:
+            idx += 1
+        self.buckets[idx] += 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = self.BOUNDS_MS[idx] if idx < len(self.BOUNDS_MS) else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max,
+            "buckets": {("+inf" if idx == len(self.BOUNDS_MS) else f"<={self.BOUNDS_MS[idx]:g}"): n
+                        for idx, n in enumerate(self.buckets) if n},
         }
 
-        # TTS ayarları
-        self.setup_tts()
 
-        # Mikrofon kalibrasyonu
-        self.calibrate_microphone()
+class StageMetrics:
+    """Sesli etkileşimin aşama sürelerini toplayan, iş parçacığı güvenli kayıt
 
-        # Notlar dosyası
-        self.notes_file = "assistant_notes.json"
-        self.load_notes()
+    Aşamalar: capture_wait (bölütün tanımayı beklediği süre), audio_length,
+    recognition, intent_match, handler, tts_queue_wait, tts_synthesis,
+    tts_playback, tts_direct (önbelleksiz sentez + çalma), total
+    (konuşmanın bitişinden komutun tamamlanmasına kadar) ve startup.
+    """
 
-        # Hatırlatıcılar
-        self.reminders = []
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+        self._stop_event = threading.Event()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = LatencyHistogram()
+            hist.add(seconds * 1000)
+
+    def get(self, stage: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get(stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: hist.to_dict() for name, hist in sorted(self.histograms.items())}
+        return {"since": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                "written": datetime.now().isoformat(timespec="seconds"),
+                "stages": stages}
+
+    def dump(self, path: str):
+        """Anlık görüntüyü JSON olarak yaz (önce geçici dosyaya, sonra atomik taşı)"""
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.error(f"Metrik dosyası yazılamadı: {e}")
+
+    def start_periodic_dump(self, path: str, interval: float):
+        """Arka planda her 'interval' saniyede bir dosyaya yaz"""
+        def loop():
+            while not self._stop_event.wait(interval):
+                self.dump(path)
+
+        threading.Thread(target=loop, name="metrics-dump", daemon=True).start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def summary(self) -> str:
+        """Ana aşamaların okunabilir özeti"""
+        parts = []
+        for stage in ("recognition", "intent_match", "handler", "tts_synthesis", "tts_playback", "total"):
+            hist = self.get(stage)
+            if hist and hist.count:
+                parts.append(f"{stage} p50 {hist.percentile(50):.1f} ms / p95 {hist.percentile(95):.1f} ms")
+        return "Aşama süreleri: " + (", ".join(parts) if parts else "henüz ölçüm yok")
+
+
+# Ön filtre anahtarını sonlandıran regex özel karakterleri
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def intent(pattern: str, name: Optional[str] = None, examples: Optional[List[str]] = None):
+    """Metodu sesli komut işleyicisi olarak işaretle (eklenti API'si)
+
+    'examples' yanlış tanınan komutlar için yaklaşık eşleşmede kullanılır;
+    verilmezse desenin dallarındaki sabit metinden çıkarılır.
+
+    İşleyiciye giden parametre, desende varsa '(?P<param>...)' adlı grubun
+    metnidir; yoksa boş olmayan ilk yakalama grubudur. İç içe ya da yalnızca
+    gruplama için kullanılan parantezlerde '(?:...)' ya da 'param' adı tercih
+    edilmelidir.
+
+    Örnek:
+        class HavaEklentisi:
+            @intent(r"yağmur\\s*yağacak\\s*mı", examples=["yağmur yağacak mı"])
+            def rain(self, param: str = ""):
+                ...
+    """
+    def decorator(func: Callable) -> Callable:
+        func.__dict__.setdefault("_intents", []).append((pattern, name or func.__name__, examples))
+        return func
+    return decorator
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Desenin en üst seviyedeki '|' dallarını ayır"""
+    branches = []
+    depth = 0
+    start = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _leading_literal(branch: str) -> str:
+    """Dalın başındaki sabit metni döndür; eşleşen her metin bunu içermek zorundadır"""
+    i = 1 if branch.startswith("^") else 0
+    literal = []
+    while i < len(branch) and branch[i] not in _REGEX_META:
+        literal.append(branch[i])
+        i += 1
+    # 'abc?' gibi durumlarda son karakter isteğe bağlıdır
+    if literal and i < len(branch) and branch[i] in "*?{":
+        literal.pop()
+    return "".join(literal)
+
+
+def _example_phrases(pattern: str) -> List[str]:
+    """Desenin her dalından parametresiz örnek cümle çıkar ("hesapla\\s*(.*)" → "hesapla")"""
+    phrases = []
+    for branch in _split_alternatives(pattern):
+        text = re.sub(r"\\s[*+?]?", " ", branch.lstrip("^"))
+        text = re.split(r"\(|\.\*|\.\+", text, maxsplit=1)[0]
+        text = " ".join("".join(c for c in text if c not in _REGEX_META).split())
+        if text and text not in phrases:
+            phrases.append(text)
+    return phrases
+
+
+# Tanıyıcının Türkçe karakterleri atlamasına dayanıklı katlama ("saat kac" = "saat kaç")
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+
+class FuzzyIntentIndex:
+    """Örnek cümleler üzerinde karakter trigram'ı ters indeksi
+
+    Boşluk ve noktalama atılıp Türkçe harfler katlanarak karşılaştırılır, böylece
+    "hesap la" ile "hesapla", "saat kac" ile "saat kaç" aynı anahtara düşer.
+    Aday cümleler indeksten ortak trigram sayısıyla seçilir; yalnızca en iyi
+    birkaçı için komut içinde kelime başından başlayan alt dizgi düzenleme
+    uzaklığı (Sellers) hesaplanır. Güven = 1 - uzaklık / cümle uzunluğu.
+    Hizalama kelime sonunda bitmeli ve örnek cümlenin hiçbir kelimesi yarı
+    yarıya hatalı olmamalı ("müzikal" ≠ "müzik aç").
+    """
+
+    N = 3
+
+    def __init__(self, candidates: int = 3):
+        self.candidates = candidates
+        self.phrases: List[Tuple[str, int]] = []  # (katlanmış anahtar, intent sırası)
+        self._word_ends: List[List[int]] = []     # Anahtarda her kelimenin bittiği konum
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def fold(text: str) -> str:
+        return tr_casefold(text).translate(_ASCII_FOLD)
+
+    @classmethod
+    def _grams(cls, key: str) -> set:
+        if len(key) <= cls.N:
+            return {key}
+        return {key[i:i + cls.N] for i in range(len(key) - cls.N + 1)}
+
+    def add(self, phrase: str, order: int):
+        words = ["".join(c for c in w if c.isalnum()) for w in self.fold(phrase).split()]
+        words = [w for w in words if w]
+        key = "".join(words)
+        if not key:
+            return
+        pid = len(self.phrases)
+        self.phrases.append((key, order))
+        ends, pos = [], 0
+        for w in words:
+            pos += len(w)
+            ends.append(pos)
+        self._word_ends.append(ends)
+        grams = self._grams(key)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(pid)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @staticmethod
+    def _align(phrase: str, text: str, starts: set) -> Tuple[int, int, List[List[int]]]:
+        """phrase'in text içinde kelime başından başlayıp kelime sonunda biten en iyi hizalaması: (uzaklık, bitiş)
+
+        Bitişin de kelime sınırında olması gerekir; yoksa "müzikal" gibi yalnızca
+        örnek cümleyle başlayan bir kelime "müzik" ile tam eşleşmiş sayılır.
+        """
+        m = len(phrase)
+        prev = [0 if j in starts else m for j in range(len(text) + 1)]
+        rows = [prev]
+        for i in range(1, m + 1):
+            pc = phrase[i - 1]
+            cur = [prev[0] + 1]
+            for j in range(1, len(text) + 1):
+                cost = prev[j - 1] + (pc != text[j - 1])
+                if prev[j] + 1 < cost:
+                    cost = prev[j] + 1
+                if cur[j - 1] + 1 < cost:
+                    cost = cur[j - 1] + 1
+                cur.append(cost)
+            prev = cur
+            rows.append(cur)
+        ends = [j for j in range(len(prev)) if j in starts or j == len(text)]
+        best = min(ends, key=prev.__getitem__)
+        return prev[best], best, rows
+
+    @staticmethod
+    def _char_errors(phrase: str, text: str, rows: List[List[int]], end: int) -> List[int]:
+        """Hizalamayı geri izleyip her cümle karakterine düşen hata sayısı"""
+        errors = [0] * len(phrase)
+        i, j = len(phrase), end
+        while i > 0:
+            here = rows[i][j]
+            if j > 0 and here == rows[i - 1][j - 1] + (phrase[i - 1] != text[j - 1]):
+                errors[i - 1] += phrase[i - 1] != text[j - 1]
+                i, j = i - 1, j - 1
+            elif here == rows[i - 1][j] + 1:
+                errors[i - 1] += 1  # Cümle karakteri eksik
+                i -= 1
+            else:
+                errors[i - 1] += 1  # Metinde fazladan karakter
+                j -= 1
+        return errors
+
+    def match(self, text: str) -> Optional[Tuple[int, float, str]]:
+        """En yakın (intent sırası, güven, kalan parametre) ya da None"""
+        folded = self.fold(text)
+        key = []
+        positions = []  # Anahtardaki her karakterin asıl metindeki yeri
+        starts = set()
+        prev_space = True
+        for idx, ch in enumerate(folded):
+            if ch.isspace():
+                prev_space = True
+                continue
+            if not ch.isalnum():
+                continue
+            if prev_space:
+                starts.add(len(key))
+                prev_space = False
+            key.append(ch)
+            positions.append(idx)
+        key = "".join(key)
+        if not key:
+            return None
 
-    def setup_tts(self):
-        """Text-to-Speech motorunu yapılandır"""
-        voices = self.tts_engine.getProperty('voices')
-        # Türkçe ses varsa kullan
-        for voice in voices:
-            if 'tr' in voice.id.lower() or 'turkish' in voice.name.lower():
-                self.tts_engine.setProperty('voice', voice.id)
+        # Ortak trigram sayımı C tarafında (Counter.update) yapılır
+        hits: Counter = Counter()
+        postings = self._postings
+        for gram in self._grams(key):
+            posting = postings.get(gram)
+            if posting:
+                hits.update(posting)
+        if not hits:
+            return None
+        counts = self._gram_counts
+        shortlist = hits.most_common(self.candidates * 4)
+        shortlist.sort(key=lambda hit: hit[1] / counts[hit[0]], reverse=True)
+        ranked = [pid for pid, _ in shortlist[:self.candidates]]
+
+        best = None
+        for pid in ranked:
+            phrase, order = self.phrases[pid]
+            dist, end, rows = self._align(phrase, key, starts)
+            confidence = 1.0 - dist / len(phrase)
+            if dist and (best is None or confidence > best[1]):
+                errors = self._char_errors(phrase, key, rows, end)
+                begin = 0
+                for word_end in self._word_ends[pid]:
+                    if 2 * sum(errors[begin:word_end]) >= word_end - begin:
+                        confidence = 0.0
+                        break
+                    begin = word_end
+            if best is None or confidence > best[1]:
+                param = text[positions[end - 1] + 1:].strip() if end else text
+                best = (order, confidence, param)
+                if dist == 0:
+                    break
+        return best
+
+
+class Intent:
+    """Kayıtlı bir komut: ad, derlenmiş desen ve işleyici"""
+
+    __slots__ = ("name", "pattern", "regex", "handler", "order", "examples", "needs_param")
+
+    def __init__(self, name: str, pattern: str, handler: Callable, order: int,
+                 examples: Optional[List[str]] = None):
+        self.name = name
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        self.handler = handler
+        self.order = order
+        self.examples = examples or _example_phrases(pattern)
+        # Varsayılanı olmayan bir argüman bekleyen işleyici boş parametreyle çağrılamaz
+        try:
+            params = list(inspect.signature(handler).parameters.values())
+        except (TypeError, ValueError):
+            params = []
+        self.needs_param = bool(params) and params[0].default is inspect.Parameter.empty and params[0].kind in (
+            inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+class IntentRouter:
+    """Anahtar kelime trie'si ile ön filtrelenmiş komut yönlendirici
+
+    Her desen kayıt sırasında bir kez derlenir ve her dalın başındaki sabit
+    metin bir trie'ye eklenir. Gelen komut trie üzerinde tek geçişte taranır;
+    yalnızca anahtarı komutta geçen desenler kayıt sırasıyla denenir. Böylece
+    öncelik sırası eski doğrusal taramayla aynı kalır, ama komut sayısı
+    arttıkça her cümle için yüzlerce re.search çağrısı yapılmaz.
+
+    Hiçbir desen eşleşmezse match_fuzzy() örnek cümlelerin trigram
+    indeksinden en yakın komutu bulur.
+    """
+
+    _END = ""
+
+    def __init__(self):
+        self.intents: List[Intent] = []
+        self._trie: Dict[str, Any] = {}
+        self._unfiltered: List[int] = []  # Sabit anahtarı çıkarılamayan desenler
+        self.fuzzy = FuzzyIntentIndex()
+
+    def register(self, pattern: str, handler: Callable, name: Optional[str] = None,
+                 examples: Optional[List[str]] = None) -> Intent:
+        """Deseni derle ve işleyiciyi kaydet"""
+        order = len(self.intents)
+        item = Intent(name or getattr(handler, "__name__", f"intent_{order}"), pattern, handler, order,
+                      examples)
+        self.intents.append(item)
+        for phrase in item.examples:
+            self.fuzzy.add(phrase, order)
+
+        literals = [_leading_literal(b) for b in _split_alternatives(pattern)]
+        if not all(literals):
+            self._unfiltered.append(order)
+            return item
+        for literal in literals:
+            node = self._trie
+            for ch in literal:
+                node = node.setdefault(ch, {})
+            node.setdefault(self._END, []).append(order)
+        return item
+
+    def intent(self, pattern: str, name: Optional[str] = None, examples: Optional[List[str]] = None):
+        """Fonksiyonu doğrudan bu yönlendiriciye kaydeden dekoratör
+
+        Parametre kuralı modül düzeyindeki intent() ile aynıdır.
+        """
+        def decorator(func: Callable) -> Callable:
+            self.register(pattern, func, name, examples)
+            return func
+        return decorator
+
+    def bind(self, obj: Any):
+        """Nesnenin @intent ile işaretli metodlarını tanım sırasıyla kaydet"""
+        # Alt sınıfta yeniden tanımlanan metod, üst sınıftaki sırasını korur
+        marked: Dict[str, Any] = {}
+        for klass in reversed(type(obj).__mro__):
+            for attr, value in vars(klass).items():
+                if hasattr(value, "_intents"):
+                    marked[attr] = value
+        for attr, value in marked.items():
+            handler = getattr(obj, attr)
+            for pattern, name, examples in value._intents:
+                self.register(pattern, handler, name, examples)
+
+    def _candidates(self, text: str) -> List[int]:
+        """Komutta anahtarı geçen desenlerin sıralı listesi"""
+        found = set(self._unfiltered)
+        trie = self._trie
+        end = self._END
+        for i in range(len(text)):
+            node = trie.get(text[i])
+            j = i + 1
+            while node is not None:
+                hits = node.get(end)
+                if hits:
+                    found.update(hits)
+                if j >= len(text):
+                    break
+                node = node.get(text[j])
+                j += 1
+        return sorted(found)
+
+    def match(self, text: str):
+        """Komutla eşleşen ilk (intent, parametre) çiftini döndür"""
+        for order in self._candidates(text):
+            item = self.intents[order]
+            m = item.regex.search(text)
+            if m:
+                return item, self._param(m)
+        return None
+
+    @staticmethod
+    def _param(m: "re.Match") -> str:
+        """'param' adlı grup, yoksa boş olmayan ilk grup"""
+        if "param" in m.re.groupindex:
+            return (m.group("param") or "").strip()
+        return next((g for g in m.groups() if g), "").strip()
+
+    def match_fuzzy(self, text: str, min_confidence: float = 0.8):
+        """Örnek cümlelere en yakın (intent, parametre, güven) üçlüsü ya da None"""
+        found = self.fuzzy.match(text)
+        if found is None or found[1] < min_confidence:
+            return None
+        order, confidence, param = found
+        return self.intents[order], param, confidence
+
+
+def frame_rms(frame: bytes, sample_width: int) -> float:
+    """Ses karesinin RMS enerjisi (sr.Recognizer ile aynı ölçek)"""
+    if audioop is not None:
+        return audioop.rms(frame, sample_width)
+    samples = array("h", frame[:len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(x * x for x in samples) / len(samples))
+
+
+class VoiceActivityGate:
+    """Enerji tabanlı yerel konuşma kapısı
+
+    Mikrofon akışından gelen kareleri eşik değeriyle karşılaştırır ve yalnızca
+    konuşma içeren bölütleri tanıyıcıya iletir. Sessizlik hiç bölüt açmaz,
+    çok kısa gürültü patlamaları (kapı çarpması, tıkırtı) ise elenir.
+    Son birkaç yüz milisaniyelik sessizlik bir halka tamponda tutulur ve
+    bölütün başına eklenir; böylece ilk hece kesilmez.
+
+    dynamic=True iken eşik sessiz karelerden gürültü tabanına göre sürekli
+    güncellenir (sr.Recognizer'ın dinamik eşiğiyle aynı formül); ilk
+    'warmup' saniyede hızlı uyum sağlanır, bu yüzden başlangıçta ayrı bir
+    kalibrasyon beklenmez. Ortam eşiğin üstüne çıkacak kadar gürültülenirse
+    azami uzunluğa ulaşan bölütün enerjisi yeni taban kabul edilir.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int, frame_samples: int,
+                 threshold: float, min_speech: float = 0.25, max_silence: float = 0.8,
+                 max_length: float = 10.0, preroll: float = 0.3, dynamic: bool = True,
+                 noise_ratio: float = 1.5, damping: float = 0.15, min_threshold: float = 50,
+                 warmup: float = 0.5):
+        self.sample_width = sample_width
+        self.threshold = threshold
+        self.dynamic = dynamic
+        self.noise_ratio = noise_ratio
+        self.min_threshold = min_threshold
+        frame_seconds = frame_samples / float(sample_rate)
+        self._damping = damping ** frame_seconds
+        self._warmup_damping = 0.01 ** frame_seconds
+        self._warmup_frames = int(warmup / frame_seconds)
+        self._levels: List[float] = []
+        self.min_speech_frames = max(1, int(math.ceil(min_speech / frame_seconds)))
+        self.max_silence_frames = max(1, int(math.ceil(max_silence / frame_seconds)))
+        self.max_frames = max(1, int(max_length / frame_seconds))
+        self._preroll: deque = deque(maxlen=max(1, int(math.ceil(preroll / frame_seconds))))
+        self._frames: List[bytes] = []
+        self._loud: List[bytes] = []
+        self._speech_frames = 0
+        self._silence_frames = 0
+        self.stats = {"frames": 0, "speech_frames": 0, "muted_frames": 0,
+                      "forwarded": 0, "dropped": 0, "barge_ins": 0}
+
+    def feed(self, frame: bytes) -> Optional[bytes]:
+        """Bir kare işle; bir konuşma bölütü tamamlandıysa ham veriyi döndür"""
+        self.stats["frames"] += 1
+        energy = frame_rms(frame, self.sample_width)
+        is_speech = energy > self.threshold
+
+        if not self._frames:
+            if not is_speech:
+                if self.dynamic:
+                    self._track_noise(energy)
+                self._preroll.append(frame)
+                return None
+            # Konuşma başladı: ön tamponu bölütün başına al
+            self._frames.extend(self._preroll)
+            self._preroll.clear()
+
+        self._frames.append(frame)
+        self._levels.append(energy)
+        if is_speech:
+            self.stats["speech_frames"] += 1
+            self._speech_frames += 1
+            self._silence_frames = 0
+        else:
+            self._silence_frames += 1
+
+        if self._silence_frames >= self.max_silence_frames or len(self._frames) >= self.max_frames:
+            return self._finish()
+        return None
+
+    def _track_noise(self, energy: float):
+        """Sessiz karenin enerjisiyle eşiği gürültü tabanına yaklaştır"""
+        damping = self._damping
+        if self.stats["frames"] <= self._warmup_frames:
+            damping = self._warmup_damping
+        target = energy * self.noise_ratio
+        self.threshold = max(self.min_threshold, self.threshold * damping + target * (1 - damping))
+
+    @property
+    def active(self) -> bool:
+        """Şu anda bir konuşma bölütü toplanıyor mu"""
+        return bool(self._frames)
+
+    def mute(self):
+        """Asistan konuşurken gelen kareleri say ve yarım bölütü at"""
+        self.stats["muted_frames"] += 1
+        self._preroll.clear()
+        self.reset()
+
+    def barge_in(self, frame: bytes, ratio: float, frames_needed: int) -> bool:
+        """Asistan konuşurken gelen karede kullanıcı araya giriyor mu?
+
+        Yankıyla karışmaması için normal eşiğin 'ratio' katı gerekir. Kesme
+        algılanınca yüksek kareler ön tampona alınır, bölüt onlarla başlar.
+        """
+        if frame_rms(frame, self.sample_width) <= self.threshold * ratio:
+            self._loud.clear()
+            self.mute()
+            return False
+        self.stats["muted_frames"] += 1
+        self._loud.append(frame)
+        if len(self._loud) < frames_needed:
+            return False
+        self.reset()
+        self._preroll.clear()
+        self._preroll.extend(self._loud)
+        self._loud.clear()
+        self.stats["barge_ins"] += 1
+        return True
+
+    def reset(self):
+        """Yarım kalan bölütü at"""
+        self._frames = []
+        self._levels = []
+        self._speech_frames = 0
+        self._silence_frames = 0
+
+    def _finish(self) -> Optional[bytes]:
+        speech_frames = self._speech_frames
+        if self.dynamic and len(self._frames) >= self.max_frames and self._levels:
+            # Hiç susmayan uzun bölüt: büyük olasılıkla ortam gürültüsü yükseldi
+            levels = sorted(self._levels)
+            self.threshold = max(self.threshold, levels[len(levels) // 2] * self.noise_ratio)
+        data = b"".join(self._frames)
+        self.reset()
+        if speech_frames < self.min_speech_frames:
+            self.stats["dropped"] += 1
+            return None
+        self.stats["forwarded"] += 1
+        return data
+
+    def summary(self) -> str:
+        """Sayaçların okunabilir özeti"""
+        st = self.stats
+        return (f"VAD: {st['forwarded']} bölüt iletildi, {st['dropped']} bölüt elendi, "
+                f"{st['speech_frames']}/{st['frames']} kare konuşma, {st['muted_frames']} kare susturuldu, "
+                f"eşik {self.threshold:.0f}")
+
+
+class AudioCapture(threading.Thread):
+    """Mikrofonu sürekli açık tutup konuşma bölütlerini kuyruğa koyan iş parçacığı"""
+
+    def __init__(self, microphone: "sr.Microphone", gate: VoiceActivityGate, muted: threading.Event,
+                 on_barge_in: Optional[Callable[[], None]] = None,
+                 barge_in_ratio: float = 3.0, barge_in_frames: int = 3):
+        super().__init__(name="audio-capture", daemon=True)
+        self.microphone = microphone
+        self.gate = gate
+        self.muted = muted
+        self.on_barge_in = on_barge_in
+        self.barge_in_ratio = barge_in_ratio
+        self.barge_in_frames = barge_in_frames
+        self.segments: "queue.Queue[sr.AudioData]" = queue.Queue(maxsize=8)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        barging = False
+        try:
+            with self.microphone as source:
+                while not self._stop_event.is_set():
+                    frame = source.stream.read(source.CHUNK)
+                    if not self.muted.is_set():
+                        barging = False
+                    elif not barging:
+                        if self.on_barge_in is None:
+                            self.gate.mute()
+                            continue
+                        if not self.gate.barge_in(frame, self.barge_in_ratio, self.barge_in_frames):
+                            continue
+                        # Kullanıcı araya girdi: konuşmayı kes, sonraki karelerden itibaren dinle
+                        barging = True
+                        self.on_barge_in()
+                        continue
+                    data = self.gate.feed(frame)
+                    if data:
+                        audio = sr.AudioData(data, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                        # Konuşmanın bittiği an; tanıma bekleme süresi ve uçtan uca süre için
+                        audio.captured_at = time.monotonic()
+                        self._put(audio)
+        except Exception as e:
+            logger.error(f"Ses yakalama hatası: {e}")
+
+    def _put(self, audio: "sr.AudioData"):
+        # Tüketici geride kalırsa en eski bölütü at
+        while True:
+            try:
+                self.segments.put_nowait(audio)
+                return
+            except queue.Full:
+                try:
+                    self.segments.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def next_segment(self, timeout: float) -> Optional["sr.AudioData"]:
+        """Sıradaki konuşma bölütünü bekle"""
+        try:
+            return self.segments.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class BackendUnavailable(Exception):
+    """Tanıma motoru şu an kullanılamıyor (ağ yok, model eksik vb.)"""
+
+
+class RecognizerBackend:
+    """Ses tanıma motoru arayüzü
+
+    transcribe() metni, konuşma anlaşılamadıysa None döndürür; motorun kendisi
+    çalışamıyorsa BackendUnavailable fırlatır ve sıradaki motora geçilir.
+    """
+
+    name = "base"
+
+    def load(self):
+        """Modeli belleğe yükle (bir kez çağrılır)"""
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (ağ bağlantısı gerekir)"""
+
+    name = "google"
+
+    def __init__(self, recognizer: "sr.Recognizer", language: str = "tr-TR"):
+        self.recognizer = recognizer
+        self.language = language
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise BackendUnavailable(str(e))
+
+
+class VoskBackend(RecognizerBackend):
+    """Vosk/Kaldi ile çevrimdışı tanıma; model bir kez yüklenip bellekte kalır"""
+
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._model = None
+        self._vosk = None
+
+    def load(self):
+        if self._model is not None:
+            return
+        try:
+            import vosk
+        except ImportError:
+            raise BackendUnavailable("vosk kurulu değil (pip install vosk)")
+        if not os.path.isdir(self.model_path):
+            raise BackendUnavailable(f"Vosk modeli bulunamadı: {self.model_path}")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = vosk.Model(self.model_path)
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        self.load()
+        rec = self._vosk.KaldiRecognizer(self._model, self.sample_rate)
+        rec.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(rec.FinalResult()).get("text", "")
+        return text or None
+
+
+class WhisperBackend(RecognizerBackend):
+    """faster-whisper (CTranslate2) ile çevrimdışı tanıma; model bellekte kalır"""
+
+    name = "whisper"
+    sample_rate = 16000
+
+    def __init__(self, model_name: str, language: str = "tr"):
+        self.model_name = model_name
+        self.language = language
+        self._model = None
+
+    def load(self):
+        if self._model is not None:
+            return
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise BackendUnavailable("faster-whisper kurulu değil (pip install faster-whisper)")
+        self._model = WhisperModel(self.model_name, device="cpu", compute_type="int8")
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        import numpy as np
+
+        self.load()
+        raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self._model.transcribe(samples, language=self.language, beam_size=1)
+        text = " ".join(seg.text.strip() for seg in segments).strip()
+        return text or None
+
+
+def create_backend(name: str, config: Dict[str, Any], recognizer: "sr.Recognizer") -> RecognizerBackend:
+    """Ayardaki ada göre tanıma motoru oluştur"""
+    if name == "google":
+        return GoogleBackend(recognizer, config.get("language", "tr-TR"))
+    if name == "vosk":
+        return VoskBackend(config.get("vosk_model", ""))
+    if name == "whisper":
+        return WhisperBackend(config.get("whisper_model", "small"),
+                              config.get("language", "tr-TR").split("-")[0])
+    raise ValueError(f"Bilinmeyen tanıma motoru: {name}")
+
+
+class SpeechRecognizer:
+    """Motorları sırayla deneyen, hata verenleri bir süre atlayan tanıyıcı"""
+
+    def __init__(self, backends: List[RecognizerBackend], retry_after: float = 30):
+        self.backends = backends
+        self.retry_after = retry_after
+        self._skip_until: Dict[str, float] = {}
+        self.last_backend: Optional[str] = None
+        self._ready = threading.Event()
+        self._ready.set()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], recognizer: "sr.Recognizer") -> "SpeechRecognizer":
+        backends = []
+        for name in config.get("backends", ["google"]):
+            try:
+                backends.append(create_backend(name, config, recognizer))
+            except ValueError as e:
+                logger.error(str(e))
+        return cls(backends, config.get("retry_after", 30))
+
+    def load(self):
+        """Çevrimdışı modelleri önceden yükle; yüklenemeyenleri atla"""
+        for backend in self.backends:
+            try:
+                backend.load()
+            except BackendUnavailable as e:
+                logger.warning(f"{backend.name} motoru devre dışı: {e}")
+                self._skip_until[backend.name] = float("inf")
+
+    def load_async(self):
+        """Modelleri arka planda yükle; ilk tanıma yükleme bitene kadar bekler
+
+        Mikrofon bu sırada dinlemeye başlar, gelen bölütler kuyrukta bekler.
+        """
+        self._ready.clear()
+
+        def run():
+            try:
+                self.load()
+            finally:
+                self._ready.set()
+
+        threading.Thread(target=run, name="recognizer-load", daemon=True).start()
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        """İlk kullanılabilir motorla metne çevir"""
+        self._ready.wait()
+        now = time.monotonic()
+        for backend in self.backends:
+            if self._skip_until.get(backend.name, 0) > now:
+                continue
+            try:
+                text = backend.transcribe(audio)
+                self.last_backend = backend.name
+                return text
+            except BackendUnavailable as e:
+                logger.warning(f"{backend.name} tanıma hatası, sıradaki motora geçiliyor: {e}")
+                self._skip_until[backend.name] = now + self.retry_after
+        logger.error("Kullanılabilir ses tanıma motoru yok")
+        return None
+
+
+class SpeechOutput(threading.Thread):
+    """Kuyruktan beslenen, kesilebilir TTS iş parçacığı
+
+    pyttsx3 motoru bu iş parçacığında oluşturulur ve yalnızca burada kullanılır;
+    speak() çağıran taraf beklemez. Sık kullanılan sabit cümleler bir kez WAV
+    dosyasına sentezlenip ses, hız ve metne göre anahtarlanan disk önbelleğinden
+    doğrudan çalınır. Saat, sayı ya da not içeriği gibi değişen veri taşıyan
+    (rakam içeren) cümleler önbelleğe alınmaz; önbellek dosya sayısı ve boyutuyla
+    sınırlıdır, çalınan dosyanın mtime'ı güncellenir ve en eskiler silinir.
+    """
+
+    COUNTS_LIMIT = 512  # Tekrar sayısı tutulan en fazla cümle
+    # Kullanıcı verisi ya da o anki bilgiyle kurulan yanıtlar; hiç önbelleğe alınmaz
+    DYNAMIC_PREFIXES = ("Şu an saat", "Bugün ", "Sonuç:", "Not ", "Hatırlatma:")
+
+    # Başlangıçta boş zamanda önceden sentezlenen cümleler
+    CACHED_PHRASES = [
+        "Evet, dinliyorum.",
+        "Sizi duyamadım.",
+        "Not alındı.",
+        "Bu komutu anlayamadım. Yardım için 'yardım' deyin.",
+        "Üzgünüm, bu komutu yerine getiremiyorum.",
+        "Görüşürüz! Hoşça kal.",
+    ]
+
+    def __init__(self, config: Dict[str, Any], speaking: threading.Event,
+                 metrics: Optional[StageMetrics] = None):
+        super().__init__(name="tts", daemon=True)
+        self.metrics = metrics or StageMetrics()
+        self.rate = config.get("rate", 180)
+        self.volume = config.get("volume", 0.8)
+        self.cache_dir = os.path.expanduser(config.get("cache_dir", "~/.sesli_asistan/tts_cache"))
+        self.cache_after = config.get("cache_after", 2)
+        self.cache_max_chars = config.get("cache_max_chars", 80)
+        self.cache_max_files = config.get("cache_max_files", 200)
+        self.cache_max_bytes = config.get("cache_max_mb", 50) * 1024 * 1024
+        self.speaking = speaking
+        self._queue: "queue.Queue[Optional[Tuple[str, float]]]" = queue.Queue()
+        self._interrupt = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._engine = None
+        self._voice_id = ""
+        self._pyaudio = None
+        self._player: Optional[subprocess.Popen] = None
+
+    # --- Dışarıdan çağrılanlar ---
+    def say(self, text: str):
+        """Cümleyi sıraya ekle"""
+        self._idle.clear()
+        self._queue.put((text, time.monotonic()))
+
+    def interrupt(self):
+        """Çalan cümleyi kes ve bekleyenleri at"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._interrupt.set()
+        if not self.speaking.is_set():
+            self._idle.set()
+        if self._engine is not None:
+            try:
+                self._engine.stop()
+            except Exception:
+                pass
+        if self._player is not None and self._player.poll() is None:
+            self._player.terminate()
+
+    def wait_until_done(self, timeout: Optional[float] = None) -> bool:
+        """Sıradaki tüm cümleler söylenene kadar bekle"""
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        self._queue.put(None)
+
+    # --- İş parçacığı ---
+    def run(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            self._setup_engine()
+        except Exception as e:
+            logger.error(f"TTS motoru başlatılamadı: {e}")
+
+        while True:
+            try:
+                # Kuyruk boşken sabit cümleleri önceden sentezle
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                self._prerender_next()
+                continue
+            if item is None:
                 break
+            text, queued_at = item
+            self.metrics.record("tts_queue_wait", time.monotonic() - queued_at)
+            self._interrupt.clear()
+            self.speaking.set()
+            try:
+                self._say_one(text)
+            except Exception as e:
+                logger.error(f"TTS hatası: {e}")
+                print(f"💬 {text}")
+            if self._queue.empty():
+                self.speaking.clear()
+                self._idle.set()
+
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+
+    def _setup_engine(self):
+        """Text-to-Speech motorunu yapılandır"""
+        self._engine = pyttsx3.init()
+        # Seçilen ses hatırlanır; her açılışta tüm sesleri taramaya gerek kalmaz
+        voice_file = os.path.join(self.cache_dir, "voice.txt")
+        voice_id = ""
+        try:
+            with open(voice_file, 'r', encoding='utf-8') as f:
+                voice_id = f.read().strip()
+            if voice_id:
+                self._engine.setProperty('voice', voice_id)
+        except Exception:
+            voice_id = ""
+        if not voice_id:
+            voices = self._engine.getProperty('voices')
+            # Türkçe ses varsa kullan
+            for voice in voices:
+                if 'tr' in voice.id.lower() or 'turkish' in voice.name.lower():
+                    self._engine.setProperty('voice', voice.id)
+                    break
+        self._voice_id = self._engine.getProperty('voice') or ""
+        if self._voice_id and self._voice_id != voice_id:
+            try:
+                with open(voice_file, 'w', encoding='utf-8') as f:
+                    f.write(self._voice_id)
+            except Exception as e:
+                logger.warning(f"Seçilen ses kaydedilemedi: {e}")
 
         # Ses hızı ve ses seviyesi
-        self.tts_engine.setProperty('rate', 180)
-        self.tts_engine.setProperty('volume', 0.8)
+        self._engine.setProperty('rate', self.rate)
+        self._engine.setProperty('volume', self.volume)
 
-    def calibrate_microphone(self):
-        """Mikrofonu çevresel gürültüye göre kalibre et"""
+    def _cache_path(self, text: str) -> str:
+        key = hashlib.sha1(f"{self._voice_id}|{self.rate}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _should_cache(self, text: str) -> bool:
+        if text in self.CACHED_PHRASES:
+            return True
+        if len(text) > self.cache_max_chars or any(ch.isdigit() for ch in text):
+            return False
+        if text.startswith(self.DYNAMIC_PREFIXES):
+            return False
+        self._counts[text] = self._counts.pop(text, 0) + 1
+        if len(self._counts) > self.COUNTS_LIMIT:
+            self._counts.popitem(last=False)
+        return self._counts[text] >= self.cache_after
+
+    def _evict(self):
+        """Dosya sayısı/boyut sınırı aşıldıysa en uzun süredir çalınmayan WAV'ları sil"""
+        keep = {self._cache_path(t) for t in self.CACHED_PHRASES}
+        entries = []
         try:
-            with self.microphone as source:
-                print("🎤 Mikrofon kalibre ediliyor...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-                print("✅ Mikrofon kalibrasyonu tamamlandı")
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".wav") and entry.path not in keep:
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return
+        count = len(entries) + sum(os.path.exists(p) for p in keep)
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if count <= self.cache_max_files and total <= self.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+
+    def _say_one(self, text: str):
+        if self._engine is None:
+            raise RuntimeError("TTS motoru yok")
+        path = self._cache_path(text)
+        if not os.path.exists(path) and self._should_cache(text):
+            start = time.perf_counter()
+            self._render(text, path)
+            self.metrics.record("tts_synthesis", time.perf_counter() - start)
+            self._evict()
+        start = time.perf_counter()
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # LRU: son çalınma zamanı
+            except OSError:
+                pass
+            self._play(path)
+            self.metrics.record("tts_playback", time.perf_counter() - start)
+        else:
+            # pyttsx3 sentezi ve çalmayı ayırmaz
+            self._engine.say(text)
+            self._engine.runAndWait()
+            self.metrics.record("tts_direct", time.perf_counter() - start)
+
+    def _render(self, text: str, path: str):
+        """Cümleyi diske sentezle (önce geçici dosyaya, sonra atomik taşı)"""
+        tmp = path + ".tmp"
+        try:
+            self._engine.save_to_file(text, tmp)
+            self._engine.runAndWait()
+            if os.path.exists(tmp) and os.path.getsize(tmp) > 0:
+                os.replace(tmp, path)
         except Exception as e:
-            logger.error(f"Mikrofon kalibrasyonu hatası: {e}")
+            logger.warning(f"TTS önbelleğe yazılamadı: {e}")
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _prerender_next(self):
+        if self._engine is None:
+            return
+        for text in self.CACHED_PHRASES:
+            path = self._cache_path(text)
+            if not os.path.exists(path):
+                self._render(text, path)
+                return
 
-    def speak(self, text: str):
-        """Metni sesli olarak söyle"""
+    def _play(self, path: str):
+        """Önbellekteki sesi çal; kesme isteğini parça aralarında kontrol et"""
         try:
-            print(f"🗣️  {text}")
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            wav = wave.open(path, "rb")
+        except (wave.Error, EOFError):
+            # Bazı sürücüler (macOS nsss) AIFF üretir: sistem oynatıcısına bırak
+            self._play_external(path)
+            return
+
+        import pyaudio
+
+        with wav:
+            if self._pyaudio is None:
+                self._pyaudio = pyaudio.PyAudio()
+            stream = self._pyaudio.open(
+                format=self._pyaudio.get_format_from_width(wav.getsampwidth()),
+                channels=wav.getnchannels(), rate=wav.getframerate(), output=True)
+            try:
+                data = wav.readframes(1024)
+                while data and not self._interrupt.is_set():
+                    stream.write(data)
+                    data = wav.readframes(1024)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def _play_external(self, path: str):
+        player = ["afplay", path] if sys.platform == "darwin" else ["aplay", "-q", path]
+        self._player = subprocess.Popen(player)
+        self._player.wait()
+        self._player = None
+
+
+def tr_casefold(text: str) -> str:
+    """Türkçe büyük/küçük harf katlama (I → ı, İ → i)"""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def normalize_query(text: str) -> str:
+    """Önbellek anahtarı için sorguyu sadeleştir"""
+    return " ".join(re.sub(r"[^\w\s]", " ", tr_casefold(text)).split())
+
+
+class SummaryCache:
+    """Wikipedia özetleri için SQLite tabanlı, boyut sınırlı ve TTL'li LRU önbellek"""
+
+    def __init__(self, path: str, ttl: float, miss_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY, summary TEXT, fetched_at REAL, used_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_used ON summaries(used_at)")
+        self._db.commit()
+
+    def get(self, key: str):
+        """(bulundu_mu, özet) döndür; özet None ise sayfa yok demektir"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT summary, fetched_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            summary, fetched_at = row
+            if now - fetched_at > (self.ttl if summary is not None else self.miss_ttl):
+                self._db.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self._db.commit()
+                return False, None
+            self._db.execute("UPDATE summaries SET used_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return True, summary
+
+    def put(self, key: str, summary: Optional[str]):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, fetched_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now))
+            # En uzun süredir kullanılmayanları at
+            self._db.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries"
+                " ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+
+class WikipediaClient:
+    """Yalnızca giriş bölümünün ilk cümlelerini çeken kalıcı Wikipedia istemcisi
+
+    Tam sayfa metni yerine MediaWiki 'extracts' API'sinden sunucu tarafında
+    kısaltılmış özet istenir. Başlık bulunamazsa aynı istekte arama ile en iyi
+    sayfa seçilir. api_url yerel bir sahte sunucuya yönlendirilebilir.
+    """
+
+    def __init__(self, api_url: str, timeout: float = 5, sentences: int = 2,
+                 session: Optional["requests.Session"] = None):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.sentences = sentences
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "SesliAsistan/1.0 (PythonProject)")
+
+    def _query(self, **params) -> Optional[str]:
+        params.update({
+            "action": "query", "format": "json", "formatversion": 2,
+            "prop": "extracts", "exintro": 1, "explaintext": 1,
+            "exsentences": self.sentences, "redirects": 1,
+        })
+        resp = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        for page in resp.json().get("query", {}).get("pages", []):
+            extract = (page.get("extract") or "").strip()
+            if not page.get("missing") and extract:
+                return extract
+        return None
+
+    def fetch_summary(self, query: str) -> Optional[str]:
+        """Sorgu için kısa özet; sayfa yoksa None"""
+        summary = self._query(titles=query)
+        if summary is None:
+            summary = self._query(generator="search", gsrsearch=query, gsrlimit=1)
+        return summary
+
+
+_TR_NUMBER_WORDS = {
+    "bir": 1, "iki": 2, "üç": 3, "dört": 4, "beş": 5, "altı": 6, "yedi": 7,
+    "sekiz": 8, "dokuz": 9, "on": 10, "yirmi": 20, "otuz": 30, "kırk": 40,
+    "elli": 50, "altmış": 60,
+}
+_NUM_RE = (r"\d+|yarım|(?:(?:on|yirmi|otuz|kırk|elli)\s+)?"
+           r"(?:bir|iki|üç|dört|beş|altı|yedi|sekiz|dokuz)|on|yirmi|otuz|kırk|elli|altmış")
+_UNIT_SECONDS = {"saniye": 1, "dakika": 60, "dk": 60, "saat": 3600, "gün": 86400, "hafta": 604800}
+_RELATIVE_RE = re.compile(rf"\b({_NUM_RE})\s*(saniye|dakika|dk|saat|gün|hafta)\s*sonra\b")
+# Sayı ancak "saat", gün bölümü, "2'de" ya da "14:30" biçimiyle saat sayılır ("2 de olsa ara" değil)
+_ABSOLUTE_RE = re.compile(
+    r"\b(?:(yarın|bugün)\s+)?(?:(sabah|öğlen|öğleden sonra|akşam|gece)\s+)?(saat\s*)?"
+    r"(\d{1,2})(?:[:.](\d{2}))?\s*(['’]?)\s*(?:de|da|te|ta)\b")
+_TOMORROW_RE = re.compile(r"\byarın\b")
+
+
+def _number_value(text: str) -> float:
+    if text.isdigit():
+        return int(text)
+    if text == "yarım":
+        return 0.5
+    return sum(_TR_NUMBER_WORDS[w] for w in text.split())
+
+
+def parse_reminder_time(text: str, now: datetime) -> Tuple[datetime, str]:
+    """"20 dakika sonra ...", "yarın 9'da ..." gibi ifadelerden zaman ve mesajı ayır
+
+    Zaman ifadesi bulunamazsa eskisi gibi 5 dakika sonrası kullanılır.
+    Gün kısmı olmayan 1-6 arası saatler öğleden sonra kabul edilir ("3'te" → 15:00);
+    geçmişte kalan saat (bugün denmiş olsa bile) bir sonraki uygun zamana kaydırılır.
+    """
+    due = None
+    span = None
+
+    match = _RELATIVE_RE.search(text)
+    if match:
+        seconds = _number_value(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+        due, span = now + timedelta(seconds=seconds), match.span()
+    else:
+        match = next((m for m in _ABSOLUTE_RE.finditer(text)
+                      if (m.group(2) or m.group(3) or m.group(5) or m.group(6))
+                      and int(m.group(4)) < 24 and int(m.group(5) or 0) < 60), None)
+        if match:
+            day, period = match.group(1), match.group(2)
+            hour, minute = int(match.group(4)), int(match.group(5) or 0)
+            midnight = period == "gece" and hour == 12
+            if midnight:
+                hour = 0  # "gece 12" = günün bittiği 00:00
+            elif (period in ("öğleden sonra", "akşam") and hour < 12) or (period == "gece" and 6 <= hour < 12):
+                hour += 12
+            elif period in (None, "öğlen") and 1 <= hour <= 6:
+                hour += 12  # Gece 3 için hatırlatıcı kurulması pek olası değil
+            due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if day == "yarın":
+                due += timedelta(days=2 if midnight else 1)
+            elif due <= now:
+                if period is None and hour < 12 and due + timedelta(hours=12) > now:
+                    due += timedelta(hours=12)  # "8'de" saat 10'da söylendiyse akşam 8
+                else:
+                    due += timedelta(days=1)  # Saat geçtiyse yarın
+            span = match.span()
+        else:
+            match = _TOMORROW_RE.search(text)
+            if match:
+                due = (now + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+                span = match.span()
+
+    if due is None:
+        return now + timedelta(minutes=5), text.strip()
+    message = (text[:span[0]] + " " + text[span[1]:]).strip(" ,.")
+    return due, " ".join(message.split())
+
+
+class ReminderScheduler(threading.Thread):
+    """Min-heap ve koşul değişkeni ile tam zamanında çalan hatırlatıcı iş parçacığı
+
+    İş parçacığı bir sonraki hatırlatmanın zamanına kadar uyur; yeni ve daha
+    erken bir hatırlatıcı eklenince uyandırılır. Hatırlatıcılar ekleme/çalma
+    kayıtlarından oluşan bir JSONL günlüğüne yazılır, açılışta yeniden okunur.
+    """
+
+    def __init__(self, journal_file: str, on_fire: Callable[[Dict[str, Any]], None]):
+        super().__init__(name="reminders", daemon=True)
+        self.journal_file = journal_file
+        self.on_fire = on_fire
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._done_count = 0
+        self._stopped = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.journal_file):
+            return
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    if entry["op"] == "add":
+                        self._pending[entry["id"]] = {"id": entry["id"], "due": entry["due"], "text": entry["text"]}
+                    elif entry["op"] == "done":
+                        self._pending.pop(entry["id"], None)
+                        self._done_count += 1
         except Exception as e:
-            logger.error(f"TTS hatası: {e}")
-            print(f"💬 {text}")
+            logger.error(f"Hatırlatıcı yükleme hatası: {e}")
+        for item in self._pending.values():
+            self._push(item)
+        if self._done_count > max(100, len(self._pending)):
+            self._compact()
 
-    def listen(self, timeout: int = 5) -> Optional[str]:
-        """Mikrofonu dinle ve metne çevir"""
+    def _push(self, item: Dict[str, Any]):
+        self._seq += 1
+        heapq.heappush(self._heap, (item["due"], self._seq, item["id"]))
+
+    def _append(self, entry: Dict[str, Any]):
         try:
-            with self.microphone as source:
-                # Kısa süre sessizlik bekle
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.error(f"Hatırlatıcı kaydetme hatası: {e}")
 
-            # Google Speech Recognition kullan
-            text = self.recognizer.recognize_google(audio, language='tr-TR')
-            print(f"👂 Duydum: {text}")
-            return text.lower()
+    def _compact(self):
+        """Günlüğü yalnızca bekleyen hatırlatıcılarla yeniden yaz"""
+        tmp = self.journal_file + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for item in self._pending.values():
+                    f.write(json.dumps(dict(item, op="add"), ensure_ascii=False) + "\n")
+            os.replace(tmp, self.journal_file)
+            self._done_count = 0
+        except Exception as e:
+            logger.error(f"Hatırlatıcı günlüğü sıkıştırılamadı: {e}")
+
+    def add(self, due: datetime, text: str) -> str:
+        """Hatırlatıcı ekle ve kimliğini döndür"""
+        item = {"id": os.urandom(6).hex(), "due": due.timestamp(), "text": text}
+        with self._cond:
+            self._pending[item["id"]] = item
+            self._push(item)
+            self._append(dict(item, op="add"))
+            # Yeni hatırlatıcı en erkense bekleyen iş parçacığını uyandır
+            if self._heap[0][2] == item["id"]:
+                self._cond.notify()
+        return item["id"]
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            due_items = []
+            with self._cond:
+                while not self._stopped:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopped:
+                    return
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, rid = heapq.heappop(self._heap)
+                    item = self._pending.pop(rid, None)
+                    if item is not None:
+                        due_items.append(item)
+                        self._append({"op": "done", "id": rid})
+                        self._done_count += 1
+                if self._done_count > max(100, len(self._pending)):
+                    self._compact()
+
+            for item in due_items:
+                try:
+                    self.on_fire(item)
+                except Exception as e:
+                    logger.error(f"Hatırlatma hatası: {e}")
 
-        except sr.WaitTimeoutError:
-            return None
-        except sr.UnknownValueError:
+
+# Basit Türkçe gövdeleme için çıkarılan ekler (uzundan kısaya)
+_TR_SUFFIXES = sorted([
+    "lerinden", "larından", "lerinde", "larında", "lerini", "larını", "leri", "ları",
+    "ler", "lar", "ndan", "nden", "dan", "den", "tan", "ten", "nda", "nde", "da", "de",
+    "ta", "te", "nın", "nin", "nun", "nün", "ın", "in", "un", "ün", "yı", "yi", "yu",
+    "yü", "sı", "si", "su", "sü", "ya", "ye", "ı", "i", "u", "ü", "a", "e",
+], key=len, reverse=True)
+
+
+def turkish_stem(word: str, min_len: int = 2) -> str:
+    """Çoğul ve hal eklerini birkaç tur kırp ("toplantılarda" → "toplant")"""
+    for _ in range(3):
+        # Yalnızca en uzun eşleşen ek denenir; kök çok kısalacaksa durulur
+        suffix = next((sfx for sfx in _TR_SUFFIXES if word.endswith(sfx)), None)
+        if suffix is None or len(word) - len(suffix) < min_len:
+            break
+        word = word[:-len(suffix)]
+    return word
+
+
+def index_terms(text: str) -> List[str]:
+    """Metni Türkçe katlanmış ve gövdelenmiş arama terimlerine ayır"""
+    # Kesme işaretiyle ayrılan ekler gövdeye bitiştirilir ("istanbul'da" → "istanbulda")
+    text = re.sub(r"['’]", "", tr_casefold(text))
+    return [turkish_stem(w) for w in re.findall(r"\w+", text)]
+
+
+class NotesStore:
+    """Yalnızca ekleme yapılan JSONL not deposu ve tam metin ters indeksi
+
+    Her yeni not dosyanın sonuna tek satır olarak eklenir; dosya hiçbir zaman
+    baştan yazılmaz. Terim → not numaraları indeksi açılışta bir kez kurulur
+    ve aramalar en kısa listenin sondan yürünüp diğerlerinde aranmasıyla yapılır.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self.notes: List[Dict[str, str]] = []
+        self._index: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._load(legacy_path)
+
+    def _load(self, legacy_path: Optional[str]):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            self._add_to_index(json.loads(line))
+            elif legacy_path and os.path.exists(legacy_path):
+                # Eski tek parça JSON dosyasını bir kez taşı
+                with open(legacy_path, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    for entry in legacy:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                        self._add_to_index(entry)
+        except Exception as e:
+            logger.error(f"Not yükleme hatası: {e}")
+
+    def _add_to_index(self, entry: Dict[str, str]):
+        note_id = len(self.notes)
+        self.notes.append(entry)
+        for term in set(index_terms(entry.get("note", ""))):
+            self._index.setdefault(term, []).append(note_id)
+
+    def add(self, note: str) -> Dict[str, str]:
+        entry = {"timestamp": datetime.now().isoformat(), "note": note}
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._add_to_index(entry)
+        return entry
+
+    def latest(self, count: int) -> List[Dict[str, str]]:
+        return self.notes[-count:]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Tüm terimleri içeren notlar, en yeniden eskiye"""
+        terms = set(index_terms(query))
+        if not terms:
+            return []
+        postings = []
+        for term in terms:
+            ids = self._index.get(term)
+            if not ids:
+                return []
+            postings.append(ids)
+        # Kayıt listeleri artan sırada: en kısa liste sondan yürünür, diğerlerinde
+        # ikili arama yapılır ve limit dolunca durulur
+        postings.sort(key=len)
+        smallest, others = postings[0], postings[1:]
+        result = []
+        for note_id in reversed(smallest):
+            if all(self._contains(ids, note_id) for ids in others):
+                result.append(self.notes[note_id])
+                if len(result) >= limit:
+                    break
+        return result
+
+    @staticmethod
+    def _contains(ids: List[int], note_id: int) -> bool:
+        pos = bisect.bisect_left(ids, note_id)
+        return pos < len(ids) and ids[pos] == note_id
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+
+class CalculationError(ValueError):
+    """Kullanıcıya okunabilecek hesaplama hatası"""
+
+
+_TR_DIGITS = {
+    "sıfır": 0, "bir": 1, "iki": 2, "üç": 3, "dört": 4, "beş": 5, "altı": 6,
+    "yedi": 7, "sekiz": 8, "dokuz": 9, "on": 10, "yirmi": 20, "otuz": 30,
+    "kırk": 40, "elli": 50, "altmış": 60, "yetmiş": 70, "seksen": 80, "doksan": 90,
+}
+_TR_SCALES = {"bin": 10 ** 3, "milyon": 10 ** 6, "milyar": 10 ** 9, "trilyon": 10 ** 12}
+_SPOKEN_OPERATORS = {
+    "artı": "+", "eksi": "-", "çarpı": "*", "kere": "*", "x": "*", "×": "*",
+    "bölü": "/", "÷": "/", "mod": "%", "üssü": "**", "üzeri": "**", "^": "**",
+    "karesi": "**2", "küpü": "**3", "(": "(", ")": ")",
+    "+": "+", "-": "-", "*": "*", "/": "/", "%": "%", "**": "**",
+}
+_SPOKEN_FILLERS = {"kaç", "eder", "nedir", "sonuç", "sonucu", "ne", "yapar", "=", ",", "?"}
+_GENITIVE_SUFFIXES = ("nin", "nın", "nun", "nün", "in", "ın", "un", "ün")
+_ARITH_TOKEN_RE = re.compile(r"\d+(?:[.,]\d+)?|\*\*|[^\W\d_]+|[-+*/%()^×÷=,?]")
+
+
+def _number_word(token: str) -> Optional[str]:
+    """'beşin' gibi ekli sayı sözcüklerini köke indir"""
+    if token in _TR_DIGITS or token in _TR_SCALES or token == "yüz":
+        return token
+    for suffix in _GENITIVE_SUFFIXES:
+        root = token[:-len(suffix)]
+        if token.endswith(suffix) and (root in _TR_DIGITS or root in _TR_SCALES or root == "yüz"):
+            return root
+    return None
+
+
+def _words_to_int(tokens: List[str]) -> int:
+    """["iki", "bin", "beş", "yüz"] → 2500 (rakamlar da karışık olabilir)"""
+    total = 0
+    current = 0
+    for tok in tokens:
+        if tok.isdigit():
+            current += int(tok)
+        elif tok == "yüz":
+            current = (current or 1) * 100
+        elif tok in _TR_SCALES:
+            total += (current or 1) * _TR_SCALES[tok]
+            current = 0
+        else:
+            current += _TR_DIGITS[tok]
+    return total + current
+
+
+class ArithmeticEngine:
+    """eval kullanmayan, sınırlı ve önbellekli aritmetik derleyici
+
+    Sözlü ifade ("iki yüz artı beşin karesi") önce sembolik biçime
+    ("200+5**2") çevrilir, ast ile ayrıştırılır, yalnızca sayı ve temel
+    işlem düğümlerine izin verilir ve iç içe kapanışlara derlenir. Derlenmiş
+    ifadeler LRU önbellekte tutulur. Üs, çarpım boyutu ve düğüm sayısı
+    sınırlandığı için sesli girdi dev tamsayı hesaplarına yol açamaz.
+    """
+
+    def __init__(self, max_length: int = 200, max_nodes: int = 64,
+                 max_exponent: int = 1000, max_bits: int = 4096, cache_size: int = 256):
+        self.max_length = max_length
+        self.max_nodes = max_nodes
+        self.max_exponent = max_exponent
+        self.max_bits = max_bits
+        self._binary_ops = {
+            ast.Add: operator.add,
+            ast.Sub: operator.sub,
+            ast.Mult: self._mul,
+            ast.Div: self._div,
+            ast.FloorDiv: self._floordiv,
+            ast.Mod: self._mod,
+            ast.Pow: self._pow,
+        }
+        self.compile = functools.lru_cache(maxsize=cache_size)(self._compile)
+
+    # --- Sözlü ifadeyi sembolik biçime çevirme ---
+    def to_symbolic(self, text: str) -> str:
+        tokens = _ARITH_TOKEN_RE.findall(tr_casefold(re.sub(r"(\d)['’]\w+", r"\1", text)))
+        tokens = self._join_paren_words(tokens)
+        out = []
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.isdigit() or _number_word(tok):
+                j = i
+                words = []
+                while j < len(tokens) and (tokens[j].isdigit() or _number_word(tokens[j])):
+                    words.append(tokens[j] if tokens[j].isdigit() else _number_word(tokens[j]))
+                    j += 1
+                literal = str(_words_to_int(words))
+                # "üç virgül beş" → 3.5
+                if j + 1 < len(tokens) and tokens[j] == "virgül" and (
+                        tokens[j + 1].isdigit() or _number_word(tokens[j + 1])):
+                    k = j + 1
+                    frac = []
+                    while k < len(tokens) and (tokens[k].isdigit() or _number_word(tokens[k])):
+                        frac.append(tokens[k] if tokens[k].isdigit() else _number_word(tokens[k]))
+                        k += 1
+                    literal += "." + (frac[0] if len(frac) == 1 and frac[0].isdigit()
+                                      else str(_words_to_int(frac)))
+                    j = k
+                out.append(literal)
+                i = j
+            elif re.fullmatch(r"\d+[.,]\d+", tok):
+                out.append(tok.replace(",", "."))  # Türkçe ondalık virgülü
+                i += 1
+            elif tok in _SPOKEN_OPERATORS:
+                out.append(_SPOKEN_OPERATORS[tok])
+                i += 1
+            elif tok in _SPOKEN_FILLERS:
+                i += 1
+            else:
+                raise CalculationError(f"'{tok}' ifadesini anlayamadım.")
+        return "".join(out)
+
+    @staticmethod
+    def _join_paren_words(tokens: List[str]) -> List[str]:
+        """"parantez aç/kapat" sözcüklerini sembole çevir"""
+        out = []
+        i = 0
+        while i < len(tokens):
+            if tokens[i] == "parantez" and i + 1 < len(tokens):
+                nxt = tokens[i + 1]
+                if nxt == "aç":
+                    out.append("(")
+                    i += 2
+                    continue
+                if nxt in ("kapat", "kapa", "kapan"):
+                    out.append(")")
+                    i += 2
+                    continue
+            out.append(tokens[i])
+            i += 1
+        return out
+
+    # --- Derleme ---
+    def _compile(self, text: str) -> Callable[[], Any]:
+        symbolic = self.to_symbolic(text)
+        if not symbolic:
+            raise CalculationError("Hesaplanacak bir ifade duyamadım.")
+        if len(symbolic) > self.max_length:
+            raise CalculationError("İfade çok uzun.")
+        try:
+            tree = ast.parse(symbolic, mode="eval")
+        except SyntaxError:
+            raise CalculationError("Geçerli bir matematik ifadesi değil.")
+        if sum(1 for _ in ast.walk(tree)) > self.max_nodes:
+            raise CalculationError("İfade çok karmaşık.")
+        return self._build(tree.body)
+
+    def _build(self, node: ast.AST) -> Callable[[], Any]:
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = node.value
+            return lambda: value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self._build(node.operand)
+            if isinstance(node.op, ast.USub):
+                return lambda: -operand()
+            return operand
+        if isinstance(node, ast.BinOp) and type(node.op) in self._binary_ops:
+            func = self._binary_ops[type(node.op)]
+            left, right = self._build(node.left), self._build(node.right)
+            return lambda: func(left(), right())
+        raise CalculationError("Sadece temel matematik işlemleri yapabilirim.")
+
+    # --- Sınırlı işlemler ---
+    def _check_size(self, value: Any) -> Any:
+        if isinstance(value, int) and value.bit_length() > self.max_bits:
+            raise CalculationError("Sonuç çok büyük.")
+        return value
+
+    def _mul(self, a, b):
+        if isinstance(a, int) and isinstance(b, int) and a.bit_length() + b.bit_length() > self.max_bits:
+            raise CalculationError("Sonuç çok büyük.")
+        return a * b
+
+    def _div(self, a, b):
+        if b == 0:
+            raise CalculationError("Sıfıra bölme yapılamaz.")
+        return a / b
+
+    def _floordiv(self, a, b):
+        if b == 0:
+            raise CalculationError("Sıfıra bölme yapılamaz.")
+        return a // b
+
+    def _mod(self, a, b):
+        if b == 0:
+            raise CalculationError("Sıfıra bölme yapılamaz.")
+        return a % b
+
+    def _pow(self, a, b):
+        if abs(b) > self.max_exponent:
+            raise CalculationError("Üs çok büyük.")
+        if isinstance(a, int) and isinstance(b, int) and b > 0:
+            # Sonucun bit uzunluğunu hesaplamadan önce tahmin et
+            if max(a.bit_length() - 1, 0) * b > self.max_bits:
+                raise CalculationError("Sonuç çok büyük.")
+        if a == 0 and b < 0:
+            raise CalculationError("Sıfıra bölme yapılamaz.")
+        try:
+            result = a ** b
+        except OverflowError:
+            raise CalculationError("Sonuç çok büyük.")
+        if isinstance(result, complex):
+            raise CalculationError("Sonuç tanımsız.")
+        return self._check_size(result)
+
+    def evaluate(self, text: str):
+        """İfadeyi hesapla; hatalı/tehlikeli girdide CalculationError fırlatır"""
+        try:
+            result = self.compile(text.strip())()
+        except OverflowError:
+            raise CalculationError("Sonuç çok büyük.")
+        if isinstance(result, float):
+            if math.isinf(result) or math.isnan(result):
+                raise CalculationError("Sonuç tanımsız.")
+            if result.is_integer() and abs(result) < 1e15:
+                return int(result)
+            return round(result, 10)
+        return result
+
+
+def format_number(value) -> str:
+    """Sonucu Türkçe ondalık virgülüyle yaz"""
+    return str(value).replace(".", ",")
+
+
+class RingBuffer:
+    """array('d') üzerinde sabit boyutlu halka tampon; en eski değerin üzerine yazar"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._data = array("d", bytes(8 * self.capacity))
+        self._next = 0
+        self.size = 0
+
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def last(self, count: Optional[int] = None) -> List[float]:
+        """Son 'count' değer, eskiden yeniye"""
+        count = self.size if count is None else min(count, self.size)
+        start = (self._next - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count].tolist()
+        return (self._data[start:] + self._data[:(start + count) % self.capacity]).tolist()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class SystemSampler(threading.Thread):
+    """CPU, bellek, disk ve ağ sayaçlarını arka planda halka tamponlara yazan iş parçacığı
+
+    system_info her seferinde psutil'i çağırmak yerine son örneği ve kısa
+    dönem ortalamasını buradan okur. Her örneğin kendi maliyeti de ölçülür
+    (cost_ms); aralık ve geçmiş uzunluğu ayarlardan değiştirilebilir.
+    """
+
+    SERIES = ("time", "cpu", "memory", "disk", "disk_read", "disk_write", "net_recv", "net_sent", "cost_ms")
+
+    def __init__(self, interval: float = 5, history_minutes: float = 30,
+                 metrics: Optional[StageMetrics] = None):
+        super().__init__(name="system-sampler", daemon=True)
+        self.interval = interval
+        capacity = int(history_minutes * 60 / interval) if interval > 0 else 1
+        self.series: Dict[str, RingBuffer] = {name: RingBuffer(capacity) for name in self.SERIES}
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._prev_io: Optional[Tuple[float, Any, Any]] = None
+        # cpu_percent(None) bir önceki çağrıdan bu yana ölçer; ilk örnek 0.0 olmasın
+        psutil.cpu_percent(interval=None)
+
+    def sample(self, cpu_interval: Optional[float] = None):
+        """Tek örnek al (oranlar bir önceki örneğe göre, bayt/sn)
+
+        cpu_interval verilirse CPU o kadar süre bekleyerek ölçülür (tek seferlik örnek için).
+        """
+        start = time.perf_counter()
+        now = time.monotonic()
+        cpu = psutil.cpu_percent(interval=cpu_interval)
+        memory = psutil.virtual_memory().percent
+        disk = psutil.disk_usage(os.path.abspath(os.sep)).percent
+        disk_io = psutil.disk_io_counters()
+        net_io = psutil.net_io_counters()
+
+        rates = [0.0, 0.0, 0.0, 0.0]
+        if self._prev_io is not None:
+            prev_time, prev_disk, prev_net = self._prev_io
+            elapsed = max(now - prev_time, 1e-6)
+            if disk_io is not None and prev_disk is not None:
+                rates[0] = (disk_io.read_bytes - prev_disk.read_bytes) / elapsed
+                rates[1] = (disk_io.write_bytes - prev_disk.write_bytes) / elapsed
+            if net_io is not None and prev_net is not None:
+                rates[2] = (net_io.bytes_recv - prev_net.bytes_recv) / elapsed
+                rates[3] = (net_io.bytes_sent - prev_net.bytes_sent) / elapsed
+        self._prev_io = (now, disk_io, net_io)
+
+        cost = time.perf_counter() - start
+        values = (time.time(), cpu, memory, disk, *rates, cost * 1000)
+        with self._lock:
+            for name, value in zip(self.SERIES, values):
+                self.series[name].append(value)
+        if self.metrics is not None:
+            self.metrics.record("system_sample", cost)
+
+    def run(self):
+        # İlk cpu_percent çağrısı referans noktasıdır, 0 döndürür
+        psutil.cpu_percent(interval=None)
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Sistem örnekleme hatası: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def current(self) -> Optional[Dict[str, float]]:
+        """En son örnek"""
+        with self._lock:
+            if not len(self.series["time"]):
+                return None
+            return {name: buf.last(1)[0] for name, buf in self.series.items()}
+
+    def trend(self, minutes: float) -> Optional[Dict[str, Any]]:
+        """Son 'minutes' dakikadaki (ortalama, en yüksek) değerler ve örnek sayısı"""
+        with self._lock:
+            times = self.series["time"].last()
+            if not times:
+                return None
+            cutoff = times[-1] - minutes * 60
+            count = len(times) - next(i for i, t in enumerate(times) if t >= cutoff)
+            result = {}
+            for name in self.SERIES[1:]:
+                values = self.series[name].last(count)
+                result[name] = (sum(values) / len(values), max(values))
+        result["samples"] = count
+        return result
+
+
+def _format_rate(bytes_per_second: float) -> str:
+    if bytes_per_second >= 1024 * 1024:
+        return f"{bytes_per_second / (1024 * 1024):.1f} megabayt".replace(".", ",")
+    return f"{bytes_per_second / 1024:.0f} kilobayt"
+
+
+class VoiceAssistant:
+    """Gelişmiş Sesli Asistan Sınıfı"""
+
+    def __init__(self, config: Optional[Dict[str, Dict[str, Any]]] = None,
+                 headless: bool = False, data_dir: Optional[str] = None):
+        """headless=True: mikrofon/TTS açılmaz, söylenenler self.spoken listesine yazılır,
+        tarayıcı ve sistem komutları çalıştırılmak yerine self.actions'a kaydedilir."""
+        self.config = config or load_config()
+        self.headless = headless
+        self.data_dir = data_dir or self.config["assistant"]["data_dir"]
+        self.spoken: List[str] = []
+        self.actions: List[List[str]] = []
+        self.last_intent: Optional[str] = None
+        # Parametresi eksik söylenen komut ("uygulama aç"); sıradaki cümle parametre olarak kullanılır
+        self.pending_intent: Optional[Intent] = None
+        # Aşama süreleri (tanıma, eşleşme, işleyici, TTS) histogramları
+        self.metrics = StageMetrics()
+        self.is_listening = False
+        self.wake_words = ["asistan", "hey asistan", "bilgisayar"]
+        # En uzun uyandırma kelimesi önce denensin ("hey asistan" > "asistan")
+        self._wake_re = re.compile(r"\b(?:%s)\b" % "|".join(
+            re.escape(w) for w in sorted(self.wake_words, key=len, reverse=True)))
+        self.exit_words = ["çık", "kapat", "durdur", "bitir"]
+
+        # Komut yönlendirici: @intent ile işaretli metodlar tanım sırasıyla kaydedilir
+        self.router = IntentRouter()
+        self.router.bind(self)
+
+        self.speaking = threading.Event()
+        started = time.perf_counter()
+        if not headless:
+            # Arka planda konuşan TTS iş parçacığı; pyttsx3 orada başlatılır
+            self.tts = SpeechOutput(self.config["tts"], self.speaking, self.metrics)
+            self.tts.start()
+
+            # Çevrimdışı tanıma modelleri arka planda yüklenir
+            self.recognizer = sr.Recognizer()
+            self.speech = SpeechRecognizer.from_config(self.config["recognizer"], self.recognizer)
+            self.speech.load_async()
+            self.microphone = sr.Microphone()
+
+            # Sürekli yakalama ve yerel konuşma kapısı; gürültü tabanı
+            # ayrı kalibrasyon yerine akış üzerinde sürekli izlenir
+            vad_cfg = self.config["vad"]
+            self.vad = VoiceActivityGate(
+                self.microphone.SAMPLE_RATE, self.microphone.SAMPLE_WIDTH, self.microphone.CHUNK,
+                threshold=vad_cfg["threshold"],
+                max_silence=self.recognizer.pause_threshold,
+                dynamic=vad_cfg["dynamic_threshold"],
+                noise_ratio=vad_cfg["noise_ratio"],
+                damping=vad_cfg["damping"],
+                min_threshold=vad_cfg["min_threshold"],
+                warmup=vad_cfg["warmup"],
+            )
+            pipe_cfg = self.config["pipeline"]
+            self.capture = AudioCapture(
+                self.microphone, self.vad, self.speaking,
+                on_barge_in=self.tts.interrupt if pipe_cfg["barge_in"] else None,
+                barge_in_ratio=pipe_cfg["barge_in_ratio"],
+                barge_in_frames=pipe_cfg["barge_in_frames"],
+            )
+            # Tanıma aşamasından yürütme aşamasına giden sınırlı kuyruk
+            self.commands: "queue.Queue[Tuple[str, float]]" = queue.Queue(maxsize=pipe_cfg["command_queue"])
+            # Mikrofonu hemen aç: ilk kareler eşiğin ısınması için kullanılır
+            self.capture.start()
+
+        # eval kullanmayan hesap motoru
+        self.calculator = ArithmeticEngine()
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # Wikipedia istemcisi ve özet önbelleği (headless modda kullanıcının önbelleğine dokunulmaz)
+        wiki_cfg = self.config["wikipedia"]
+        self.wiki = WikipediaClient(wiki_cfg["api_url"], wiki_cfg.get("timeout", 5))
+        cache_file = os.path.join(self.data_dir, "wiki_cache.db") if headless else wiki_cfg["cache_file"]
+        self.wiki_cache = SummaryCache(
+            cache_file, wiki_cfg["ttl_hours"] * 3600,
+            wiki_cfg["miss_ttl_hours"] * 3600, wiki_cfg["max_entries"])
+
+        # Notlar dosyası
+        self.notes = NotesStore(os.path.join(self.data_dir, "assistant_notes.jsonl"),
+                                legacy_path=os.path.join(self.data_dir, "assistant_notes.json"))
+
+        # Hatırlatıcılar: ayrı iş parçacığında tam zamanında çalar
+        self.reminders = ReminderScheduler(
+            os.path.join(self.data_dir, "assistant_reminders.jsonl"),
+            lambda item: self.speak(f"Hatırlatma: {item['text']}"))
+        self.reminders.start()
+
+        # Sistem sayaçları: arka planda örneklenir, system_info anında yanıt verir
+        sys_cfg = self.config["system"]
+        self.sampler: Optional[SystemSampler] = None
+        if psutil is not None:
+            interval = sys_cfg["sample_interval"]
+            self.sampler = SystemSampler(interval or 5, sys_cfg["history_minutes"], self.metrics)
+            if interval > 0 and not headless:
+                self.sampler.start()
+        self.metrics.record("startup", time.perf_counter() - started)
+
+    def speak(self, text: str):
+        """Metni TTS kuyruğuna ekle (beklemeden döner)
+
+        Konuşma sürerken yakalama susturulur, böylece asistan kendi sesini
+        tanıyıcıya göndermez.
+        """
+        if self.headless:
+            self.spoken.append(text)
+            return
+        print(f"🗣️  {text}")
+        self.tts.say(text)
+
+    def open_url(self, url: str):
+        """Tarayıcıda aç (headless modda yalnızca kaydet)"""
+        if self.headless:
+            self.actions.append(["open_url", url])
+            return
+        webbrowser.open(url)
+
+    def run_system(self, args: List[str]):
+        """Sistem komutu çalıştır (headless modda yalnızca kaydet)"""
+        if self.headless:
+            self.actions.append(args)
+            return
+        subprocess.run(args)
+
+    def fetch_summary(self, query: str) -> Optional[str]:
+        """Wikipedia özetini indir (headless modda ağa çıkmadan yalnızca kaydet)"""
+        if self.headless:
+            self.actions.append(["wikipedia", query])
             return None
-        except sr.RequestError as e:
-            logger.error(f"Ses tanıma servisi hatası: {e}")
+        return self.wiki.fetch_summary(query)
+
+    def log_transcript(self, text: str):
+        """Duyulan komutu yeniden oynatılabilir günlüğe ekle"""
+        path = self.config["assistant"].get("transcript_log")
+        if not path or self.headless:
+            return
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(f"{datetime.now().isoformat()}\t{text}\n")
+        except Exception as e:
+            logger.error(f"Transkript yazılamadı: {e}")
+
+    def listen(self, timeout: int = 5) -> Optional[str]:
+        """Konuşma kapısından gelen sıradaki bölütü metne çevir"""
+        if self.capture.ident is None:
+            self.capture.start()
+        audio = self.capture.next_segment(timeout)
+        if audio is None:
             return None
+        return self.transcribe(audio)
+
+    def transcribe(self, audio: "sr.AudioData") -> Optional[str]:
+        """Bölütü ayarlardaki motor sırasıyla metne çevir (ör. önce Vosk, olmazsa Google)"""
+        try:
+            start = time.perf_counter()
+            text = self.speech.transcribe(audio)
+            elapsed = time.perf_counter() - start
+            self.metrics.record("recognition", elapsed)
+            if self.speech.last_backend:
+                self.metrics.record(f"recognition:{self.speech.last_backend}", elapsed)
+            if not text:
+                return None
+            print(f"👂 Duydum: {text}")
+            return tr_casefold(text)
+
         except Exception as e:
             logger.error(f"Dinleme hatası: {e}")
             return None
 
+    def strip_wake_word(self, text: str) -> Optional[str]:
+        """Uyandırma kelimesinden sonraki kısmı döndür; kelime yoksa None"""
+        match = self._wake_re.search(text)
+        if match is None:
+            return None
+        return text[match.end():].strip(" ,.!?")
+
     def process_command(self, command: str) -> bool:
         """Komutu işle ve uygun fonksiyonu çalıştır"""
-        command = command.strip().lower()
+        command = tr_casefold(command.strip())
 
         # Çıkış komutları kontrol et
         if any(word in command for word in self.exit_words):
+            self.last_intent = "exit"
             self.speak("Görüşürüz! Hoşça kal.")
             return False
 
-        # Komut desenlerini kontrol et
-        for pattern, function in self.command_patterns.items():
-            match = re.search(pattern, command)
-            if match:
-                try:
-                    # Eşleşen grupları fonksiyona geç
-                    groups = match.groups()
-                    if groups and any(groups):
-                        # Boş olmayan ilk grubu kullan
-                        param = next((g for g in groups if g), "").strip()
-                        if param:
-                            function(param)
-                        else:
-                            function()
-                    else:
-                        function()
-                    return True
-                except Exception as e:
-                    logger.error(f"Komut yürütme hatası: {e}")
-                    self.speak("Üzgünüm, bu komutu yerine getiremiyorum.")
-                    return True
-
-        # Bilinmeyen komut
-        self.speak("Bu komutu anlayamadım. Yardım için 'yardım' deyin.")
+        # Komut yönlendiricisinde ara
+        start = time.perf_counter()
+        found = self.router.match(command)
+        self.metrics.record("intent_match", time.perf_counter() - start)
+        pending, self.pending_intent = self.pending_intent, None
+        if found is None and pending is not None:
+            # Önceki komutun sorduğu eksik bilgi
+            found = pending, command
+        if found is None and self.config["fuzzy"]["enabled"]:
+            # Yanlış tanınmış olabilir ("saat kac", "hesap la"): en yakın örnek cümleyi dene
+            start = time.perf_counter()
+            fuzzy = self.router.match_fuzzy(command, self.config["fuzzy"]["min_confidence"])
+            self.metrics.record("fuzzy_match", time.perf_counter() - start)
+            if fuzzy is not None:
+                item, param, confidence = fuzzy
+                logger.info(f"Yaklaşık eşleşme: '{command}' → {item.name} (güven {confidence:.2f})")
+                found = item, param
+        if found is None:
+            # Bilinmeyen komut
+            self.last_intent = None
+            self.speak("Bu komutu anlayamadım. Yardım için 'yardım' deyin.")
+            return True
+
+        item, param = found
+        self.last_intent = item.name
+        if item.needs_param and not param:
+            self.pending_intent = item
+            self.speak(f"Neyi? Örneğin: '{item.examples[0]} ...' diyebilir ya da şimdi yalnızca söyleyebilirsiniz.")
+            return True
+        start = time.perf_counter()
+        try:
+            if param:
+                item.handler(param)
+            else:
+                item.handler()
+        except Exception as e:
+            logger.error(f"Komut yürütme hatası ({item.name}): {e}")
+            self.speak("Üzgünüm, bu komutu yerine getiremiyorum.")
+        elapsed = time.perf_counter() - start
+        self.metrics.record("handler", elapsed)
+        self.metrics.record(f"handler:{item.name}", elapsed)
         return True
 
+    def load_plugin(self, plugin: Any):
+        """@intent ile işaretli metodları olan bir eklenti nesnesini kaydet"""
+        self.router.bind(plugin)
+
     # Komut fonksiyonları
+    @intent(r"saat\s*kaç|saati\s*söyle")
     def get_time(self, param: str = ""):
         """Şu anki saati söyle"""
         now = datetime.now()
         time_str = now.strftime("%H:%M")
         self.speak(f"Şu an saat {time_str}")
 
+    @intent(r"tarih\s*ne|bugün\s*ne")
     def get_date(self, param: str = ""):
         """Bugünün tarihini söyle"""
         now = datetime.now()
@@ -218,6 +2312,7 @@ class VoiceAssistant:
 
         self.speak(f"Bugün {date_str}")
 
+    @intent(r"hava\s*durumu|hava\s*nasıl", examples=["hava durumu", "hava nasıl", "bugün hava nasıl"])
     def get_weather(self, param: str = ""):
         """Hava durumu bilgisi al"""
         try:
@@ -228,48 +2323,42 @@ class VoiceAssistant:
             logger.error(f"Hava durumu hatası: {e}")
             self.speak("Hava durumu bilgisi alınamadı.")
 
+    @intent(r"hesapla\s*(.*)|matematik\s*(.*)")
     def calculate(self, expression: str):
-        """Matematiksel hesaplama yap"""
+        """Matematiksel hesaplama yap ("on iki çarpı üç", "2 üssü 10")"""
         try:
-            # Güvenlik için sadece belirli karakterlere izin ver
-            allowed_chars = "0123456789+-*/()., "
-            if not all(c in allowed_chars for c in expression):
-                self.speak("Sadece temel matematik işlemleri yapabilirim.")
-                return
-
-            # Türkçe sayıları İngilizce'ye çevir
-            expression = expression.replace("çarpı", "*").replace("bölü", "/")
-            expression = expression.replace("artı", "+").replace("eksi", "-")
-            expression = expression.replace("kere", "*")
-
-            result = eval(expression)
-            self.speak(f"Sonuç: {result}")
+            result = self.calculator.evaluate(expression)
+            self.speak(f"Sonuç: {format_number(result)}")
 
+        except CalculationError as e:
+            self.speak(str(e))
         except Exception as e:
             logger.error(f"Hesaplama hatası: {e}")
             self.speak("Hesaplama yapılamadı. Lütfen geçerli bir matematik ifadesi kullanın.")
 
+    @intent(r"arama\s*yap\s*(.*)|google.*arama\s*(.*)", examples=["arama yap", "google'da arama"])
     def web_search(self, query: str):
         """Web araması yap"""
         try:
             search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            webbrowser.open(search_url)
+            self.open_url(search_url)
             self.speak(f"{query} için arama yapıyorum.")
         except Exception as e:
             logger.error(f"Web arama hatası: {e}")
             self.speak("Web araması yapılamadı.")
 
+    @intent(r"wikipedia.*ara\s*(.*)|vikipedi.*ara\s*(.*)",
+            examples=["wikipedia'da ara", "vikipedi'de ara"])
     def wikipedia_search(self, query: str):
         """Wikipedia araması yap"""
         try:
-            wiki_wiki = wikipedia.Wikipedia('tr')
-            page = wiki_wiki.page(query)
+            key = normalize_query(query)
+            found, summary = self.wiki_cache.get(key)
+            if not found:
+                summary = self.fetch_summary(query)
+                self.wiki_cache.put(key, summary)
 
-            if page.exists():
-                # İlk 2 cümleyi al
-                text = page.text
-                sentences = text.split('. ')[:2]
-                summary = '. '.join(sentences) + '.'
+            if summary:
                 self.speak(f"{query} hakkında: {summary}")
             else:
                 self.speak(f"{query} hakkında bilgi bulunamadı.")
@@ -278,27 +2367,28 @@ class VoiceAssistant:
             logger.error(f"Wikipedia arama hatası: {e}")
             self.speak("Wikipedia araması yapılamadı.")
 
+    @intent(r"müzik\s*aç|youtube.*müzik", examples=["müzik aç", "youtube'dan müzik"])
     def play_music(self, param: str = ""):
         """Müzik çal"""
         try:
             music_url = "https://www.youtube.com/results?search_query=müzik"
-            webbrowser.open(music_url)
+            self.open_url(music_url)
             self.speak("YouTube müzik açılıyor.")
         except Exception as e:
             logger.error(f"Müzik çalma hatası: {e}")
             self.speak("Müzik çalınamadı.")
 
+    @intent(r"not\s*al\s*(.*)|kaydet\s*(.*)")
     def take_note(self, note: str):
         """Not al"""
         try:
-            timestamp = datetime.now().isoformat()
-            self.notes.append({"timestamp": timestamp, "note": note})
-            self.save_notes()
+            self.notes.add(note)
             self.speak("Not alındı.")
         except Exception as e:
             logger.error(f"Not alma hatası: {e}")
             self.speak("Not alınamadı.")
 
+    @intent(r"notları\s*oku|notları\s*göster")
     def read_notes(self, param: str = ""):
         """Notları oku"""
         try:
@@ -307,7 +2397,7 @@ class VoiceAssistant:
                 return
 
             self.speak(f"Toplam {len(self.notes)} notunuz var.")
-            for i, note_data in enumerate(self.notes[-5:], 1):  # Son 5 notu oku
+            for i, note_data in enumerate(self.notes.latest(5), 1):  # Son 5 notu oku
                 note = note_data["note"]
                 self.speak(f"Not {i}: {note}")
 
@@ -315,28 +2405,78 @@ class VoiceAssistant:
             logger.error(f"Not okuma hatası: {e}")
             self.speak("Notlar okunamadı.")
 
+    @intent(r"notlarda\s*ara\s*(.*)|notlarımda\s*ara\s*(.*)")
+    def search_notes(self, query: str):
+        """Notlarda tam metin arama yap"""
+        try:
+            results = self.notes.search(query, limit=3)
+            if not results:
+                self.speak(f"{query} ile ilgili not bulunamadı.")
+                return
+            self.speak(f"{query} ile ilgili {len(results)} not buldum.")
+            for note_data in results:
+                self.speak(note_data["note"])
+        except Exception as e:
+            logger.error(f"Not arama hatası: {e}")
+            self.speak("Notlarda arama yapılamadı.")
+
+    @intent(r"sistem\s*bilgisi|bilgisayar\s*durumu")
     def system_info(self, param: str = ""):
-        """Sistem bilgilerini ver"""
+        """Sistem bilgilerini ver (arka plan örneklerinden, kısa dönem eğilimiyle)"""
+        if self.sampler is None:
+            self.speak("Sistem bilgileri için psutil kütüphanesi gerekli.")
+            return
         try:
             import platform
-            import psutil
-
-            system = platform.system()
-            cpu_count = psutil.cpu_count()
-            memory = psutil.virtual_memory()
 
-            info = f"İşletim sistemi: {system}. "
-            info += f"İşlemci sayısı: {cpu_count}. "
-            info += f"Bellek kullanımı: yüzde {memory.percent}."
+            current = self.sampler.current()
+            stale = current is None or time.time() - current["time"] > self.sampler.interval
+            if stale or not self.sampler.is_alive():
+                # Örnekleyici çalışmıyor (headless, sample_interval 0) ya da son örnek eski:
+                # kısa bekleyen taze bir örnek al
+                self.sampler.sample(cpu_interval=0.2)
+                current = self.sampler.current()
+            minutes = self.config["system"]["trend_minutes"]
+            trend = self.sampler.trend(minutes)
+
+            info = f"İşletim sistemi: {platform.system()}. "
+            info += f"İşlemci sayısı: {psutil.cpu_count()}. "
+            info += f"İşlemci kullanımı: yüzde {current['cpu']:.0f}"
+            if trend and trend["samples"] > 1:
+                cpu_mean, cpu_max = trend["cpu"]
+                info += (f", son {minutes} dakikada ortalama yüzde {cpu_mean:.0f}, "
+                         f"en yüksek yüzde {cpu_max:.0f}")
+            info += f". Bellek kullanımı: yüzde {current['memory']:.0f}. "
+            info += f"Disk doluluğu: yüzde {current['disk']:.0f}."
+            if trend and trend["samples"] > 1:
+                info += (f" Ağ: saniyede {_format_rate(trend['net_recv'][0])} indirme, "
+                         f"{_format_rate(trend['net_sent'][0])} gönderme.")
 
             self.speak(info)
 
-        except ImportError:
-            self.speak("Sistem bilgileri için psutil kütüphanesi gerekli.")
         except Exception as e:
             logger.error(f"Sistem bilgisi hatası: {e}")
             self.speak("Sistem bilgileri alınamadı.")
 
+    @intent(r"performans\s*rapor")
+    def performance_report(self, param: str = ""):
+        """Aşama sürelerini özetle"""
+        labels = [("recognition", "tanıma"), ("handler", "komut"), ("tts_synthesis", "ses sentezi"),
+                  ("total", "toplam yanıt")]
+        parts = []
+        for stage, label in labels:
+            hist = self.metrics.get(stage)
+            if hist and hist.count:
+                parts.append(f"{label} ortalama {hist.total / hist.count:.0f}, "
+                             f"yüzde doksan beşlik dilimde {hist.percentile(95):.0f} milisaniye")
+        if not parts:
+            self.speak("Henüz ölçüm yok.")
+            return
+        self.speak(". ".join(parts) + ".")
+        if not self.headless:
+            print(json.dumps(self.metrics.snapshot()["stages"], ensure_ascii=False, indent=2))
+
+    @intent(r"uygulama\s*aç\s*(.*)|program\s*aç\s*(.*)")
     def open_application(self, app_name: str):
         """Uygulama aç"""
         try:
@@ -358,22 +2498,23 @@ class VoiceAssistant:
 
             app_name = app_name.lower().strip()
             if app_name in apps:
-                subprocess.run(["open", "-a", apps[app_name]])
+                self.run_system(["open", "-a", apps[app_name]])
                 self.speak(f"{apps[app_name]} açılıyor.")
             else:
                 # Direkt isim ile dene
-                subprocess.run(["open", "-a", app_name])
+                self.run_system(["open", "-a", app_name])
                 self.speak(f"{app_name} açılıyor.")
 
         except Exception as e:
             logger.error(f"Uygulama açma hatası: {e}")
             self.speak("Uygulama açılamadı.")
 
+    @intent(r"dosya\s*aç\s*(.*)|klasör\s*aç\s*(.*)")
     def open_file(self, file_path: str):
         """Dosya veya klasör aç"""
         try:
             if os.path.exists(file_path):
-                subprocess.run(["open", file_path])
+                self.run_system(["open", file_path])
                 self.speak("Dosya açılıyor.")
             else:
                 self.speak("Dosya bulunamadı.")
@@ -381,17 +2522,18 @@ class VoiceAssistant:
             logger.error(f"Dosya açma hatası: {e}")
             self.speak("Dosya açılamadı.")
 
+    @intent(r"ses\s*seviyesi\s*(.*)|volume\s*(.*)")
     def volume_control(self, level: str):
         """Ses seviyesini kontrol et"""
         try:
             if "aç" in level or "yükselt" in level:
-                subprocess.run(["osascript", "-e", "set volume output volume 80"])
+                self.run_system(["osascript", "-e", "set volume output volume 80"])
                 self.speak("Ses seviyesi yükseltildi.")
             elif "kapat" in level or "alçalt" in level:
-                subprocess.run(["osascript", "-e", "set volume output volume 20"])
+                self.run_system(["osascript", "-e", "set volume output volume 20"])
                 self.speak("Ses seviyesi alçaltıldı.")
             elif "sustur" in level:
-                subprocess.run(["osascript", "-e", "set volume output muted true"])
+                self.run_system(["osascript", "-e", "set volume output muted true"])
                 self.speak("Ses kapatıldı.")
             else:
                 self.speak("Ses komutu anlaşılamadı.")
@@ -399,29 +2541,37 @@ class VoiceAssistant:
             logger.error(f"Ses kontrolü hatası: {e}")
             self.speak("Ses ayarı değiştirilemedi.")
 
+    @intent(r"ekran\s*görüntüsü|screenshot")
     def take_screenshot(self, param: str = ""):
         """Ekran görüntüsü al"""
         try:
-            subprocess.run(["screencapture", "-x", f"screenshot_{int(time.time())}.png"])
+            self.run_system(["screencapture", "-x", f"screenshot_{int(time.time())}.png"])
             self.speak("Ekran görüntüsü alındı.")
         except Exception as e:
             logger.error(f"Ekran görüntüsü hatası: {e}")
             self.speak("Ekran görüntüsü alınamadı.")
 
+    @intent(r"hatırlatıcı\s*kur\s*(.*)|alarm\s*kur\s*(.*)")
     def set_reminder(self, reminder_text: str):
-        """Hatırlatıcı kur"""
-        try:
-            # Basit hatırlatıcı sistemi
-            reminder_time = datetime.now() + timedelta(minutes=5)  # 5 dakika sonra
-            self.reminders.append({
-                "time": reminder_time,
-                "text": reminder_text
-            })
-            self.speak("5 dakika sonra hatırlatacağım.")
+        """Hatırlatıcı kur ("20 dakika sonra ...", "yarın 9'da ...")"""
+        try:
+            now = datetime.now()
+            reminder_time, text = parse_reminder_time(reminder_text, now)
+            self.reminders.add(reminder_time, text or "Hatırlatıcı")
+            if reminder_time.date() == now.date():
+                self.speak(f"Saat {reminder_time:%H:%M} için hatırlatıcı kuruldu.")
+            elif reminder_time.date() == (now + timedelta(days=1)).date():
+                if re.search(r"\bbugün\b", reminder_text):
+                    self.speak(f"Bugün o saat geçti, yarın saat {reminder_time:%H:%M} için hatırlatıcı kuruldu.")
+                else:
+                    self.speak(f"Yarın saat {reminder_time:%H:%M} için hatırlatıcı kuruldu.")
+            else:
+                self.speak(f"{reminder_time:%d.%m.%Y %H:%M} için hatırlatıcı kuruldu.")
         except Exception as e:
             logger.error(f"Hatırlatıcı kurma hatası: {e}")
             self.speak("Hatırlatıcı kurulamadı.")
 
+    @intent(r"yardım|komutlar|neler\s*yapabilirsin")
     def show_help(self, param: str = ""):
         """Yardım bilgilerini göster"""
         help_text = """
@@ -430,94 +2580,521 @@ class VoiceAssistant:
         - Matematik hesaplamaları
         - Web araması
         - Wikipedia araması
-        - Not alma ve okuma
+        - Not alma, okuma ve notlarda arama
         - Uygulama açma
         - Sistem bilgileri
         - Ses kontrolü
         - Ekran görüntüsü alma
         - Hatırlatıcı kurma
+        - Performans raporu
         
         Örnek komutlar:
         'Saat kaç', 'Hesapla 5 çarpı 3', 'Not al bugün toplantı var',
+        'Notlarda ara toplantı',
         'Safari aç', 'Sistem bilgisi', 'Ekran görüntüsü al'
         """
         self.speak("Yardım bilgilerini konsola yazdırıyorum.")
-        print(help_text)
+        if not self.headless:
+            print(help_text)
 
-    def load_notes(self):
-        """Notları dosyadan yükle"""
-        try:
-            if os.path.exists(self.notes_file):
-                with open(self.notes_file, 'r', encoding='utf-8') as f:
-                    self.notes = json.load(f)
-            else:
-                self.notes = []
-        except Exception as e:
-            logger.error(f"Not yükleme hatası: {e}")
-            self.notes = []
+    def _recognition_loop(self):
+        """Tanıma aşaması: bölütleri metne çevirip uyandırma kelimesine göre komut kuyruğuna koy
 
-    def save_notes(self):
-        """Notları dosyaya kaydet"""
-        try:
-            with open(self.notes_file, 'w', encoding='utf-8') as f:
-                json.dump(self.notes, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Not kaydetme hatası: {e}")
+        Yakalama ve tanıma, komut yürütülürken ve asistan konuşurken de sürer;
+        yavaş bir Wikipedia araması sıradaki komutu duymayı engellemez.
+        """
+        followup_timeout = self.config["pipeline"]["followup_timeout"]
+        awaiting_until = 0.0
+        while self.is_listening:
+            try:
+                audio = self.capture.next_segment(timeout=0.5)
+                now = time.monotonic()
+                if audio is None:
+                    if awaiting_until and now > awaiting_until:
+                        awaiting_until = 0.0
+                        self.speak("Sizi duyamadım.")
+                    continue
 
-    def check_reminders(self):
-        """Hatırlatıcıları kontrol et"""
-        now = datetime.now()
-        for reminder in self.reminders[:]:
-            if now >= reminder["time"]:
-                self.speak(f"Hatırlatma: {reminder['text']}")
-                self.reminders.remove(reminder)
+                captured_at = getattr(audio, "captured_at", now)
+                self.metrics.record("capture_wait", now - captured_at)
+                self.metrics.record("audio_length",
+                                    len(audio.frame_data) / float(audio.sample_rate * audio.sample_width))
+                text = self.transcribe(audio)
+                if not text:
+                    continue
+
+                # Uyandırma kelimesi var mı? "asistan saat kaç" tek bölüt olarak gelir
+                command = self.strip_wake_word(text)
+                if command is None:
+                    if not awaiting_until:
+                        continue
+                    command = text
+                elif not command:
+                    # Kullanıcı konuşmaya devam ediyorsa onay cümlesini atla,
+                    # aksi halde TTS sırasında yakalama susturulur ve komut kaybolur
+                    if not self.vad.active and self.capture.segments.empty():
+                        self.speak("Evet, dinliyorum.")
+                    awaiting_until = now + followup_timeout
+                    continue
+
+                awaiting_until = 0.0
+                # Yürütme aşaması doluysa bekle (geri basınç); bu sırada ses kuyruğu en eskiyi atar
+                while self.is_listening:
+                    try:
+                        self.commands.put((command, captured_at), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+            except Exception as e:
+                logger.error(f"Tanıma aşaması hatası: {e}")
+                time.sleep(1)
 
     def start_listening(self):
-        """Sürekli dinleme modunu başlat"""
+        """Sürekli dinleme modunu başlat
+
+        Aşamalar ayrı iş parçacıklarında ve sınırlı kuyruklarla çalışır:
+        yakalama (AudioCapture) → tanıma (_recognition_loop) → yürütme
+        (bu iş parçacığı) → konuşma (SpeechOutput).
+        """
         self.is_listening = True
+        startup = self.metrics.get("startup")
+        if startup:
+            logger.info(f"Dinlemeye hazır: {startup.max:.0f} ms")
         self.speak("Sesli asistan aktif. Beni uyandırmak için 'asistan' deyin.")
+        if self.capture.ident is None:
+            self.capture.start()
+        recognition = threading.Thread(target=self._recognition_loop, name="recognition", daemon=True)
+        recognition.start()
+        metrics_file = self.config["metrics"].get("dump_file")
+        if metrics_file:
+            self.metrics.start_periodic_dump(metrics_file, self.config["metrics"]["dump_interval"])
 
         while self.is_listening:
             try:
-                # Hatırlatıcıları kontrol et
-                self.check_reminders()
-
-                # Uyandırma kelimesini dinle
-                command = self.listen(timeout=1)
-                if command is None:
+                try:
+                    command, captured_at = self.commands.get(timeout=0.5)
+                except queue.Empty:
                     continue
 
-                # Uyandırma kelimesi var mı?
-                if any(wake_word in command for wake_word in self.wake_words):
-                    self.speak("Evet, dinliyorum.")
-
-                    # Komutu dinle
-                    command = self.listen(timeout=10)
-                    if command:
-                        if not self.process_command(command):
-                            self.is_listening = False
-                            break
-                    else:
-                        self.speak("Sizi duyamadım.")
+                self.log_transcript(command)
+                keep_going = self.process_command(command)
+                total = time.monotonic() - captured_at
+                self.metrics.record("total", total)
+                logger.info(f"Komut '{command}' ({self.last_intent or 'bilinmeyen'}): "
+                            f"tanıma {self.speech.last_backend or '-'}, toplam {total * 1000:.0f} ms")
+                if not keep_going:
+                    self.is_listening = False
+                    break
 
             except KeyboardInterrupt:
+                self.tts.interrupt()
                 self.speak("Kapatılıyor...")
                 self.is_listening = False
                 break
             except Exception as e:
-                logger.error(f"Dinleme döngüsü hatası: {e}")
+                logger.error(f"Yürütme aşaması hatası: {e}")
                 time.sleep(1)
 
+        self.capture.stop()
+        self.reminders.stop()
+        if self.sampler is not None:
+            self.sampler.stop()
+        recognition.join(timeout=2)
+        # Veda cümlesi bitmeden çıkma
+        self.tts.wait_until_done(timeout=10)
+        self.tts.stop()
+        self.metrics.stop()
+        if metrics_file:
+            self.metrics.dump(metrics_file)
+        logger.info(self.metrics.summary())
+        logger.info(self.vad.summary())
         logger.info("Sesli asistan kapatıldı.")
 
 
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class TranscriptReplay:
+    """Metin transkriptlerini headless asistana verip komut başına süre ölçer
+
+    Girdi satırları düz metin ya da transkript günlüğü biçiminde
+    ("<zaman>\t<komut>") olabilir; boş ve '#' ile başlayan satırlar atlanır.
+    """
+
+    def __init__(self, assistant: "VoiceAssistant"):
+        self.assistant = assistant
+        self.latencies: Dict[str, List[float]] = {}
+        self.commands = 0
+        self.elapsed = 0.0
+
+    @staticmethod
+    def parse_line(line: str) -> Optional[str]:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
+        if "\t" in line:
+            line = line.rsplit("\t", 1)[1].strip()
+        return line or None
+
+    def run(self, lines, echo: bool = False):
+        assistant = self.assistant
+        for raw in lines:
+            text = self.parse_line(raw)
+            if text is None:
+                continue
+            rest = assistant.strip_wake_word(tr_casefold(text))
+            command = text if rest is None or not rest else rest
+            spoken_before = len(assistant.spoken)
+
+            start = time.perf_counter()
+            assistant.process_command(command)
+            elapsed = time.perf_counter() - start
+
+            name = assistant.last_intent or "bilinmeyen"
+            self.latencies.setdefault(name, []).append(elapsed)
+            self.commands += 1
+            self.elapsed += elapsed
+            if echo:
+                for reply in assistant.spoken[spoken_before:]:
+                    print(f"{command}\t→ {reply}")
+
+    def report(self) -> Dict[str, Any]:
+        intents = {}
+        for name, values in sorted(self.latencies.items(), key=lambda kv: -len(kv[1])):
+            values = sorted(values)
+            total = sum(values)
+            intents[name] = {
+                "count": len(values),
+                "mean_ms": total / len(values) * 1000,
+                "p50_ms": _percentile(values, 50) * 1000,
+                "p95_ms": _percentile(values, 95) * 1000,
+                "max_ms": values[-1] * 1000,
+                "per_second": len(values) / total if total else 0.0,
+            }
+        return {
+            "commands": self.commands,
+            "total_ms": self.elapsed * 1000,
+            "per_second": self.commands / self.elapsed if self.elapsed else 0.0,
+            "intents": intents,
+            "stages": self.assistant.metrics.snapshot()["stages"],
+        }
+
+    def print_report(self):
+        rep = self.report()
+        print(f"📊 {rep['commands']} komut, {rep['total_ms']:.1f} ms, {rep['per_second']:.0f} komut/sn")
+        print(f"  {'intent':<20} {'adet':>6} {'ort ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'komut/sn':>10}")
+        for name, st in rep["intents"].items():
+            print(f"  {name:<20} {st['count']:>6} {st['mean_ms']:>9.3f} {st['p50_ms']:>9.3f} "
+                  f"{st['p95_ms']:>9.3f} {st['max_ms']:>9.3f} {st['per_second']:>10.0f}")
+
+
+def benchmark_router(n_intents: int = 300, n_commands: int = 5000, seed: int = 42):
+    """Eski doğrusal re.search taraması ile IntentRouter'ı sentetik komutlarla karşılaştır"""
+    import random
+
+    rng = random.Random(seed)
+    syllables = ["ka", "le", "mi", "ro", "su", "ta", "ne", "bu", "za", "de",
+                 "po", "gi", "ya", "şe", "çu", "lo", "fi", "ha", "vo", "kü"]
+
+    def word(used: set) -> str:
+        while True:
+            w = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            if w not in used:
+                used.add(w)
+                return w
+
+    used = set()
+    patterns = []
+    keys = []
+    for _ in range(n_intents):
+        w1, w2, w3 = word(used), word(used), word(used)
+        patterns.append(rf"{w1}\s*{w2}\s*(.*)|{w3}.*yap")
+        keys.append((f"{w1} {w2}", f"{w3} bunu yap"))
+
+    commands = []
+    for i in range(n_commands):
+        if i % 10 == 0:
+            commands.append(" ".join(word(set()) for _ in range(4)))  # Eşleşmeyen gürültü
+        else:
+            first, second = rng.choice(keys)
+            commands.append(f"{first} parametre {i}" if i % 2 else second)
+
+    router = IntentRouter()
+    for idx, pattern in enumerate(patterns):
+        router.register(pattern, lambda param="": None, name=f"intent_{idx}")
+
+    def linear(cmd: str) -> Optional[int]:
+        for idx, pattern in enumerate(patterns):
+            if re.search(pattern, cmd):
+                return idx
+        return None
+
+    def routed(cmd: str) -> Optional[int]:
+        found = router.match(cmd)
+        return found[0].order if found else None
+
+    mismatches = sum(1 for cmd in commands if linear(cmd) != routed(cmd))
+
+    results = {}
+    for label, func in (("doğrusal re.search", linear), ("IntentRouter", routed)):
+        start = time.perf_counter()
+        for cmd in commands:
+            func(cmd)
+        results[label] = time.perf_counter() - start
+
+    print(f"📊 {n_intents} komut deseni, {n_commands} sentetik cümle")
+    for label, elapsed in results.items():
+        print(f"  {label:<20} {elapsed * 1000:9.1f} ms  ({elapsed / n_commands * 1e6:8.1f} µs/cümle)")
+    print(f"  Hızlanma: x{results['doğrusal re.search'] / results['IntentRouter']:.1f}")
+    print(f"  Farklı sonuç: {mismatches}")
+
+
+def benchmark_fuzzy(sizes: Tuple[int, ...] = (100, 1000, 5000, 10000), n_queries: int = 2000,
+                    linear_limit: int = 1000, seed: int = 42):
+    """Yaklaşık eşleşme gecikmesini örnek cümle sayısı büyüdükçe ölç
+
+    Sorgular, kayıtlı bir cümleye tek harf hatası ya da araya boşluk eklenerek
+    ve sonuna parametre konarak üretilir. Küçük boyutlarda tüm cümlelerle
+    düzenleme uzaklığı hesaplayan doğrusal tarama da karşılaştırılır.
+    """
+    import random
+
+    rng = random.Random(seed)
+    syllables = ["ka", "le", "mi", "ro", "su", "ta", "ne", "bu", "za", "de",
+                 "po", "gi", "ya", "şe", "çu", "lo", "fi", "ha", "vo", "kü"]
+    letters = "abcçdefgğhıijklmnoöprsştuüvyz"
+
+    def word() -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+    def corrupt(phrase: str) -> str:
+        i = rng.randrange(1, len(phrase))
+        kind = rng.randrange(4)
+        if kind == 0:
+            return phrase[:i] + rng.choice(letters) + phrase[i + 1:]
+        if kind == 1:
+            return phrase[:i] + phrase[i + 1:]
+        if kind == 2:
+            return phrase[:i] + " " + phrase[i:]
+        return FuzzyIntentIndex.fold(phrase)
+
+    print(f"📊 Yaklaşık eşleşme, {n_queries} bozuk sorgu")
+    print(f"  {'cümle':>7} {'indeks µs':>10} {'p95 µs':>8} {'doğru':>7} {'doğrusal µs':>12}")
+    for size in sizes:
+        phrases = []
+        seen = set()
+        while len(phrases) < size:
+            phrase = f"{word()} {word()}"
+            if phrase not in seen:
+                seen.add(phrase)
+                phrases.append(phrase)
+        index = FuzzyIntentIndex()
+        for order, phrase in enumerate(phrases):
+            index.add(phrase, order)
+
+        queries = []
+        for _ in range(n_queries):
+            order = rng.randrange(size)
+            queries.append((order, f"{corrupt(phrases[order])} {word()}"))
+
+        timings = []
+        correct = 0
+        for order, query in queries:
+            start = time.perf_counter()
+            found = index.match(query)
+            timings.append(time.perf_counter() - start)
+            correct += bool(found and found[0] == order)
+        timings.sort()
+        mean_us = sum(timings) / len(timings) * 1e6
+
+        linear = "-"
+        if size <= linear_limit:
+            # Karşılaştırma: her sorguda tüm cümlelerle hizalama
+            sample = queries[:max(1, n_queries // 10)]
+            start = time.perf_counter()
+            for _, query in sample:
+                key = "".join(c for c in FuzzyIntentIndex.fold(query) if c.isalnum())
+                for phrase, _ in index.phrases:
+                    FuzzyIntentIndex._align(phrase, key, {0})
+            linear = f"{(time.perf_counter() - start) / len(sample) * 1e6:.0f}"
+        print(f"  {size:>7} {mean_us:>10.1f} {_percentile(timings, 95) * 1e6:>8.1f} "
+              f"{correct / n_queries:>7.1%} {linear:>12}")
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Kelime hata oranı (Levenshtein, kelime düzeyinde)"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def benchmark_recognizer(wav_dir: str, backend_names: List[str], config: Dict[str, Dict[str, Any]]):
+    """Kayıtlı WAV dosyalarıyla tanıma motorlarını mikrofon olmadan ölç
+
+    Her 'ornek.wav' için varsa 'ornek.txt' beklenen metin olarak kullanılır.
+    """
+    files = sorted(f for f in os.listdir(wav_dir) if f.lower().endswith(".wav"))
+    if not files:
+        print(f"❌ {wav_dir} içinde WAV dosyası yok")
+        return
+
+    recognizer = sr.Recognizer()
+    clips = []
+    for name in files:
+        with sr.AudioFile(os.path.join(wav_dir, name)) as source:
+            audio = recognizer.record(source)
+        ref_path = os.path.join(wav_dir, os.path.splitext(name)[0] + ".txt")
+        reference = None
+        if os.path.exists(ref_path):
+            with open(ref_path, 'r', encoding='utf-8') as f:
+                reference = f.read().strip()
+        duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+        clips.append((name, audio, reference, duration))
+
+    audio_seconds = sum(c[3] for c in clips)
+    print(f"📊 {len(clips)} kayıt, toplam {audio_seconds:.1f} sn ses")
+    for name in backend_names:
+        backend = create_backend(name, config["recognizer"], recognizer)
+        start = time.perf_counter()
+        try:
+            backend.load()
+        except BackendUnavailable as e:
+            print(f"  {name:<8} atlandı: {e}")
+            continue
+        load_time = time.perf_counter() - start
+
+        latencies = []
+        errors = []
+        for clip_name, audio, reference, _ in clips:
+            start = time.perf_counter()
+            try:
+                text = backend.transcribe(audio) or ""
+            except BackendUnavailable as e:
+                print(f"  {name:<8} {clip_name}: {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+            if reference is not None:
+                errors.append(word_error_rate(reference, text))
+
+        if not latencies:
+            continue
+        latencies.sort()
+        total = sum(latencies)
+        wer = f"{sum(errors) / len(errors) * 100:5.1f}%" if errors else "   - "
+        print(f"  {name:<8} yükleme {load_time * 1000:7.0f} ms | "
+              f"ort {total / len(latencies) * 1000:7.1f} ms | "
+              f"en kötü {latencies[-1] * 1000:7.1f} ms | "
+              f"RTF {total / audio_seconds:5.2f} | WER {wer}")
+
+
+def benchmark_calculator(iterations: int = 20000):
+    """Eski eval yolu ile ArithmeticEngine'i karşılaştıran mikro benchmark"""
+    def legacy(expression: str):
+        allowed_chars = "0123456789+-*/()., "
+        if not all(c in allowed_chars for c in expression):
+            return None
+        return eval(expression)
+
+    symbolic = ["5*3", "12+7*2", "(2+3)*4", "100/7", "1984-1923", "2*3*4*5"]
+    spoken = ["beş çarpı üç", "on iki artı yedi kere iki", "bin dokuz yüz seksen dört eksi 1923",
+              "iki üssü on", "yüz bölü yedi", "üç virgül beş çarpı iki"]
+    engine = ArithmeticEngine()
+
+    def run(func, exprs) -> float:
+        start = time.perf_counter()
+        for i in range(iterations):
+            func(exprs[i % len(exprs)])
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    rows = [("eski eval (rakam)", run(legacy, symbolic))]
+    engine.compile.cache_clear()
+    rows.append(("motor soğuk (rakam)", run(lambda e: (engine.compile.cache_clear(), engine.evaluate(e)), symbolic)))
+    rows.append(("motor önbellekli (rakam)", run(engine.evaluate, symbolic)))
+    rows.append(("motor önbellekli (sözlü)", run(engine.evaluate, spoken)))
+    legacy_spoken = sum(1 for e in spoken if legacy(e) is not None)
+
+    print(f"📊 {iterations} değerlendirme")
+    for label, micros in rows:
+        print(f"  {label:<26} {micros:8.2f} µs/ifade")
+    print(f"  Eski yolun kabul ettiği sözlü ifade: {legacy_spoken}/{len(spoken)}")
+
+    start = time.perf_counter()
+    try:
+        engine.evaluate("9 üssü 9 üssü 9")
+    except CalculationError as e:
+        print(f"  '9 üssü 9 üssü 9' reddedildi ({(time.perf_counter() - start) * 1e6:.0f} µs): {e}")
+
+
 def main():
     """Ana fonksiyon"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gelişmiş Sesli Asistan")
+    parser.add_argument("--config", default=CONFIG_FILE, help="Ayar dosyası (JSON)")
+    parser.add_argument("--bench", choices=["router", "recognizer", "calc", "fuzzy"],
+                        help="Mikrofon açmadan performans ölçümü çalıştır")
+    parser.add_argument("--intents", type=int, default=300, help="Benchmark desen sayısı")
+    parser.add_argument("--commands", type=int, default=5000, help="Benchmark cümle sayısı")
+    parser.add_argument("--wav-dir", default="fixtures", help="Tanıma benchmark'ı için WAV klasörü")
+    parser.add_argument("--backends", help="Virgülle ayrılmış motorlar (ör. vosk,google)")
+    parser.add_argument("--replay", metavar="DOSYA",
+                        help="Mikrofonsuz (headless) çalış; transkriptleri dosyadan ya da '-' ile stdin'den oynat")
+    parser.add_argument("--data-dir", help="Headless modda notlar/hatırlatıcılar klasörü (varsayılan: geçici)")
+    parser.add_argument("--report-json", help="Yeniden oynatma raporunu JSON olarak yaz")
+    parser.add_argument("--echo", action="store_true", help="Yeniden oynatırken yanıtları yazdır")
+    args = parser.parse_args()
+    config = load_config(args.config)
+
+    if args.replay:
+        import tempfile
+
+        data_dir = args.data_dir or tempfile.mkdtemp(prefix="asistan_replay_")
+        assistant = VoiceAssistant(config, headless=True, data_dir=data_dir)
+        replay = TranscriptReplay(assistant)
+        if args.replay == "-":
+            replay.run(sys.stdin, echo=args.echo)
+        else:
+            with open(args.replay, 'r', encoding='utf-8') as f:
+                replay.run(f, echo=args.echo)
+        assistant.reminders.stop()
+        replay.print_report()
+        if args.report_json:
+            with open(args.report_json, 'w', encoding='utf-8') as f:
+                json.dump(replay.report(), f, ensure_ascii=False, indent=2)
+        return
+
+    if args.bench == "router":
+        benchmark_router(args.intents, args.commands)
+        return
+    if args.bench == "recognizer":
+        names = args.backends.split(",") if args.backends else config["recognizer"]["backends"]
+        benchmark_recognizer(args.wav_dir, names, config)
+        return
+    if args.bench == "calc":
+        benchmark_calculator()
+        return
+    if args.bench == "fuzzy":
+        benchmark_fuzzy()
+        return
+
     print("🎙️ Gelişmiş Sesli Asistan")
     print("=" * 50)
 
     try:
-        assistant = VoiceAssistant()
+        assistant = VoiceAssistant(config)
         assistant.start_listening()
     except KeyboardInterrupt:
         print("\n👋 Görüşürüz!")
@@ -1,18 +1,104 @@
 from __future__ import annotations
-import json, os, sys, re
+import json, os, sys, re, time, math, queue, sqlite3, threading, heapq, hashlib, pickle, glob, gc
+from bisect import bisect_left, insort
 from pathlib import Path
-from typing import Optional
-from PySide6.QtCore import Qt, QUrl, QSize
+from typing import Optional, Dict, List, Any, Tuple
+from PySide6.QtCore import Qt, QUrl, QSize, QTimer, Signal, QStringListModel, QEventLoop, QObject, QEvent
 from PySide6.QtGui import QAction, QIcon, QKeySequence, QPalette, QColor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QToolBar, QLineEdit,
-    QTabWidget, QFileDialog, QMessageBox, QStatusBar, QLabel
+    QTabWidget, QFileDialog, QMessageBox, QStatusBar, QLabel, QCompleter, QMenu, QToolButton,
+    QDockWidget, QListWidget, QListWidgetItem, QProgressBar, QPushButton, QHBoxLayout,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import (
-    QWebEngineProfile, QWebEngineDownloadRequest, QWebEnginePage
+    QWebEngineProfile, QWebEngineDownloadRequest, QWebEnginePage,
+    QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo, QWebEngineScript
 )
 
+try:
+    import psutil  # İsteğe bağlı: sekme bellek ölçümü için
+except ImportError:
+    psutil = None
+
+DATA_DIR = Path.home() / ".pybrowser"
+SETTINGS_FILE = DATA_DIR / "settings.json"
+DEFAULT_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "tabs": {
+        "lazy": True,                 # Arka plan sekmeleri ilk açılışa kadar sayfa oluşturmaz
+        "freeze_after_s": 300,        # Bu kadar süre görünmeyen sekme dondurulur
+        "discard_after_s": 1800,      # Bu kadar süre görünmeyen sekme bellekten atılır
+        "memory_budget_mb": 2048,     # Aşılırsa en uzun süredir kullanılmayan sekmeler atılır
+        "tab_estimate_mb": 120,       # psutil yoksa canlı sekme başına tahmini bellek
+        "lifecycle_check_s": 15,
+    },
+    "session": {
+        "restore": True,
+        "save_delay_ms": 1000,        # Art arda değişiklikler tek yazmada birleştirilir
+        "hydrate_interval_ms": 2000,  # Arka plan sekmelerini bu aralıkla birer birer yükle
+        "hydrate_limit": 8,           # Etkin sekmeye en yakın bu kadar sekme önceden yüklenir
+        "max_concurrent_loads": 2,    # Bu kadar sekme yüklenirken arka plan yüklemesi bekler
+    },
+    "history": {
+        "half_life_days": 30,         # Ziyaretin frecency katkısı bu sürede yarıya iner
+        "suggestions": 8,
+        "batch_ms": 1000,             # Yazıcı iş parçacığı ziyaretleri bu aralıkla toplu yazar
+    },
+    "adblock": {
+        "enabled": True,
+        # EasyList biçimli ya da hosts dosyası listeleri (glob desteklenir)
+        "lists": ["~/.pybrowser/filters/*.txt"],
+        "cache_file": "~/.pybrowser/adblock.cache",
+        "record_requests": "",        # Doluysa her istek "url<TAB>sayfa" olarak bu dosyaya eklenir (benchmark için)
+    },
+    "downloads": {
+        "directory": "~/Downloads",
+        "auto_save": False,           # Açıksa kaydetme penceresi sorulmadan doğrudan klasöre kaydedilir
+        "max_concurrent": 3,          # Fazlası kuyrukta bekler
+        "max_rate_kbps": 0,           # Tüm indirmeler için toplam hız sınırı (0 = sınırsız)
+        "tick_ms": 250,               # İlerleme/hız güncelleme ve kısma aralığı
+    },
+    "profile": {
+        "name": "pybrowser",          # Kalıcı profil; varsayılan profil gizli modda çalışır ve hiçbir şey saklamaz
+        "storage_dir": "~/.pybrowser/profile",
+        "cache_dir": "~/.pybrowser/cache",
+        "cache_type": "disk",         # disk | memory | none
+        "cache_size_mb": 256,         # 0 = Chromium'un kendi sınırı
+        "cookies": "persistent",      # persistent | force (oturum çerezleri de saklanır) | none
+    },
+    "pageloads": {
+        "log_file": "~/.pybrowser/pageloads.jsonl",  # Her gezinme için bir JSON satırı ("" = kapalı)
+    },
+    "renderer": {
+        # Başlangıçta QTWEBENGINE_CHROMIUM_FLAGS'e eklenir (değişiklik yeniden başlatınca geçerli olur)
+        "process_model": "",          # "" (varsayılan: site yalıtımı) | process-per-site | process-per-tab | single-process
+        "process_limit": 0,           # Renderer süreç sayısı üst sınırı (0 = Chromium karar verir)
+        "flags": [],                  # Ek Chromium bayrakları, ör. ["--js-flags=--max-old-space-size=512"]
+    },
+    "task_manager": {
+        "interval_s": 2,              # Süreç örnekleme aralığı (arka plan iş parçacığı)
+        "highlight": 3,               # En çok bellek kullanan bu kadar sekme vurgulanır
+    },
+    "bookmarks": {
+        "bar_limit": 25,              # Çubukta gösterilen kök öğe sayısı; kalanlar "»" menüsünde
+        "compact_after": 200,         # Günlükte bu kadar işlem birikince anlık görüntü yeniden yazılır
+    },
+}
+
+
+def load_settings(path: Path = SETTINGS_FILE) -> Dict[str, Dict[str, Any]]:
+    # Varsayılanların üzerine ~/.pybrowser/settings.json değerlerini yaz
+    settings = {section: dict(values) for section, values in DEFAULT_SETTINGS.items()}
+    if path.exists():
+        try:
+            for section, values in json.loads(path.read_text(encoding="utf-8")).items():
+                if isinstance(values, dict):
+                    settings.setdefault(section, {}).update(values)
+        except Exception:
+            pass
+    return settings
+
 
 def normalize_url(text: str) -> QUrl:
     t = text.strip()
@@ -25,86 +111,1280 @@ def normalize_url(text: str) -> QUrl:
     return QUrl(f"https://duckduckgo.com/?q={QUrl.toPercentEncoding(t).data().decode('utf-8')}")
 
 
+class SessionStore:
+    # Açık sekmeler: ~/.pybrowser/session.json (önce geçici dosyaya, sonra atomik taşı)
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        return data if isinstance(data, dict) and data.get("tabs") else None
+
+    def save(self, data: Dict[str, Any]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def history_key(url: str) -> str:
+    # Önek araması için şema ve "www." atılır: "https://www.github.com/x" → "github.com/x"
+    key = re.sub(r"^[a-zA-Z][\w+.-]*://", "", url.strip()).lower()
+    return key[4:] if key.startswith("www.") else key
+
+
+def _logaddexp(a: float, b: float) -> float:
+    if a == -math.inf:
+        return b
+    hi, lo = (a, b) if a > b else (b, a)
+    return hi + math.log1p(math.exp(lo - hi))
+
+
+class FrecencyTrie:
+    """Geçmiş adresleri için önek trie'si; her düğüm en yüksek puanlı top_k kaydı tutar
+
+    Puan log alanında birikir: her ziyaret ln(Σ e^(λ·t)) değerine eklenir.
+    Sıralama zamandan bağımsız olduğu için eski kayıtların puanını
+    güncellemek gerekmez. Puanlar yalnızca arttığından düğüm listeleri
+    ekleme sırasında güncel tutulabilir; listeden düşen kaydın yerine
+    başkasını aramak gerekmez. max_depth'ten uzun önekler sıralı anahtar
+    listesinde ikili aramayla tamamlanır.
+    """
+
+    def __init__(self, top_k: int = 8, max_depth: int = 12):
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self.urls: List[str] = []
+        self.titles: List[str] = []
+        self.scores: List[float] = []
+        self._ids: Dict[str, int] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._root: list = [{}, []]  # [çocuklar, top_k kimlikleri]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __contains__(self, url: str) -> bool:
+        return history_key(url) in self._ids
+
+    def score(self, url: str) -> float:
+        idx = self._ids.get(history_key(url))
+        return self.scores[idx] if idx is not None else -math.inf
+
+    def update(self, url: str, title: str, score: float):
+        key = history_key(url)
+        if not key:
+            return
+        with self._lock:
+            idx = self._ids.get(key)
+            if idx is None:
+                idx = self._ids[key] = len(self.urls)
+                self.urls.append(url)
+                self.titles.append(title)
+                self.scores.append(score)
+                insort(self._sorted, (key, idx))
+            else:
+                self.urls[idx] = url
+                if title:
+                    self.titles[idx] = title
+                self.scores[idx] = max(self.scores[idx], score)
+            scores = self.scores
+            node = self._root
+            for ch in key[:self.max_depth]:
+                child = node[0].get(ch)
+                if child is None:
+                    child = node[0][ch] = [{}, []]
+                node = child
+                top = node[1]
+                if idx in top:
+                    top.sort(key=scores.__getitem__, reverse=True)
+                elif len(top) < self.top_k:
+                    top.append(idx)
+                    top.sort(key=scores.__getitem__, reverse=True)
+                elif scores[idx] > scores[top[-1]]:
+                    top[-1] = idx
+                    top.sort(key=scores.__getitem__, reverse=True)
+
+    def complete(self, prefix: str, limit: int = 8) -> List[int]:
+        key = history_key(prefix)
+        if not key:
+            return []
+        with self._lock:
+            if len(key) <= self.max_depth:
+                node = self._root
+                for ch in key:
+                    node = node[0].get(ch)
+                    if node is None:
+                        return []
+                return node[1][:limit]
+            # Derin önek: sıralı anahtarlarda aralığı bul, en iyi 'limit' kaydı seç
+            lo = bisect_left(self._sorted, (key,))
+            hi = bisect_left(self._sorted, (key + "\uffff",))
+            if hi - lo > 5000:
+                hi = lo + 5000
+            return heapq.nlargest(limit, (idx for _, idx in self._sorted[lo:hi]), key=self.scores.__getitem__)
+
+
+class HistoryStore:
+    """SQLite geçmişi (FTS5 tam metin indeksiyle) ve bellek içi frecency trie'si
+
+    Ziyaretler trie'ye hemen işlenir; veritabanına ise ayrı bir yazıcı iş
+    parçacığı tarafından toplu işlemlerle yazılır, GUI iş parçacığı diske
+    beklemez. Açılışta trie arka planda doldurulur.
+    """
+
+    def __init__(self, path: Path, half_life_days: float = 30, batch_ms: int = 1000):
+        self.path = path
+        self.decay = math.log(2) / (half_life_days * 86400)
+        self.batch_s = batch_ms / 1000.0
+        self.trie = FrecencyTrie()
+        self.fts = True
+        self.candidates = 300
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._read = self._connect()
+        self._create_schema(self._read)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        threading.Thread(target=self._load, name="history-load", daemon=True).start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute("""CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, title TEXT NOT NULL DEFAULT '',
+            visit_count INTEGER NOT NULL DEFAULT 0, last_visit REAL NOT NULL, frecency REAL NOT NULL)""")
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+                    url, title, content='history', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+                    INSERT INTO history_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+                END;
+                CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+                    INSERT INTO history_fts(history_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+                END;
+                CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE OF url, title ON history BEGIN
+                    INSERT INTO history_fts(history_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+                    INSERT INTO history_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+                END;""")
+        except sqlite3.OperationalError:
+            # FTS5 olmadan derlenmiş SQLite: LIKE aramasına düş
+            self.fts = False
+        conn.commit()
+
+    def _load(self):
+        try:
+            conn = self._connect()
+            rows = conn.execute("SELECT url, title, frecency FROM history ORDER BY frecency DESC")
+            for url, title, frecency in rows:
+                self.trie.update(url, title, frecency)
+            conn.close()
+        except Exception:
+            pass
+
+    def record_visit(self, url: str, title: str = "", weight: float = 1.0):
+        if not url or not re.match(r"^(https?|file|ftp)://", url):
+            return
+        now = time.time()
+        score = _logaddexp(self.trie.score(url), math.log(weight) + self.decay * now)
+        self.trie.update(url, title, score)
+        self._queue.put(("visit", url, title, now, score))
+
+    def set_title(self, url: str, title: str):
+        if url and title and url in self.trie:
+            self.trie.update(url, title, -math.inf)
+            self._queue.put(("title", url, title))
+
+    def suggest(self, text: str, limit: int = 8) -> List[Tuple[str, str]]:
+        # Önce adres öneki (trie), yetmezse başlık/adres kelimelerinde tam metin araması
+        trie = self.trie
+        found = [(trie.urls[i], trie.titles[i]) for i in trie.complete(text, limit)]
+        if len(found) < limit and len(text.strip()) >= 3:
+            seen = {url for url, _ in found}
+            for url, title in self.search(text, limit):
+                if url not in seen:
+                    found.append((url, title))
+                    seen.add(url)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def search(self, text: str, limit: int = 8) -> List[Tuple[str, str]]:
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return []
+        try:
+            if self.fts:
+                match = " ".join(f'"{w}"*' for w in words)
+                # Sık kelimelerde binlerce eşleşmeyi sıralamamak için en yeni 'candidates' kayıt içinden seç
+                return self._read.execute(
+                    "SELECT h.url, h.title FROM history h WHERE h.id IN ("
+                    "SELECT rowid FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?) "
+                    "ORDER BY h.frecency DESC LIMIT ?", (match, self.candidates, limit)).fetchall()
+            like = f"%{words[0]}%"
+            return self._read.execute(
+                "SELECT url, title FROM history WHERE url LIKE ? OR title LIKE ? ORDER BY frecency DESC LIMIT ?",
+                (like, like, limit)).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_s
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                with conn:
+                    for op in batch:
+                        if op[0] == "visit":
+                            _, url, title, ts, score = op
+                            conn.execute(
+                                "INSERT INTO history(url, title, visit_count, last_visit, frecency) "
+                                "VALUES (?, ?, 1, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                                "visit_count = visit_count + 1, last_visit = excluded.last_visit, "
+                                "frecency = excluded.frecency, "
+                                "title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END",
+                                (url, title, ts, score))
+                        else:
+                            conn.execute("UPDATE history SET title = ? WHERE url = ? AND title != ?",
+                                         (op[2], op[1], op[2]))
+            except sqlite3.Error:
+                pass
+            if stop:
+                break
+        conn.close()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+
+
+# Reklam/izleyici engelleyici ------------------------------------------------
+
+_ADBLOCK_FORMAT = 3
+# Desteklenen kural seçenekleri; diğerlerini (domain=, popup, csp...) içeren kurallar atlanır
+_ADBLOCK_TYPES = {"script", "image", "stylesheet", "xmlhttprequest", "subdocument", "object",
+                  "media", "font", "ping", "websocket", "other"}
+_SECOND_LEVEL = {"co", "com", "org", "net", "gov", "edu", "ac", "gen", "web", "bel", "k12"}
+_HOSTS_LINE = re.compile(r"^(?:0\.0\.0\.0|127\.0\.0\.1|::1?)\s+([\w.-]+)")
+# hosts dosyalarının başındaki yerel girdiler; engellenirse yerel geliştirme sunucuları çalışmaz
+_HOSTS_LOCAL = {"localhost", "localhost.localdomain", "local", "broadcasthost"}
+# Düz alan adı satırı: harf/rakamla başlayıp biter, boş etiket yok ("-ad-banner.", ".adriver." alt dizgi kuralıdır)
+_BARE_DOMAIN = re.compile(r"^[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)+$")
+_IP_LITERAL = re.compile(r"^[\d.]+$|:")
+
+
+def site_of(host: str) -> str:
+    # Kayıtlı alan adının kabaca tahmini: "a.b.example.com.tr" → "example.com.tr"
+    labels = host.lower().rstrip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class AhoCorasick:
+    """Çok desenli alt dizgi otomatı: URL'i bir kez tarayıp geçen tüm anahtarları bulur"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+
+    def add(self, keyword: str, value: int):
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(value)
+
+    def build(self):
+        # Genişlik öncelikli: hata bağlantıları ve çıktıların birleştirilmesi
+        pending = list(self.goto[0].values())
+        while pending:
+            nxt_level = []
+            for state in pending:
+                for ch, child in self.goto[state].items():
+                    f = self.fail[state]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    target = self.goto[f].get(ch, 0)
+                    self.fail[child] = target if target != child else 0
+                    self.out[child] = self.out[child] + self.out[self.fail[child]]
+                    nxt_level.append(child)
+            pending = nxt_level
+
+    def search(self, text: str):
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield from out[state]
+
+
+class ContentBlocker:
+    """EasyList/hosts kurallarından derlenmiş istek filtresi
+
+    Alan adı kuralları ("||example.com^", hosts satırları) ters çevrilmiş
+    etiketlerden oluşan bir trie'ye ("com" → "example") girer; istek başına
+    yalnızca ana makinenin etiket sayısı kadar adım atılır. Diğer kurallar
+    en uzun sabit parçalarıyla tek bir Aho-Corasick otomatına eklenir,
+    joker/çapa içerenler eşleşme sonrası düzenli ifadeyle doğrulanır.
+    "@@" istisnaları aynı yapıların ikinci bir kopyasında tutulur.
+    """
+
+    def __init__(self):
+        self.block_domains: Dict[str, Any] = {}
+        self.allow_domains: Dict[str, Any] = {}
+        self.block_patterns = AhoCorasick()
+        self.allow_patterns = AhoCorasick()
+        self.rules: List[Tuple[Optional[str], Optional[int], Optional[frozenset]]] = []
+        self._regex_cache: Dict[int, Any] = {}
+        self.rule_count = 0
+
+    # --- Derleme ---
+    @staticmethod
+    def _parse_options(text: str) -> Optional[Tuple[Optional[int], Optional[frozenset]]]:
+        party, types, excluded = None, set(), set()
+        for opt in text.split(","):
+            opt = opt.strip().lower()
+            if opt == "third-party":
+                party = 1
+            elif opt in ("~third-party", "first-party"):
+                party = 0
+            elif opt in _ADBLOCK_TYPES:
+                types.add(opt)
+            elif opt.startswith("~") and opt[1:] in _ADBLOCK_TYPES:
+                excluded.add(opt[1:])
+            else:
+                return None
+        # "$~script" = script dışındaki tüm türler
+        if excluded:
+            types = (types or set(_ADBLOCK_TYPES)) - excluded
+            if not types:
+                return None
+        return party, (frozenset(types) if types else None)
+
+    def add_rule(self, line: str):
+        line = line.strip()
+        if not line or line[0] in "![" or "##" in line or "#@#" in line or "#?#" in line:
+            return
+        m = _HOSTS_LINE.match(line)
+        if m:
+            host = m.group(1).lower()
+            if host not in _HOSTS_LOCAL and not host.startswith("ip6-") and not _IP_LITERAL.search(host):
+                self._add_domain(self.block_domains, host, (None, None))
+            return
+        allow = line.startswith("@@")
+        if allow:
+            line = line[2:]
+        opts: Tuple[Optional[int], Optional[frozenset]] = (None, None)
+        if "$" in line:
+            line, _, opt_text = line.rpartition("$")
+            parsed = self._parse_options(opt_text)
+            if parsed is None:
+                return
+            opts = parsed
+        if not line or (line.startswith("/") and line.endswith("/") and len(line) > 1):
+            return  # Düzenli ifade kuralları desteklenmiyor
+        line = line.lower()
+        m = re.match(r"^\|\|([a-z0-9.-]+)\^?\|?$", line)
+        if m:
+            self._add_domain(self.allow_domains if allow else self.block_domains, m.group(1), opts)
+            return
+        if _BARE_DOMAIN.match(line) and not allow and opts == (None, None):
+            # Düz alan adı listesi satırı
+            self._add_domain(self.block_domains, line, opts)
+            return
+        self._add_pattern(line, opts, allow)
+
+    def _add_domain(self, trie: Dict[str, Any], domain: str, opts):
+        node = trie
+        for label in reversed(domain.strip(".").split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault("", []).append(opts)
+        self.rule_count += 1
+
+    def _add_pattern(self, pattern: str, opts, allow: bool):
+        pieces = [p for p in re.split(r"[*^|]", pattern) if p]
+        if not pieces:
+            return
+        keyword = max(pieces, key=len)
+        if len(keyword) < 3:
+            return  # Çok kısa anahtar her URL'de geçer
+        regex = None
+        if pattern != keyword:
+            regex = self._pattern_to_regex(pattern)
+        rule_id = len(self.rules)
+        self.rules.append((regex, opts[0], opts[1]))
+        (self.allow_patterns if allow else self.block_patterns).add(keyword, rule_id)
+        self.rule_count += 1
+
+    @staticmethod
+    def _pattern_to_regex(pattern: str) -> str:
+        out = []
+        if pattern.startswith("||"):
+            out.append(r"^[a-z][a-z0-9+.-]*://([^/]*\.)?")
+            pattern = pattern[2:]
+        elif pattern.startswith("|"):
+            out.append("^")
+            pattern = pattern[1:]
+        end = pattern.endswith("|")
+        if end:
+            pattern = pattern[:-1]
+        for ch in pattern:
+            if ch == "*":
+                out.append(".*")
+            elif ch == "^":
+                out.append(r"(?:[^\w.%-]|$)")
+            else:
+                out.append(re.escape(ch))
+        if end:
+            out.append("$")
+        return "".join(out)
+
+    def finish(self):
+        self.block_patterns.build()
+        self.allow_patterns.build()
+
+    @classmethod
+    def from_files(cls, paths: List[str]) -> "ContentBlocker":
+        blocker = cls()
+        for path in paths:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    blocker.add_rule(line)
+        blocker.finish()
+        return blocker
+
+    @classmethod
+    def load(cls, paths: List[str], cache_file: Optional[str] = None) -> "ContentBlocker":
+        # Liste dosyaları (yol, boyut, değişiklik zamanı) değişmediyse derlenmiş önbelleği kullan
+        key = hashlib.sha1(json.dumps(
+            [_ADBLOCK_FORMAT] + [[p, os.path.getsize(p), os.path.getmtime(p)] for p in paths]
+        ).encode("utf-8")).hexdigest()
+        # Yüz binlerce küçük dict/list oluşturulurken çöp toplayıcı süreyi katlıyor
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if cache_file and os.path.exists(cache_file):
+                try:
+                    with open(cache_file, "rb") as f:
+                        cached_key, state = pickle.load(f)
+                    if cached_key == key:
+                        return cls.from_state(state)
+                except Exception:
+                    pass
+            blocker = cls.from_files(paths)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if cache_file:
+            try:
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                with open(cache_file + ".tmp", "wb") as f:
+                    pickle.dump((key, blocker.to_state()), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(cache_file + ".tmp", cache_file)
+            except Exception:
+                pass
+        return blocker
+
+    # Önbellek yalnızca yerleşik türleri içerir; modülün hangi adla yüklendiğinden bağımsızdır
+    def to_state(self) -> tuple:
+        return (self.block_domains, self.allow_domains, self.rules, self.rule_count,
+                (self.block_patterns.goto, self.block_patterns.fail, self.block_patterns.out),
+                (self.allow_patterns.goto, self.allow_patterns.fail, self.allow_patterns.out))
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "ContentBlocker":
+        blocker = cls()
+        blocker.block_domains, blocker.allow_domains, blocker.rules, blocker.rule_count, block, allow = state
+        blocker.block_patterns.goto, blocker.block_patterns.fail, blocker.block_patterns.out = block
+        blocker.allow_patterns.goto, blocker.allow_patterns.fail, blocker.allow_patterns.out = allow
+        return blocker
+
+    # --- Karar ---
+    @staticmethod
+    def _opts_match(opts, third_party: bool, rtype: str) -> bool:
+        party, types = opts
+        if party is not None and bool(party) != third_party:
+            return False
+        return types is None or rtype in types
+
+    def _domain_hit(self, trie: Dict[str, Any], host: str, third_party: bool, rtype: str) -> bool:
+        node = trie
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            rules = node.get("")
+            if rules and any(self._opts_match(o, third_party, rtype) for o in rules):
+                return True
+        return False
+
+    def _pattern_hit(self, automaton: AhoCorasick, url: str, third_party: bool, rtype: str) -> bool:
+        for rule_id in automaton.search(url):
+            regex, party, types = self.rules[rule_id]
+            if not self._opts_match((party, types), third_party, rtype):
+                continue
+            if regex is None:
+                return True
+            compiled = self._regex_cache.get(rule_id)
+            if compiled is None:
+                compiled = self._regex_cache[rule_id] = re.compile(regex)
+            if compiled.search(url):
+                return True
+        return False
+
+    def should_block(self, url: str, host: str, first_party_host: str = "", rtype: str = "other") -> bool:
+        url = url.lower()
+        host = host.lower()
+        third_party = bool(first_party_host) and site_of(host) != site_of(first_party_host)
+        if not (self._domain_hit(self.block_domains, host, third_party, rtype)
+                or self._pattern_hit(self.block_patterns, url, third_party, rtype)):
+            return False
+        return not (self._domain_hit(self.allow_domains, host, third_party, rtype)
+                    or self._pattern_hit(self.allow_patterns, url, third_party, rtype))
+
+
+class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
+    # Qt'nin G/Ç iş parçacığında çağrılır; engelleyici yalnızca okunur
+    _TYPES = {
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeScript: "script",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeImage: "image",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeStylesheet: "stylesheet",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeXhr: "xmlhttprequest",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeSubFrame: "subdocument",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeObject: "object",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMedia: "media",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypeFontResource: "font",
+        QWebEngineUrlRequestInfo.ResourceType.ResourceTypePing: "ping",
+    }
+
+    def __init__(self, blocker: ContentBlocker, record_file: str = "", parent=None):
+        super().__init__(parent)
+        self.blocker = blocker
+        self.blocked = 0
+        self.checked = 0
+        self._record = open(os.path.expanduser(record_file), "a", encoding="utf-8") if record_file else None
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo):
+        rtype = info.resourceType()
+        if rtype == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return  # Kullanıcının açtığı sayfa hiçbir zaman engellenmez
+        url = info.requestUrl()
+        first_party = info.firstPartyUrl().host()
+        if self._record is not None:
+            self._record.write(f"{url.toString()}\t{first_party}\t{self._TYPES.get(rtype, 'other')}\n")
+        self.checked += 1
+        if self.blocker.should_block(url.toString(), url.host(), first_party, self._TYPES.get(rtype, "other")):
+            self.blocked += 1
+            info.block(True)
+
+    def close(self):
+        if self._record is not None:
+            self._record.close()
+            self._record = None
+
+
+def adblock_list_paths(patterns: List[str]) -> List[str]:
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(os.path.expanduser(pattern))))
+    return paths
+
+
+def benchmark_adblock(corpus: str, list_patterns: List[str], cache_file: Optional[str] = None):
+    # Kayıtlı istek derlemi ("url<TAB>sayfa<TAB>tür" satırları) üzerinde karar süresini ölç
+    paths = adblock_list_paths(list_patterns)
+    if not paths:
+        print("Kural listesi bulunamadı:", ", ".join(list_patterns))
+        return
+    start = time.perf_counter()
+    blocker = ContentBlocker.from_files(paths)
+    compile_s = time.perf_counter() - start
+    load_s = None
+    if cache_file:
+        ContentBlocker.load(paths, cache_file)
+        start = time.perf_counter()
+        ContentBlocker.load(paths, cache_file)
+        load_s = time.perf_counter() - start
+
+    requests = []
+    with open(corpus, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if not parts[0]:
+                continue
+            # Qt olmadan çalışsın: ana makineyi kendimiz ayırırız
+            host = re.sub(r"^[a-z][a-z0-9+.-]*://", "", parts[0].lower()).split("/", 1)[0].split(":", 1)[0]
+            requests.append((parts[0], host, parts[1] if len(parts) > 1 else "",
+                             parts[2] if len(parts) > 2 else "other"))
+    if not requests:
+        print("Derlem boş:", corpus)
+        return
+    timings = []
+    blocked = 0
+    for url, host, first_party, rtype in requests:
+        t = time.perf_counter()
+        blocked += blocker.should_block(url, host, first_party, rtype)
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+    print(f"📊 {blocker.rule_count} kural ({len(paths)} liste), derleme {compile_s * 1000:.0f} ms"
+          + (f", önbellekten yükleme {load_s * 1000:.0f} ms" if load_s is not None else ""))
+    print(f"  {len(requests)} istek, {blocked} engellendi (%{blocked / len(requests) * 100:.1f})")
+    print(f"  karar: ort {sum(timings) / len(timings) * 1e6:.1f} µs, "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1e6:.1f} µs, en kötü {timings[-1] * 1e6:.1f} µs")
+
+
+# Navigation/Paint Timing değerleri; sayfa betikleri 'performance' nesnesini ezmiş olabileceği için
+# ayrı dünyada çalışır ve Qt dönüşümüne takılmamak için JSON metni döndürür
+PAGE_TIMING_JS = """(function() {
+  var n = performance.getEntriesByType('navigation')[0];
+  var paint = {};
+  performance.getEntriesByType('paint').forEach(function(e) { paint[e.name] = e.startTime; });
+  var res = performance.getEntriesByType('resource');
+  var bytes = 0;
+  res.forEach(function(e) { bytes += e.transferSize || 0; });
+  var nav = null;
+  if (n) {
+    nav = {type: n.type, protocol: n.nextHopProtocol,
+           redirect: n.redirectEnd - n.redirectStart,
+           dns: n.domainLookupEnd - n.domainLookupStart,
+           connect: n.connectEnd - n.connectStart,
+           tls: n.secureConnectionStart > 0 ? n.connectEnd - n.secureConnectionStart : 0,
+           ttfb: n.responseStart - n.startTime,
+           response: n.responseEnd - n.responseStart,
+           dom_interactive: n.domInteractive,
+           dom_content_loaded: n.domContentLoadedEventEnd,
+           load: n.loadEventEnd || n.loadEventStart || n.duration,
+           transfer: n.transferSize};
+  }
+  return JSON.stringify({nav: nav, first_paint: paint['first-paint'] || null,
+                         fcp: paint['first-contentful-paint'] || null,
+                         resources: res.length, resource_bytes: bytes});
+})()"""
+
+
+def timing_summary(record: Dict[str, Any]) -> Tuple[str, str]:
+    # Durum çubuğu için kısa metin ve ayrıntılı ipucu
+    if not record.get("ok"):
+        return f"⏱ hata · {record['qt_ms'] / 1000:.1f} sn", record.get("url", "")
+    parts = [f"⏱ {record['qt_ms'] / 1000:.2f} sn"]
+    nav = record.get("nav") or {}
+    if nav.get("ttfb") is not None:
+        parts.append(f"TTFB {nav['ttfb']:.0f} ms")
+    if record.get("fcp"):
+        parts.append(f"FCP {record['fcp']:.0f} ms")
+    if record.get("resources") is not None:
+        parts.append(f"{record['resources']} kaynak")
+    tip = [record.get("url", "")]
+    labels = [("redirect", "Yönlendirme"), ("dns", "DNS"), ("connect", "Bağlantı"), ("tls", "TLS"),
+              ("ttfb", "İlk bayt"), ("response", "Yanıt"), ("dom_interactive", "DOM etkileşimli"),
+              ("dom_content_loaded", "DOMContentLoaded"), ("load", "load olayı")]
+    tip += [f"{label}: {nav[key]:.0f} ms" for key, label in labels if nav.get(key)]
+    if record.get("first_paint"):
+        tip.append(f"İlk boyama: {record['first_paint']:.0f} ms")
+    if nav.get("protocol"):
+        tip.append(f"Protokol: {nav['protocol']}")
+    if record.get("resource_bytes"):
+        tip.append(f"Kaynaklar: {record['resources']} ({format_bytes(record['resource_bytes'])})")
+    return " · ".join(parts), "\n".join(tip)
+
+
+class PageLoadLog:
+    # Sayfa yükleme kayıtları: satır başına bir JSON nesnesi, analiz için (ör. pandas.read_json(lines=True))
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, record: Dict[str, Any]):
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+PROCESS_MODELS = {
+    "": "site başına yalıtım (varsayılan)",
+    "process-per-site": "site başına tek süreç",
+    "process-per-tab": "sekme başına süreç",
+    "single-process": "tek süreç",
+}
+
+
+def renderer_flags(cfg: Dict[str, Any]) -> List[str]:
+    flags = []
+    if cfg["process_model"] in PROCESS_MODELS and cfg["process_model"]:
+        flags.append(f"--{cfg['process_model']}")
+    if cfg["process_limit"]:
+        flags.append(f"--renderer-process-limit={int(cfg['process_limit'])}")
+    return flags + list(cfg["flags"])
+
+
+def apply_renderer_flags(cfg: Dict[str, Any]) -> str:
+    # QApplication oluşturulmadan önce çağrılmalı; ortamdaki bayraklar korunur
+    existing = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "").split()
+    flags = existing + [f for f in renderer_flags(cfg) if f not in existing]
+    if flags:
+        os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = " ".join(flags)
+    return " ".join(flags)
+
+
+def process_model_name() -> str:
+    flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "").split()
+    for model in ("single-process", "process-per-tab", "process-per-site"):
+        if f"--{model}" in flags:
+            return PROCESS_MODELS[model]
+    return PROCESS_MODELS[""]
+
+
+class ProcessSampler(threading.Thread):
+    """Tarayıcı ve QtWebEngine alt süreçlerinin RSS/CPU değerlerini arka planda örnekler
+
+    Ana iş parçacığı yalnızca son örneği okur (snapshot); psutil çağrıları
+    arayüzü ve sekme yaşam döngüsü denetimini bekletmez. cpu_percent iki
+    ölçüm arasındaki farkı verdiği için Process nesneleri saklanır.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        super().__init__(name="process-sampler", daemon=True)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._procs: Dict[int, Any] = {}
+        self._roles: Dict[int, str] = {}
+        self._latest: Dict[int, Dict[str, Any]] = {}
+        self.cost_ms = 0.0
+
+    @staticmethod
+    def _role(proc) -> str:
+        try:
+            for arg in proc.cmdline():
+                if arg.startswith("--type="):
+                    return arg[7:]
+        except Exception:
+            pass
+        return "browser" if proc.pid == os.getpid() else "other"
+
+    def sample(self):
+        start = time.perf_counter()
+        root = psutil.Process(os.getpid())
+        try:
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            procs = [root]
+        latest: Dict[int, Dict[str, Any]] = {}
+        for proc in procs:
+            cached = self._procs.get(proc.pid)
+            if cached is None:
+                cached = self._procs[proc.pid] = proc
+                cached.cpu_percent(None)  # İlk çağrı 0 döner; oran bir sonraki örnekten itibaren
+                self._roles[proc.pid] = self._role(proc)
+            try:
+                with cached.oneshot():
+                    latest[proc.pid] = {"pid": proc.pid, "role": self._roles[proc.pid],
+                                        "rss_mb": cached.memory_info().rss / (1024 * 1024),
+                                        "cpu": cached.cpu_percent(None)}
+            except psutil.Error:
+                continue
+        for pid in set(self._procs) - set(latest):
+            del self._procs[pid]
+            del self._roles[pid]
+        with self._lock:
+            self._latest = latest
+            self.cost_ms = (time.perf_counter() - start) * 1000
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._latest)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# Active < Frozen < Discarded: sekme ne kadar uzun görünmezse o kadar ileri gider
+LIFECYCLE_ORDER = [
+    QWebEnginePage.LifecycleState.Active,
+    QWebEnginePage.LifecycleState.Frozen,
+    QWebEnginePage.LifecycleState.Discarded,
+]
+
+
 class BrowserTab(QWidget):
-    def __init__(self, url: Optional[str] = None, profile: Optional[QWebEngineProfile] = None, parent=None):
+    # Görünüm sonradan oluşturulabildiği için sinyaller sekme üzerinden yayınlanır
+    titleChanged = Signal(str)
+    urlChanged = Signal(QUrl)
+    loadProgress = Signal(int)
+    loadFinished = Signal(bool)
+    timingReady = Signal(dict)
+
+    def __init__(self, url: Optional[str] = None, profile: Optional[QWebEngineProfile] = None, parent=None,
+                 lazy: bool = False, title: str = ""):
         super().__init__(parent)
-        self.view = QWebEngineView(self)
-        if profile:
-            # Qt6: Özel sayfa ile yeni pencere isteklerini yakala
-            page = BrowserPage(parent, profile, self.view)
-            self.view.setPage(page)
-        lay = QVBoxLayout(self)
-        lay.setContentsMargins(0, 0, 0, 0)
-        lay.addWidget(self.view)
+        self.view: Optional[QWebEngineView] = None
+        self._main_window = parent
+        self._profile = profile
+        self._lay = QVBoxLayout(self)
+        self._lay.setContentsMargins(0, 0, 0, 0)
         self._home = "https://duckduckgo.com"
-        if url:
-            self.navigate(url)
+        # Tembel sekme yalnızca adres ve başlık tutar; sayfa ilk etkinleşmede oluşturulur
+        self._url = normalize_url(url).toString() if url else ""
+        self._title = title
+        self.last_active = time.monotonic()
+        self.loading = False
+        self.pending_scroll: Optional[List[float]] = None  # Oturumdan geri yüklenecek kaydırma
+        self.last_timing: Optional[Dict[str, Any]] = None
+        self._load_id = 0
+        self._load_started: Optional[Tuple[float, float]] = None  # (duvar saati, perf_counter)
+        if not lazy:
+            self.ensure_view()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.view is not None
+
+    def ensure_view(self) -> QWebEngineView:
+        if self.view is None:
+            self.view = QWebEngineView(self)
+            if self._profile:
+                # Qt6: Özel sayfa ile yeni pencere isteklerini yakala
+                page = BrowserPage(self._main_window, self._profile, self.view)
+                self.view.setPage(page)
+            self._lay.addWidget(self.view)
+            self.view.titleChanged.connect(self._on_title_changed)
+            self.view.urlChanged.connect(self._on_url_changed)
+            self.view.loadStarted.connect(self._on_load_started)
+            self.view.loadProgress.connect(self.loadProgress)
+            self.view.loadFinished.connect(self._on_load_finished)
+            if self._url:
+                self.view.setUrl(QUrl(self._url))
+        return self.view
+
+    def _on_title_changed(self, title: str):
+        self._title = title
+        self.titleChanged.emit(title)
+
+    def _on_url_changed(self, url: QUrl):
+        self._url = url.toString()
+        self.urlChanged.emit(url)
+
+    def _on_load_started(self):
+        self.loading = True
+        self._load_id += 1
+        self._load_started = (time.time(), time.perf_counter())
+
+    def _on_load_finished(self, ok: bool):
+        self.loading = False
+        if ok and self.pending_scroll:
+            x, y = self.pending_scroll
+            self.view.page().runJavaScript(f"window.scrollTo({x:.0f}, {y:.0f});")
+        self.pending_scroll = None
+        self.loadFinished.emit(ok)
+        if self._load_started is not None:
+            self._collect_timing(ok)
+
+    def _collect_timing(self, ok: bool):
+        started_wall, started = self._load_started
+        self._load_started = None
+        url = self.view.url()
+        record: Dict[str, Any] = {
+            "ts": round(started_wall, 3), "url": url.toString(), "host": url.host(), "ok": ok,
+            "qt_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        if not ok:
+            self._emit_timing(record)
+            return
+        load_id = self._load_id
+
+        def on_result(result):
+            # Bu arada yeni bir gezinme başladıysa ölçüm artık o belgeye aittir
+            if load_id != self._load_id:
+                return
+            try:
+                record.update(json.loads(result))
+            except (TypeError, ValueError):
+                pass
+            for key in ("first_paint", "fcp"):
+                if record.get(key) is not None:
+                    record[key] = round(record[key], 1)
+            if record.get("nav"):
+                record["nav"] = {k: round(v, 1) if isinstance(v, float) else v for k, v in record["nav"].items()}
+            self._emit_timing(record)
+
+        self.view.page().runJavaScript(PAGE_TIMING_JS, QWebEngineScript.ScriptWorldId.ApplicationWorld, on_result)
+
+    def _emit_timing(self, record: Dict[str, Any]):
+        self.last_timing = record
+        self.timingReady.emit(record)
+
+    def scroll_position(self) -> Optional[List[float]]:
+        if self.view is None:
+            return self.pending_scroll
+        pos = self.view.page().scrollPosition()
+        return [pos.x(), pos.y()]
+
+    def url(self) -> str:
+        return self._url
+
+    def title(self) -> str:
+        return self._title or self._url
+
+    def lifecycle_state(self) -> Optional[QWebEnginePage.LifecycleState]:
+        return self.view.page().lifecycleState() if self.view else None
+
+    def set_lifecycle_state(self, state: QWebEnginePage.LifecycleState) -> bool:
+        # Qt'nin önerdiği sınırı aşma (görünür, ses çalan ya da DevTools açık sayfa)
+        if self.view is None:
+            return False
+        page = self.view.page()
+        current = page.lifecycleState()
+        limit = LIFECYCLE_ORDER.index(page.recommendedState())
+        target = LIFECYCLE_ORDER.index(state)
+        if target > limit:
+            target = limit
+        if target <= LIFECYCLE_ORDER.index(current):
+            return False
+        page.setLifecycleState(LIFECYCLE_ORDER[target])
+        return True
 
     def navigate(self, text: str):
-        self.view.setUrl(normalize_url(text))
+        self._url = normalize_url(text).toString()
+        if self.view:
+            self.view.setUrl(QUrl(self._url))
 
     def go_home(self):
-        self.view.setUrl(QUrl(self._home))
+        self.navigate(self._home)
 
     def set_home(self, url: str):
         self._home = url
 
     def back(self):
-        self.view.back()
+        if self.view: self.view.back()
 
     def forward(self):
-        self.view.forward()
+        if self.view: self.view.forward()
 
     def reload(self):
-        self.view.reload()
+        if self.view: self.view.reload()
 
     def stop(self):
-        self.view.stop()
+        if self.view: self.view.stop()
 
     def zoom_in(self):
-        self.view.setZoomFactor(self.view.zoomFactor() + 0.1)
+        if self.view: self.view.setZoomFactor(self.view.zoomFactor() + 0.1)
 
     def zoom_out(self):
-        self.view.setZoomFactor(self.view.zoomFactor() - 0.1)
+        if self.view: self.view.setZoomFactor(self.view.zoomFactor() - 0.1)
 
     def reset_zoom(self):
-        self.view.setZoomFactor(1.0)
+        if self.view: self.view.setZoomFactor(1.0)
 
 
-class BookmarkBar(QToolBar):
-    def __init__(self, store_path: Path, parent=None):
-        super().__init__("Yer İmleri", parent)
-        self.store_path = store_path
-        self.setIconSize(QSize(16, 16))
-        self.setMovable(False)
-        self._bookmarks = []
+class BookmarkStore:
+    """Klasörlü yer imleri: kimlik dizini, anlık görüntü + ekleme günlüğü
+
+    bookmarks.json tam anlık görüntüdür; her ekleme/silme yalnızca
+    bookmarks.log dosyasına bir satır ekler. Günlük 'compact_after'
+    işlemi geçince anlık görüntü yeniden yazılıp günlük sıfırlanır.
+    Eski biçim (düz liste) ilk açılışta dönüştürülür.
+    """
+
+    ROOT = 0
+
+    def __init__(self, path: Path, compact_after: int = 200):
+        self.path = path
+        self.log_path = path.with_suffix(".log")
+        self.compact_after = compact_after
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self.children: Dict[int, List[int]] = {self.ROOT: []}
+        self.by_url: Dict[str, List[int]] = {}
+        self.next_id = 1
+        self._log_ops = 0
         self.load()
 
     def load(self):
-        self._bookmarks = []
-        if self.store_path.exists():
+        data: Any = None
+        if self.path.exists():
             try:
-                self._bookmarks = json.loads(self.store_path.read_text(encoding="utf-8"))
+                data = json.loads(self.path.read_text(encoding="utf-8"))
             except Exception:
-                self._bookmarks = []
+                data = None
+        if isinstance(data, list):
+            for bm in data:
+                if isinstance(bm, dict) and bm.get("url"):
+                    self._insert(self._new_item("bookmark", bm.get("title") or bm["url"], bm["url"], self.ROOT))
+            self.compact()
+            return
+        if isinstance(data, dict):
+            for item in data.get("items", []):
+                self._insert(item)
+            self.next_id = max(self.next_id, data.get("next_id", 1))
+        if self.log_path.exists():
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        continue  # Yarım kalmış son satır
+                    self._apply(op)
+                    self._log_ops += 1
+
+    def _new_item(self, kind: str, title: str, url: str, parent: int) -> Dict[str, Any]:
+        item = {"id": self.next_id, "type": kind, "title": title, "url": url, "parent": parent,
+                "added": int(time.time())}
+        self.next_id += 1
+        return item
+
+    def _insert(self, item: Dict[str, Any]):
+        item_id = item["id"]
+        self.items[item_id] = item
+        self.children.setdefault(item.get("parent", self.ROOT), []).append(item_id)
+        if item.get("type") == "folder":
+            self.children.setdefault(item_id, [])
+        elif item.get("url"):
+            self.by_url.setdefault(item["url"], []).append(item_id)
+        self.next_id = max(self.next_id, item_id + 1)
+
+    def _remove(self, item_id: int):
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        for child in list(self.children.pop(item_id, [])):
+            self._remove(child)
+        siblings = self.children.get(item.get("parent", self.ROOT), [])
+        if item_id in siblings:
+            siblings.remove(item_id)
+        ids = self.by_url.get(item.get("url", ""))
+        if ids and item_id in ids:
+            ids.remove(item_id)
+
+    def _apply(self, op: Dict[str, Any]):
+        if op.get("op") == "add":
+            self._insert(op["item"])
+        elif op.get("op") == "remove":
+            self._remove(op["id"])
+        elif op.get("op") == "rename" and op.get("id") in self.items:
+            self.items[op["id"]]["title"] = op["title"]
+
+    def _journal(self, op: Dict[str, Any]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(op, ensure_ascii=False) + "\n")
+        self._log_ops += 1
+        if self._log_ops >= self.compact_after:
+            self.compact()
+
+    def compact(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Ebeveyn önce gelsin diye ağaç sırasıyla yaz
+        ordered = []
+        pending = [self.ROOT]
+        while pending:
+            for child in self.children.get(pending.pop(0), []):
+                ordered.append(self.items[child])
+                if self.items[child].get("type") == "folder":
+                    pending.append(child)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 2, "next_id": self.next_id, "items": ordered},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._log_ops = 0
+
+    def close(self):
+        if self._log_ops:
+            self.compact()
+
+    def add(self, title: str, url: str, parent: int = ROOT) -> Dict[str, Any]:
+        item = self._new_item("bookmark", title or url, url, parent)
+        self._insert(item)
+        self._journal({"op": "add", "item": item})
+        return item
+
+    def add_folder(self, title: str, parent: int = ROOT) -> Dict[str, Any]:
+        item = self._new_item("folder", title, "", parent)
+        self._insert(item)
+        self._journal({"op": "add", "item": item})
+        return item
+
+    def remove(self, item_id: int):
+        self._remove(item_id)
+        self._journal({"op": "remove", "id": item_id})
+
+    def rename(self, item_id: int, title: str):
+        if item_id in self.items:
+            self.items[item_id]["title"] = title
+            self._journal({"op": "rename", "id": item_id, "title": title})
+
+    def children_of(self, folder_id: int = ROOT) -> List[Dict[str, Any]]:
+        return [self.items[i] for i in self.children.get(folder_id, [])]
+
+    def contains_url(self, url: str) -> bool:
+        return bool(self.by_url.get(url))
+
+    _NETSCAPE_TAG = re.compile(r'<(/?)(dl|h3|a)\b([^>]*)>([^<]*)', re.IGNORECASE)
+    _HREF = re.compile(r'href="([^"]*)"', re.IGNORECASE)
+
+    def import_netscape(self, path: str, parent: int = ROOT) -> int:
+        # Tarayıcıların dışa aktardığı bookmarks.html. Biçim düzenli olduğundan HTMLParser yerine
+        # tek bir regex taraması yeterli; günlük atlanır ve sonunda bir kez yazılır.
+        from html import unescape
+
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+        stack = [parent]
+        last_folder: Optional[int] = None
+        added = 0
+        for m in self._NETSCAPE_TAG.finditer(text):
+            closing, tag, attrs, title = m.groups()
+            tag = tag.lower()
+            if tag == "dl":
+                if closing:
+                    if len(stack) > 1:
+                        stack.pop()
+                else:
+                    stack.append(last_folder if last_folder is not None else stack[-1])
+                    last_folder = None
+            elif closing:
+                continue
+            elif tag == "h3":
+                item = self._new_item("folder", unescape(title).strip(), "", stack[-1])
+                self._insert(item)
+                last_folder = item["id"]
+                added += 1
+            else:
+                href = self._HREF.search(attrs)
+                url = unescape(href.group(1)) if href else ""
+                if not url.startswith(("http", "file", "ftp")):
+                    continue  # javascript:, place: vb. yer imleri atlanır
+                self._insert(self._new_item("bookmark", unescape(title).strip() or url, url, stack[-1]))
+                added += 1
+        self.compact()
+        return added
+
+
+class BookmarkBar(QToolBar):
+    # Çubukta yalnızca ilk 'bar_limit' kök öğe durur; kalanlar ve klasör içerikleri menü açılınca oluşturulur
+    def __init__(self, store_path: Path, parent=None, bar_limit: int = 25, compact_after: int = 200):
+        super().__init__("Yer İmleri", parent)
+        self.store = BookmarkStore(store_path, compact_after=compact_after)
+        self.bar_limit = bar_limit
+        self.setIconSize(QSize(16, 16))
+        self.setMovable(False)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        self._actions: Dict[int, QAction] = {}
+        self._separator: Optional[QAction] = None
+        self._overflow = QMenu("»", self)
+        self._overflow.aboutToShow.connect(self.populate_overflow)
         self.refresh()
 
-    def save(self):
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        self.store_path.write_text(json.dumps(self._bookmarks, ensure_ascii=False, indent=2), encoding="utf-8")
+    def _open(self, url: str):
+        self.parent().open_in_current_tab(url)
+
+    def _make_action(self, item: Dict[str, Any], owner) -> QAction:
+        if item.get("type") == "folder":
+            menu = QMenu(item["title"] or "Klasör", owner)
+            menu.aboutToShow.connect(lambda m=menu, fid=item["id"]: self.populate_folder(m, fid))
+            act = menu.menuAction()
+        else:
+            act = QAction(item.get("title") or item.get("url"), owner)
+            act.setToolTip(item.get("url"))
+            act.triggered.connect(lambda _, u=item.get("url"): self._open(u))
+        act.setData(item["id"])
+        return act
+
+    def populate_folder(self, menu: QMenu, folder_id: int):
+        menu.clear()
+        for item in self.store.children_of(folder_id):
+            menu.addAction(self._make_action(item, menu))
+        if menu.isEmpty():
+            menu.addAction("(boş)").setEnabled(False)
+
+    def populate_overflow(self):
+        self._overflow.clear()
+        for item in self.store.children_of()[self.bar_limit:]:
+            self._overflow.addAction(self._make_action(item, self._overflow))
+
+    def _add_to_bar(self, item: Dict[str, Any]):
+        act = self._make_action(item, self)
+        self.insertAction(self._separator, act)
+        self._actions[item["id"]] = act
+        if item.get("type") == "folder":
+            button = self.widgetForAction(act)
+            if isinstance(button, QToolButton):
+                button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+
+    def _update_overflow(self):
+        self._overflow.menuAction().setVisible(len(self.store.children[BookmarkStore.ROOT]) > self.bar_limit)
 
     def refresh(self):
+        # Tam yeniden kurulum yalnızca açılışta ve toplu içe aktarmadan sonra
         self.clear()
-        for bm in self._bookmarks:
-            act = QAction(bm.get("title") or bm.get("url"), self)
-            act.setToolTip(bm.get("url"))
-            act.triggered.connect(lambda _, u=bm.get("url"): self.parent().open_in_current_tab(u))
-            self.addAction(act)
-        self.addSeparator()
+        self._actions.clear()
+        self._separator = self.addSeparator()
+        self.addAction(self._overflow.menuAction())
+        for item in self.store.children_of()[:self.bar_limit]:
+            self._add_to_bar(item)
         add_act = QAction("☆ Ekle", self)
         add_act.setToolTip("Geçerli sayfayı yer imlerine ekle")
         add_act.triggered.connect(self.add_current_page)
         self.addAction(add_act)
+        import_act = QAction("İçe aktar", self)
+        import_act.setToolTip("Başka bir tarayıcıdan dışa aktarılmış yer imleri (HTML)")
+        import_act.triggered.connect(self.import_bookmarks)
+        self.addAction(import_act)
+        self._update_overflow()
 
     def add_current_page(self):
         mw: MainWindow = self.parent()
@@ -114,10 +1394,425 @@ class BookmarkBar(QToolBar):
         if not view:
             return
         url = view.url().toString()
+        if self.store.contains_url(url):
+            mw.status.showMessage("Bu sayfa zaten yer imlerinde.", 3000)
+            return
         title = view.title() or url
-        self._bookmarks.append({"title": title, "url": url})
-        self.save()
+        item = self.store.add(title, url)
+        # Yalnızca yeni öğe eklenir; çubuk doluysa taşma menüsü açılınca görünür
+        if len(self.store.children[BookmarkStore.ROOT]) <= self.bar_limit:
+            self._add_to_bar(item)
+        self._update_overflow()
+
+    def remove_bookmark(self, item_id: int):
+        root = self.store.children[BookmarkStore.ROOT]
+        was_on_bar = item_id in self._actions
+        self.store.remove(item_id)
+        act = self._actions.pop(item_id, None)
+        if act is not None:
+            self.removeAction(act)
+            act.deleteLater()
+        # Çubuktan çıkan yerine taşma menüsündeki ilk öğe geçer
+        if was_on_bar and len(root) >= self.bar_limit:
+            self._add_to_bar(self.store.items[root[self.bar_limit - 1]])
+        self._update_overflow()
+
+    def show_context_menu(self, pos):
+        act = self.actionAt(pos)
+        item_id = act.data() if act is not None else None
+        if item_id not in self.store.items:
+            return
+        menu = QMenu(self)
+        menu.addAction("Sil", lambda: self.remove_bookmark(item_id))
+        menu.exec(self.mapToGlobal(pos))
+
+    def import_bookmarks(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Yer imlerini içe aktar", str(Path.home()),
+                                              "Yer imi dosyası (*.html *.htm)")
+        if not path:
+            return
+        try:
+            start = time.perf_counter()
+            count = self.store.import_netscape(path)
+        except Exception as e:
+            QMessageBox.warning(self, "İçe aktarma", f"İçe aktarılamadı: {e}")
+            return
         self.refresh()
+        self.parent().status.showMessage(
+            f"{count} yer imi içe aktarıldı ({(time.perf_counter() - start) * 1000:.0f} ms)", 5000)
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def unique_path(directory: str, name: str) -> str:
+    base, ext = os.path.splitext(name)
+    path = os.path.join(directory, name)
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{base} ({n}){ext}")
+        n += 1
+    return path
+
+
+class TokenBucket:
+    """Saniyede 'rate' bayt dolan, en fazla 'burst_s' saniyelik birikim tutan kova"""
+
+    def __init__(self, rate: float, burst_s: float = 1.0):
+        self.rate = rate
+        self.capacity = rate * burst_s
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+
+    def consume(self, nbytes: int, now: Optional[float] = None) -> bool:
+        # Harcanan baytı düş; kova eksiye düştüyse False (indirmeler beklemeli)
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate) - nbytes
+        self.stamp = now
+        return self.tokens >= 0
+
+
+_CACHE_TYPES = {
+    "disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+    "memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+    "none": QWebEngineProfile.HttpCacheType.NoCache,
+}
+_COOKIE_POLICIES = {
+    "persistent": QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies,
+    "force": QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies,
+    "none": QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies,
+}
+
+
+def create_profile(cfg: Dict[str, Any], storage_dir: Optional[str] = None,
+                   cache_dir: Optional[str] = None) -> QWebEngineProfile:
+    # Profil tüm sayfalardan sonra silinmeli; pencereye değil uygulamaya bağlanır
+    profile = QWebEngineProfile(cfg["name"], QApplication.instance())
+    storage = storage_dir or os.path.expanduser(cfg["storage_dir"])
+    cache = cache_dir or os.path.expanduser(cfg["cache_dir"])
+    os.makedirs(storage, exist_ok=True)
+    os.makedirs(cache, exist_ok=True)
+    profile.setPersistentStoragePath(storage)
+    profile.setCachePath(cache)
+    profile.setHttpCacheType(_CACHE_TYPES.get(cfg["cache_type"], _CACHE_TYPES["disk"]))
+    profile.setHttpCacheMaximumSize(int(cfg["cache_size_mb"] * 1024 * 1024))
+    profile.setPersistentCookiesPolicy(_COOKIE_POLICIES.get(cfg["cookies"], _COOKIE_POLICIES["persistent"]))
+    return profile
+
+
+class DownloadEntry(QWidget):
+    # İndirme listesindeki tek satır: ad, ilerleme, hız ve düğmeler
+    def __init__(self, req: QWebEngineDownloadRequest, manager: "DownloadManager"):
+        super().__init__()
+        self.req = req
+        self.manager = manager
+        self.queued = False        # Eşzamanlılık sınırı nedeniyle bekliyor
+        self.user_paused = False
+        self.throttled = False     # Hız sınırı nedeniyle geçici olarak duraklatıldı
+        self.last_bytes = 0
+        self.rate = 0.0
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+        self.name_lbl = QLabel(req.downloadFileName())
+        self.progress = QProgressBar()
+        self.progress.setTextVisible(False)
+        self.progress.setMaximumHeight(8)
+        row = QHBoxLayout()
+        self.info_lbl = QLabel("Kuyrukta")
+        self.pause_btn = QPushButton("⏸")
+        self.cancel_btn = QPushButton("✕")
+        for b in (self.pause_btn, self.cancel_btn):
+            b.setFixedWidth(28)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.cancel_btn.clicked.connect(self.cancel)
+        row.addWidget(self.info_lbl, 1)
+        row.addWidget(self.pause_btn)
+        row.addWidget(self.cancel_btn)
+        layout.addWidget(self.name_lbl)
+        layout.addWidget(self.progress)
+        layout.addLayout(row)
+        req.stateChanged.connect(lambda _: self.manager.on_state_changed(self))
+
+    def is_finished(self) -> bool:
+        return self.req.isFinished()
+
+    def is_active(self) -> bool:
+        # Eşzamanlılık sınırına sayılan indirme: bekleyen ya da kullanıcının durdurduğu değil
+        return not (self.is_finished() or self.queued or self.user_paused)
+
+    def toggle_pause(self):
+        if self.is_finished():
+            return
+        if self.user_paused:
+            # Sürdürülen indirme boş yer varsa hemen, yoksa sırası gelince başlar
+            self.user_paused = False
+            self.queued = True
+        else:
+            self.user_paused = True
+            self.queued = False
+            self.req.pause()
+        self.manager.start_queued()
+        self.update_view()
+
+    def cancel(self):
+        if self.is_finished():
+            self.manager.remove_entry(self)
+        else:
+            self.req.cancel()
+
+    def update_view(self):
+        received, total = self.req.receivedBytes(), self.req.totalBytes()
+        if total > 0:
+            self.progress.setRange(0, 1000)
+            self.progress.setValue(int(received * 1000 / total))
+        else:
+            self.progress.setRange(0, 0 if self.is_active() else 1)
+        state = self.req.state()
+        size = f"{format_bytes(received)} / {format_bytes(total)}" if total > 0 else format_bytes(received)
+        if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
+            text = f"Tamamlandı · {format_bytes(received)}"
+        elif state == QWebEngineDownloadRequest.DownloadState.DownloadCancelled:
+            text = "İptal edildi"
+        elif state == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted:
+            text = f"Kesildi: {self.req.interruptReasonString()}"
+        elif self.user_paused:
+            text = f"Duraklatıldı · {size}"
+        elif self.queued:
+            text = f"Kuyrukta · {size}" if received else "Kuyrukta"
+        else:
+            text = f"{size} · {format_bytes(self.rate)}/s"
+            if total > 0 and self.rate > 0:
+                text += f" · {int((total - received) / self.rate)} sn"
+        self.info_lbl.setText(text)
+        self.pause_btn.setText("▶" if self.user_paused else "⏸")
+        self.pause_btn.setEnabled(not self.is_finished())
+        self.cancel_btn.setText("🗑" if self.is_finished() else "✕")
+
+
+class DownloadManager(QDockWidget):
+    """İndirme kuyruğu: eşzamanlılık sınırı, ilerleme/hız ve toplam hız sınırı
+
+    QtWebEngine istek sinyal işleyicisi içinde kabul edilmezse iptal eder;
+    bu yüzden her istek hemen kabul edilir, sınırın üstündekiler ise hemen
+    duraklatılıp kuyrukta bekletilir. Hız sınırı, kova boşaldığında etkin
+    indirmeleri kısa süreliğine duraklatıp kova dolunca sürdürerek uygulanır.
+    """
+
+    def __init__(self, settings: Dict[str, Any], parent=None):
+        super().__init__("İndirmeler", parent)
+        self.settings = settings
+        self.entries: List[DownloadEntry] = []
+        self.list = QListWidget(self)
+        self.setWidget(self.list)
+        rate = settings["max_rate_kbps"] * 1024
+        self.bucket = TokenBucket(rate) if rate > 0 else None
+        self._tick = QTimer(self)
+        self._tick.setInterval(settings["tick_ms"])
+        self._tick.timeout.connect(self.tick)
+        self._last_tick = time.monotonic()
+
+    def directory(self) -> str:
+        return os.path.expanduser(self.settings["directory"])
+
+    def enqueue(self, req: QWebEngineDownloadRequest) -> bool:
+        suggested = req.suggestedFileName() or req.downloadFileName() or "indirilen_dosya"
+        directory = self.directory()
+        if self.settings["auto_save"]:
+            os.makedirs(directory, exist_ok=True)
+            path = unique_path(directory, suggested)
+        else:
+            path, _ = QFileDialog.getSaveFileName(self.parent(), "Kaydet", os.path.join(directory, suggested))
+            if not path:
+                req.cancel()
+                return False
+        req.setDownloadDirectory(os.path.dirname(path))
+        req.setDownloadFileName(os.path.basename(path))
+        req.accept()
+        entry = DownloadEntry(req, self)
+        if sum(e.is_active() for e in self.entries) >= self.settings["max_concurrent"]:
+            entry.queued = True
+            req.pause()
+        self.entries.append(entry)
+        item = QListWidgetItem()
+        item.setSizeHint(entry.sizeHint())
+        self.list.addItem(item)
+        self.list.setItemWidget(item, entry)
+        entry.update_view()
+        self._last_tick = time.monotonic()
+        self._tick.start()
+        return True
+
+    def start_queued(self):
+        free = self.settings["max_concurrent"] - sum(e.is_active() for e in self.entries)
+        for e in self.entries:
+            if free <= 0:
+                break
+            if e.queued and not e.is_finished():
+                e.queued = False
+                if not e.throttled:
+                    e.req.resume()
+                e.update_view()
+                free -= 1
+        if any(e.is_active() for e in self.entries):
+            self._tick.start()
+
+    def on_state_changed(self, entry: DownloadEntry):
+        entry.update_view()
+        if entry.is_finished():
+            self.start_queued()
+            if entry.req.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
+                self.parent().status.showMessage(f"İndirildi: {entry.req.downloadFileName()}", 5000)
+
+    def remove_entry(self, entry: DownloadEntry):
+        idx = self.entries.index(entry)
+        self.entries.pop(idx)
+        self.list.takeItem(idx)
+        entry.deleteLater()
+
+    def tick(self):
+        now = time.monotonic()
+        dt = max(now - self._last_tick, 1e-3)
+        self._last_tick = now
+        active = [e for e in self.entries if e.is_active()]
+        received = 0
+        for e in active:
+            cur = e.req.receivedBytes()
+            delta = cur - e.last_bytes
+            e.last_bytes = cur
+            received += delta
+            e.rate = 0.7 * e.rate + 0.3 * (delta / dt)  # Üstel hareketli ortalama
+            e.update_view()
+        if self.bucket is not None and active:
+            allowed = self.bucket.consume(received, now)
+            for e in active:
+                if not allowed and not e.throttled:
+                    e.throttled = True
+                    e.req.pause()
+                elif allowed and e.throttled:
+                    e.throttled = False
+                    e.req.resume()
+        if not active:
+            self._tick.stop()
+
+    def pending_count(self) -> int:
+        return sum(not e.is_finished() for e in self.entries)
+
+
+class TaskManager(QDockWidget):
+    # Sekme → renderer süreci eşlemesi, RSS/CPU ve tek tıkla atma/yenileme
+    COLUMNS = ["Sekme", "PID", "Bellek", "CPU %", "Durum", ""]
+    _STATES = {
+        QWebEnginePage.LifecycleState.Active: "etkin",
+        QWebEnginePage.LifecycleState.Frozen: "donduruldu",
+        QWebEnginePage.LifecycleState.Discarded: "atıldı",
+    }
+
+    def __init__(self, main_window: "MainWindow", cfg: Dict[str, Any]):
+        super().__init__("Görev Yöneticisi", main_window)
+        self.main_window = main_window
+        self.highlight = cfg["highlight"]
+        body = QWidget(self)
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.summary_lbl = QLabel("")
+        self.summary_lbl.setWordWrap(True)
+        self.table = QTableWidget(0, len(self.COLUMNS), body)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.summary_lbl)
+        layout.addWidget(self.table)
+        self.setWidget(body)
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(cfg["interval_s"] * 1000))
+        self._timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+
+    def on_visibility_changed(self, visible: bool):
+        # Panel kapalıyken tablo güncellenmez; örnekleme arka planda sürer
+        if visible:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _row_buttons(self, tab: BrowserTab) -> QWidget:
+        box = QWidget()
+        row = QHBoxLayout(box)
+        row.setContentsMargins(0, 0, 0, 0)
+        discard = QPushButton("At")
+        discard.setToolTip("Sekmeyi bellekten at (açılınca yeniden yüklenir)")
+        discard.clicked.connect(lambda: self.main_window.discard_tab(tab))
+        reload = QPushButton("⟳")
+        reload.setToolTip("Yeniden yükle")
+        reload.clicked.connect(lambda: self.main_window.revive_tab(tab))
+        for b in (discard, reload):
+            b.setFixedWidth(32)
+            row.addWidget(b)
+        return box
+
+    def refresh(self):
+        mw = self.main_window
+        tabs = mw.all_tabs()
+        samples = mw.process_sampler.snapshot() if mw.process_sampler is not None else {}
+        usage = mw.tab_memory_mb(tabs)
+        pids = {t: t.view.page().renderProcessPid() if t.view is not None else 0 for t in tabs}
+        rows: List[Tuple[float, Optional[BrowserTab], List[str]]] = []
+        for tab in tabs:
+            state = tab.lifecycle_state()
+            pid = pids[tab] if state != QWebEnginePage.LifecycleState.Discarded else 0
+            shared = sum(1 for p in pids.values() if p and p == pid)
+            cpu = samples.get(pid, {}).get("cpu")
+            status = self._STATES.get(state, "yüklenmedi")
+            if shared > 1:
+                status += f" · {shared} sekme aynı süreçte"
+            rows.append((usage.get(tab, 0.0), tab, [
+                tab.title(), str(pid or "–"), f"{usage.get(tab, 0.0):.0f} MB" if pid else "–",
+                f"{cpu / max(shared, 1):.0f}" if cpu is not None else "–", status]))
+        renderer_pids = {p for p in pids.values() if p}
+        for info in samples.values():
+            if info["pid"] in renderer_pids:
+                continue
+            rows.append((info["rss_mb"], None, [
+                f"[{info['role']}]", str(info["pid"]), f"{info['rss_mb']:.0f} MB", f"{info['cpu']:.0f}", "süreç"]))
+        rows.sort(key=lambda r: r[0], reverse=True)
+        heavy = [r[1] for r in rows if r[1] is not None and r[0] > 0][:self.highlight]
+
+        self.table.setRowCount(len(rows))
+        for i, (_, tab, values) in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col in (1, 2, 3):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if tab is not None and tab in heavy:
+                    item.setBackground(QColor(255, 110, 90, 70 + 50 * (self.highlight - heavy.index(tab))))
+                    font = item.font()
+                    font.setBold(True)
+                    item.setFont(font)
+                if tab is not None and col == 0:
+                    item.setToolTip(tab.url())
+                self.table.setItem(i, col, item)
+            if tab is not None:
+                self.table.setCellWidget(i, len(self.COLUMNS) - 1, self._row_buttons(tab))
+            else:
+                self.table.removeCellWidget(i, len(self.COLUMNS) - 1)
+
+        total = sum(i["rss_mb"] for i in samples.values())
+        text = (f"Süreç modeli: {process_model_name()} · {len(renderer_pids)} renderer / {len(tabs)} sekme")
+        if samples:
+            text += f" · toplam {total / 1024:.2f} GB ({len(samples)} süreç)"
+        elif psutil is None:
+            text += " · bellek/CPU için psutil kurun"
+        flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
+        self.summary_lbl.setText(text)
+        self.summary_lbl.setToolTip(f"Chromium bayrakları: {flags}" if flags else "Ek Chromium bayrağı yok")
 
 
 class BrowserPage(QWebEnginePage):
@@ -128,22 +1823,42 @@ class BrowserPage(QWebEnginePage):
     def createWindow(self, _type):
         # Yeni pencere isteğini yeni sekme olarak aç
         if hasattr(self._main_window, "add_tab"):
-            new_tab = self._main_window.add_tab()
+            background = _type == QWebEnginePage.WebWindowType.WebBrowserBackgroundTab
+            # Qt yeni sayfayı hemen ister: bu sekme tembel olamaz
+            new_tab = self._main_window.add_tab(background=background, lazy=False)
             return new_tab.view.page()
         return super().createWindow(_type)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, settings: Optional[Dict[str, Dict[str, Any]]] = None):
         super().__init__()
+        self.settings = settings or load_settings()
+        self._active_tab: Optional[BrowserTab] = None
+        log_file = self.settings["pageloads"]["log_file"]
+        self.pageload_log = PageLoadLog(log_file) if log_file else None
+        self.session = SessionStore(DATA_DIR / "session.json")
+        self._restoring = False
         self.setWindowTitle("Py Tarayıcı")
         self.resize(1200, 800)
-        self.profile = QWebEngineProfile.defaultProfile()
+        self.profile = create_profile(self.settings["profile"])
         self.profile.downloadRequested.connect(self.on_download_requested)
+        self.adblock: Optional[AdBlockInterceptor] = None
+        ad_cfg = self.settings["adblock"]
+        paths = adblock_list_paths(ad_cfg["lists"]) if ad_cfg["enabled"] else []
+        if paths:
+            try:
+                blocker = ContentBlocker.load(paths, os.path.expanduser(ad_cfg["cache_file"]))
+                self.adblock = AdBlockInterceptor(blocker, ad_cfg["record_requests"], self)
+                self.profile.setUrlRequestInterceptor(self.adblock)
+            except Exception as e:
+                print(f"Engelleme listeleri yüklenemedi: {e}")
         self.tabs = QTabWidget(self)
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.tabs.setMovable(True)
+        self.tabs.tabBar().tabMoved.connect(lambda *_: self.schedule_session_save())
         self.setCentralWidget(self.tabs)
         self.nav = QToolBar("Gezinme", self)
         self.nav.setMovable(False)
@@ -161,22 +1876,75 @@ class MainWindow(QMainWindow):
         self.addr.returnPressed.connect(self.on_address_enter)
         self.addr.setPlaceholderText("URL veya arama...")
         self.nav.addWidget(self.addr)
+        # Geçmişten adres önerileri
+        hist_cfg = self.settings["history"]
+        self.history = HistoryStore(DATA_DIR / "history.db", hist_cfg["half_life_days"], hist_cfg["batch_ms"])
+        self._suggestions = QStringListModel(self)
+        self.completer = QCompleter(self._suggestions, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(hist_cfg["suggestions"])
+        self.addr.setCompleter(self.completer)
+        self.addr.textEdited.connect(self.update_suggestions)
+        self.completer.activated[str].connect(self.open_in_current_tab)
         self.nav.addAction(self.act_new_tab)
         self.nav.addAction(self.act_close_tab)
-        store = Path.home() / ".pybrowser" / "bookmarks.json"
-        self.bookmarks = BookmarkBar(store, parent=self)
+        store = DATA_DIR / "bookmarks.json"
+        bm_cfg = self.settings["bookmarks"]
+        self.bookmarks = BookmarkBar(store, parent=self, bar_limit=bm_cfg["bar_limit"],
+                                     compact_after=bm_cfg["compact_after"])
         self.addToolBar(Qt.ToolBarArea.TopToolBarArea, self.bookmarks)
         self.status = QStatusBar(self)
         self.setStatusBar(self.status)
         self.progress_lbl = QLabel("")
         self.status.addPermanentWidget(self.progress_lbl)
+        self.adblock_lbl = QLabel("")
+        self.status.addPermanentWidget(self.adblock_lbl)
         self.act_new_tab.setShortcut(QKeySequence("Ctrl+T"))
         self.act_close_tab.setShortcut(QKeySequence("Ctrl+W"))
         self.addr.setClearButtonEnabled(True)
         self.dark_mode = False
         theme_act = QAction("🌓 Tema", self, triggered=self.toggle_theme)
         self.nav.addAction(theme_act)
-        self.add_tab("https://duckduckgo.com")
+        self.downloads = DownloadManager(self.settings["downloads"], self)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.downloads)
+        self.downloads.hide()
+        downloads_act = self.downloads.toggleViewAction()
+        downloads_act.setText("⬇ İndirmeler")
+        downloads_act.setShortcut(QKeySequence("Ctrl+J"))
+        self.nav.addAction(downloads_act)
+        tm_cfg = self.settings["task_manager"]
+        self.process_sampler: Optional[ProcessSampler] = None
+        if psutil is not None:
+            self.process_sampler = ProcessSampler(tm_cfg["interval_s"])
+            self.process_sampler.start()
+        self.task_manager = TaskManager(self, tm_cfg)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.task_manager)
+        self.task_manager.hide()
+        tm_act = self.task_manager.toggleViewAction()
+        tm_act.setText("📊 Görevler")
+        tm_act.setShortcut(QKeySequence("Shift+Esc"))
+        self.nav.addAction(tm_act)
+        clear_cache_act = QAction("🧹 Önbellek", self, triggered=self.clear_cache)
+        clear_cache_act.setToolTip("HTTP önbelleğini temizle")
+        self.nav.addAction(clear_cache_act)
+        # Arka plan sekmelerini boşta kalma süresine ve bellek bütçesine göre dondur/at
+        self._lifecycle_timer = QTimer(self)
+        self._lifecycle_timer.setInterval(int(self.settings["tabs"]["lifecycle_check_s"] * 1000))
+        self._lifecycle_timer.timeout.connect(self.check_tab_lifecycle)
+        self._lifecycle_timer.start()
+        # Oturum kaydı: değişiklikler kısa bir gecikmeyle tek yazmada toplanır
+        session_cfg = self.settings["session"]
+        self._session_timer = QTimer(self)
+        self._session_timer.setSingleShot(True)
+        self._session_timer.setInterval(session_cfg["save_delay_ms"])
+        self._session_timer.timeout.connect(self.save_session)
+        # Geri yüklenen sekmeler aynı anda değil, sırayla ve sınırlı sayıda yüklenir
+        self._hydrate_queue: List[BrowserTab] = []
+        self._hydrate_timer = QTimer(self)
+        self._hydrate_timer.setInterval(session_cfg["hydrate_interval_ms"])
+        self._hydrate_timer.timeout.connect(self.hydrate_next_tab)
+        if not (session_cfg["restore"] and self.restore_session()):
+            self.add_tab("https://duckduckgo.com")
 
     def current_tab(self) -> Optional[BrowserTab]:
         w = self.tabs.currentWidget()
@@ -186,25 +1954,211 @@ class MainWindow(QMainWindow):
         tab = self.current_tab()
         return tab.view if tab else None
 
+    def all_tabs(self) -> List[BrowserTab]:
+        return [w for w in (self.tabs.widget(i) for i in range(self.tabs.count())) if isinstance(w, BrowserTab)]
+
     def set_tab_title(self, idx: int, title: str):
         self.tabs.setTabText(idx, (title or "Yeni Sekme")[:30])
 
-    def add_tab(self, url: Optional[str] = None) -> BrowserTab:
-        tab = BrowserTab(url, profile=self.profile, parent=self)
-        idx = self.tabs.addTab(tab, "Yükleniyor...")
-        self.tabs.setCurrentIndex(idx)
-        v = tab.view
-        v.titleChanged.connect(lambda t, i=idx: self.set_tab_title(self.tabs.indexOf(tab), t))
-        v.urlChanged.connect(lambda u: self.addr.setText(u.toString()))
-        v.loadProgress.connect(lambda p: self.progress_lbl.setText(f"%{p}"))
-        v.loadFinished.connect(lambda ok: self.progress_lbl.setText("" if ok else "Yükleme hatası"))
+    def add_tab(self, url: Optional[str] = None, background: bool = False, lazy: Optional[bool] = None,
+                title: str = "") -> BrowserTab:
+        if lazy is None:
+            lazy = background and self.settings["tabs"]["lazy"]
+        tab = BrowserTab(url, profile=self.profile, parent=self, lazy=lazy, title=title)
+        idx = self.tabs.addTab(tab, (title or "Yükleniyor...")[:30])
+        tab.titleChanged.connect(lambda t: self.set_tab_title(self.tabs.indexOf(tab), t))
+        tab.titleChanged.connect(lambda _: self.schedule_session_save())
+        tab.urlChanged.connect(lambda u: self.on_tab_url_changed(tab, u))
+        tab.urlChanged.connect(lambda _: self.schedule_session_save())
+        tab.loadProgress.connect(lambda p: self.on_tab_progress(tab, f"%{p}"))
+        tab.loadFinished.connect(lambda ok: self.on_tab_progress(tab, "" if ok else "Yükleme hatası"))
+        tab.loadFinished.connect(lambda ok: ok and self.history.record_visit(tab.url(), tab.title()))
+        tab.titleChanged.connect(lambda t: self.history.set_title(tab.url(), t))
+        tab.timingReady.connect(lambda r: self.on_tab_timing(tab, r))
+        if not background:
+            self.tabs.setCurrentIndex(idx)
+        self.schedule_session_save()
         return tab
 
+    def schedule_session_save(self):
+        if not self._restoring:
+            self._session_timer.start()
+
+    def save_session(self):
+        self._session_timer.stop()
+        tabs = []
+        for tab in self.all_tabs():
+            if not tab.url():
+                continue
+            entry: Dict[str, Any] = {"url": tab.url(), "title": tab.title()}
+            scroll = tab.scroll_position()
+            if scroll and any(scroll):
+                entry["scroll"] = scroll
+            tabs.append(entry)
+        try:
+            self.session.save({"tabs": tabs, "active": max(0, self.tabs.currentIndex())})
+        except Exception as e:
+            self.status.showMessage(f"Oturum kaydedilemedi: {e}", 5000)
+
+    def restore_session(self) -> bool:
+        data = self.session.load()
+        if not data:
+            return False
+        entries = [e for e in data["tabs"] if isinstance(e, dict) and e.get("url")]
+        if not entries:
+            return False
+        self._restoring = True
+        try:
+            for entry in entries:
+                tab = self.add_tab(entry["url"], background=True, lazy=True, title=entry.get("title", ""))
+                tab.pending_scroll = entry.get("scroll")
+        finally:
+            self._restoring = False
+        active = min(max(0, int(data.get("active", 0))), len(entries) - 1)
+        # Yalnızca etkin sekme hemen yüklenir (on_tab_changed → ensure_view)
+        self.tabs.setCurrentIndex(active)
+        self.on_tab_changed(active)
+        # Diğerleri: etkin sekmeye en yakın olanlardan başlayarak sırayla
+        limit = self.settings["session"]["hydrate_limit"]
+        others = sorted((t for t in self.all_tabs() if not t.is_loaded),
+                        key=lambda t: abs(self.tabs.indexOf(t) - active))
+        self._hydrate_queue = others[:limit]
+        if self._hydrate_queue:
+            self._hydrate_timer.start()
+        return True
+
+    def hydrate_next_tab(self):
+        loading = sum(1 for t in self.all_tabs() if t.loading)
+        if loading >= self.settings["session"]["max_concurrent_loads"]:
+            return
+        while self._hydrate_queue:
+            tab = self._hydrate_queue.pop(0)
+            # Bu arada kapatılmış ya da kullanıcı tarafından açılmış olabilir
+            if self.tabs.indexOf(tab) >= 0 and not tab.is_loaded:
+                tab.ensure_view()
+                break
+        if not self._hydrate_queue:
+            self._hydrate_timer.stop()
+
+    def update_suggestions(self, text: str):
+        suggestions = self.history.suggest(text, self.settings["history"]["suggestions"])
+        self._suggestions.setStringList([url for url, _ in suggestions])
+        if suggestions:
+            self.completer.complete()
+
+    def on_tab_url_changed(self, tab: BrowserTab, url: QUrl):
+        # Arka plan sekmeleri adres çubuğunu değiştirmesin
+        if tab is self.current_tab():
+            self.addr.setText(url.toString())
+
+    def on_tab_progress(self, tab: BrowserTab, text: str):
+        if tab is self.current_tab():
+            self.progress_lbl.setText(text)
+            self.progress_lbl.setToolTip("")
+        if self.adblock is not None:
+            self.adblock_lbl.setText(f"🛡 {self.adblock.blocked}")
+            self.adblock_lbl.setToolTip(f"{self.adblock.checked} istekten {self.adblock.blocked} tanesi engellendi")
+
+    def on_tab_timing(self, tab: BrowserTab, record: Dict[str, Any]):
+        if self.pageload_log is not None:
+            self.pageload_log.append(record)
+        if tab is self.current_tab():
+            self.show_timing(record)
+
+    def show_timing(self, record: Optional[Dict[str, Any]]):
+        text, tip = timing_summary(record) if record else ("", "")
+        self.progress_lbl.setText(text)
+        self.progress_lbl.setToolTip(tip)
+
+    def tab_memory_mb(self, tabs: List[BrowserTab]) -> Dict[BrowserTab, float]:
+        # Aynı renderer sürecini paylaşan sekmeler belleği eşit böler
+        estimate = self.settings["tabs"]["tab_estimate_mb"]
+        by_pid: Dict[int, List[BrowserTab]] = {}
+        usage: Dict[BrowserTab, float] = {}
+        for tab in tabs:
+            if tab.view is None or tab.lifecycle_state() == QWebEnginePage.LifecycleState.Discarded:
+                usage[tab] = 0.0
+                continue
+            pid = tab.view.page().renderProcessPid() if psutil is not None else 0
+            if pid:
+                by_pid.setdefault(pid, []).append(tab)
+            else:
+                usage[tab] = estimate
+        samples = self.process_sampler.snapshot() if self.process_sampler is not None else {}
+        for pid, shared in by_pid.items():
+            if pid in samples:
+                rss = samples[pid]["rss_mb"]
+            else:
+                try:
+                    rss = psutil.Process(pid).memory_info().rss / (1024 * 1024)
+                except Exception:
+                    rss = estimate * len(shared)
+            for tab in shared:
+                usage[tab] = rss / len(shared)
+        return usage
+
+    def discard_tab(self, tab: BrowserTab):
+        if not tab.set_lifecycle_state(QWebEnginePage.LifecycleState.Discarded):
+            self.status.showMessage("Bu sekme şu an atılamaz (görünür, ses çalıyor ya da zaten atılmış).", 4000)
+        self.task_manager.refresh()
+
+    def revive_tab(self, tab: BrowserTab):
+        # Atılmış sayfa etkin duruma geçince Qt kendisi yeniden yükler
+        if tab.view is None:
+            tab.ensure_view()
+        else:
+            discarded = tab.lifecycle_state() == QWebEnginePage.LifecycleState.Discarded
+            tab.view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+            if not discarded:
+                tab.reload()
+        tab.last_active = time.monotonic()
+        self.task_manager.refresh()
+
+    def check_tab_lifecycle(self):
+        cfg = self.settings["tabs"]
+        now = time.monotonic()
+        current = self.current_tab()
+        tabs = self.all_tabs()
+        background = sorted((t for t in tabs if t is not current and t.view is not None),
+                            key=lambda t: t.last_active)
+        for tab in background:
+            idle = now - tab.last_active
+            if idle >= cfg["discard_after_s"]:
+                tab.set_lifecycle_state(QWebEnginePage.LifecycleState.Discarded)
+            elif idle >= cfg["freeze_after_s"]:
+                tab.set_lifecycle_state(QWebEnginePage.LifecycleState.Frozen)
+
+        # Bütçe aşıldıysa en uzun süredir kullanılmayandan başlayarak at
+        usage = self.tab_memory_mb(tabs)
+        total = sum(usage.values())
+        budget = cfg["memory_budget_mb"]
+        for tab in background:
+            if total <= budget:
+                break
+            if tab.set_lifecycle_state(QWebEnginePage.LifecycleState.Discarded):
+                total -= usage.get(tab, 0.0)
+        for tab in tabs:
+            idx = self.tabs.indexOf(tab)
+            state = tab.lifecycle_state()
+            tip = tab.url()
+            if state == QWebEnginePage.LifecycleState.Discarded:
+                tip += "\n(bellekten atıldı, açılınca yeniden yüklenir)"
+            elif state == QWebEnginePage.LifecycleState.Frozen:
+                tip += "\n(donduruldu)"
+            self.tabs.setTabToolTip(idx, tip)
+
     def close_tab(self, index: int):
         if self.tabs.count() == 1:
             self.close()
             return
+        tab = self.tabs.widget(index)
         self.tabs.removeTab(index)
+        if tab is self._active_tab:
+            self._active_tab = None
+        # removeTab sayfayı silmez; renderer belleği ancak widget silinince bırakılır
+        if tab is not None:
+            tab.deleteLater()
+        self.schedule_session_save()
 
     def close_current_tab(self):
         idx = self.tabs.currentIndex()
@@ -241,22 +2195,47 @@ class MainWindow(QMainWindow):
         if tab: tab.go_home()
 
     def on_tab_changed(self, idx: int):
-        v = self.current_view()
-        if not v:
+        tab = self.current_tab()
+        if not tab or self._restoring:
             return
-        self.addr.setText(v.url().toString())
-        self.set_tab_title(idx, v.title())
+        # Boşta kalma süresi sekmenin arka plana geçtiği andan sayılır
+        now = time.monotonic()
+        if self._active_tab is not None:
+            self._active_tab.last_active = now
+        self._active_tab = tab
+        # Tembel sekme ilk etkinleşmede yüklenir; dondurulan/atılan sayfayı Qt görünür olunca canlandırır
+        tab.ensure_view()
+        tab.last_active = now
+        self.addr.setText(tab.url())
+        self.show_timing(tab.last_timing)
+        self.set_tab_title(idx, tab.title())
+        self.schedule_session_save()
 
     def on_download_requested(self, req: QWebEngineDownloadRequest):
-        suggested = req.suggestedFileName() or "indirilen_dosya"
-        path, _ = QFileDialog.getSaveFileName(self, "Kaydet", str(Path.home() / "Downloads" / suggested))
-        if not path:
-            req.cancel()
+        if self.downloads.enqueue(req):
+            self.downloads.show()
+            self.status.showMessage(f"İndiriliyor: {req.downloadFileName()}", 5000)
+
+    def clear_cache(self):
+        self.profile.clearHttpCache()
+        self.status.showMessage("Önbellek temizlendi.", 3000)
+
+    def closeEvent(self, event):
+        pending = self.downloads.pending_count()
+        if pending and QMessageBox.question(
+                self, "İndirmeler", f"{pending} indirme henüz bitmedi. Yine de çıkılsın mı?") != QMessageBox.StandardButton.Yes:
+            event.ignore()
             return
-        req.setDownloadFileName(os.path.basename(path))
-        req.setDownloadDirectory(os.path.dirname(path))
-        req.accept()
-        self.status.showMessage(f"İndiriliyor: {os.path.basename(path)}", 5000)
+        self.save_session()
+        self.history.close()
+        self.bookmarks.store.close()
+        if self.process_sampler is not None:
+            self.process_sampler.stop()
+        if self.pageload_log is not None:
+            self.pageload_log.close()
+        if self.adblock is not None:
+            self.adblock.close()
+        super().closeEvent(event)
 
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
@@ -273,9 +2252,406 @@ class MainWindow(QMainWindow):
         QApplication.instance().setPalette(pal)
 
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def benchmark_history(entries: int = 100000, queries: int = 5000, seed: int = 42):
+    # Sentetik geçmişle trie öneri süresini ölç (Qt gerekmez)
+    import random
+
+    rng = random.Random(seed)
+    hosts = [f"{''.join(rng.choice('abcdefghijklmnoprstuvyz') for _ in range(rng.randint(3, 10)))}."
+             f"{rng.choice(['com', 'org', 'net', 'com.tr', 'io'])}" for _ in range(max(1, entries // 20))]
+    trie = FrecencyTrie()
+    start = time.perf_counter()
+    now = time.time()
+    decay = math.log(2) / (30 * 86400)
+    for i in range(entries):
+        url = f"https://{rng.choice(hosts)}/{'/'.join(str(rng.randint(0, 999)) for _ in range(rng.randint(1, 3)))}"
+        trie.update(url, f"Sayfa {i}", decay * (now - rng.uniform(0, 90 * 86400)) + rng.random())
+    build = time.perf_counter() - start
+
+    keys = [history_key(u) for u in trie.urls]
+    prefixes = []
+    for _ in range(queries):
+        key = rng.choice(keys)
+        prefixes.append(key[:rng.randint(1, min(len(key), 24))])
+    timings = []
+    for prefix in prefixes:
+        t = time.perf_counter()
+        trie.complete(prefix, 8)
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+    print(f"📊 {len(trie)} geçmiş kaydı, trie kurulumu {build:.2f} sn")
+    print(f"  öneri: ort {sum(timings) / len(timings) * 1e6:.1f} µs, "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1e6:.1f} µs, en kötü {timings[-1] * 1e6:.1f} µs")
+
+
+def make_test_site(directory: str, assets: int = 40, asset_kb: int = 64, seed: int = 42):
+    # Önbellek ölçümü için betik/stil/görsel dosyalarından oluşan yerel bir site üret
+    import random
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    tags = []
+    for i in range(assets):
+        kind = i % 3
+        filler = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(asset_kb * 1024))
+        if kind == 0:
+            name = f"betik{i}.js"
+            body = f"window.v{i} = '{filler}'.length;"
+            tags.append(f'<script src="{name}"></script>')
+        elif kind == 1:
+            name = f"stil{i}.css"
+            body = f".c{i}::after {{ content: '{filler}'; }}"
+            tags.append(f'<link rel="stylesheet" href="{name}">')
+        else:
+            name = f"gorsel{i}.svg"
+            body = (f'<svg xmlns="http://www.w3.org/2000/svg" width="32" height="32"><desc>{filler}</desc>'
+                    f'<rect width="32" height="32" fill="#{rng.randrange(0xffffff):06x}"/></svg>')
+            tags.append(f'<img src="{name}" width="32" height="32">')
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(body)
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+        f.write("<!doctype html><html><head><meta charset='utf-8'><title>Önbellek testi</title>"
+                + "".join(t for t in tags if not t.startswith("<img"))
+                + "</head><body>" + "".join(t for t in tags if t.startswith("<img")) + "</body></html>")
+
+
+def serve_directory(directory: str, latency_ms: float = 0.0):
+    # Önbelleğe alınabilir yanıtlar veren ve ağ gecikmesini taklit eden yerel sunucu
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class Handler(SimpleHTTPRequestHandler):
+        def end_headers(self):
+            self.send_header("Cache-Control", "public, max-age=3600")
+            super().end_headers()
+
+        def send_head(self):
+            self.server.hits += 1
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            return super().send_head()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=directory))
+    server.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_cache(site_dir: Optional[str] = None, runs: int = 3, latency_ms: float = 30.0):
+    # Yerel sitenin soğuk (boş profil) ve sıcak (aynı profil, yeni sayfa) yükleme sürelerini karşılaştır
+    import tempfile
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    work = tempfile.mkdtemp(prefix="pybrowser-bench-")
+    if not site_dir:
+        site_dir = os.path.join(work, "site")
+        make_test_site(site_dir)
+    server = serve_directory(site_dir, latency_ms)
+    url = QUrl(f"http://127.0.0.1:{server.server_address[1]}/index.html")
+    cfg = dict(load_settings()["profile"])
+
+    def load_once(profile: QWebEngineProfile) -> Tuple[float, int]:
+        page = QWebEnginePage(profile)
+        loop = QEventLoop()
+        page.loadFinished.connect(lambda _: loop.quit())
+        QTimer.singleShot(60000, loop.quit)
+        hits = server.hits
+        start = time.perf_counter()
+        page.load(url)
+        loop.exec()
+        elapsed = time.perf_counter() - start
+        page.deleteLater()
+        return elapsed, server.hits - hits
+
+    cold, warm = [], []
+    for i in range(runs):
+        cfg["name"] = f"bench-{i}"
+        profile = create_profile(cfg, os.path.join(work, f"profil{i}"), os.path.join(work, f"onbellek{i}"))
+        cold.append(load_once(profile))
+        warm.append(load_once(profile))
+    server.shutdown()
+    app.processEvents()
+
+    def summary(rows):
+        times = sorted(t for t, _ in rows)
+        return f"medyan {times[len(times) // 2] * 1000:.0f} ms, sunucu isteği {sum(h for _, h in rows) / len(rows):.0f}"
+
+    print(f"📊 {site_dir} · {runs} tekrar · istek başına {latency_ms:.0f} ms gecikme · önbellek: {cfg['cache_type']}")
+    print(f"  soğuk: {summary(cold)}")
+    print(f"  sıcak: {summary(warm)}")
+
+
+def read_url_list(path: str) -> List[str]:
+    # Satır başına bir adres; boş satırlar ve '#' yorumları atlanır, "-" standart girdi
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+class BatchSlot:
+    # Toplu yüklemede tek bir ekran dışı sayfa; ekran görüntüsü gerekiyorsa görünmez bir görünümde durur
+    def __init__(self, runner: "BatchRunner", profile: QWebEngineProfile, screenshots: bool):
+        self.runner = runner
+        self.view: Optional[QWebEngineView] = None
+        if screenshots:
+            self.view = QWebEngineView()
+            self.view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+            self.view.resize(1280, 800)
+            self.page = BrowserPage(None, profile, self.view)
+            self.view.setPage(self.page)
+            self.view.show()
+        else:
+            self.page = BrowserPage(None, profile)
+        self.page.loadFinished.connect(self.on_load_finished)
+        self.timeout = QTimer()
+        self.timeout.setSingleShot(True)
+        self.timeout.timeout.connect(self.on_timeout)
+        # Durdurulan yüklemenin loadFinished'i beklenir; gelmezse kısa süre sonra vazgeçilir
+        self.abort_grace = QTimer()
+        self.abort_grace.setSingleShot(True)
+        self.abort_grace.setInterval(2000)
+        self.abort_grace.timeout.connect(self.finish_abort)
+        self.record: Optional[Dict[str, Any]] = None
+        self._started = 0.0
+        self._pending = 0
+        self._aborting = False
+
+    def start(self, index: int, url: str):
+        self.record = {"i": index, "url": url}
+        self._started = time.perf_counter()
+        self.timeout.start(int(self.runner.timeout_s * 1000))
+        self.page.load(normalize_url(url))
+
+    def on_timeout(self):
+        if self.record is None:
+            return
+        self.page.triggerAction(QWebEnginePage.WebAction.Stop)
+        self.record.update(ok=False, error="timeout", load_ms=round((time.perf_counter() - self._started) * 1000, 1),
+                           final_url=self.page.url().toString())
+        # Sıradaki adres, durdurulan yüklemenin geç gelen loadFinished(false) sinyali
+        # ona yazılmasın diye bu sinyal geldikten sonra yüklenir
+        self._aborting = True
+        self.abort_grace.start()
+
+    def finish_abort(self):
+        if not self._aborting:
+            return
+        self._aborting = False
+        self.abort_grace.stop()
+        self.finish()
+
+    def on_load_finished(self, ok: bool):
+        if self._aborting:
+            self.finish_abort()
+            return
+        # Aynı yüklemenin tekrarlanan sinyali yok sayılır
+        if self.record is None or "load_ms" in self.record:
+            return
+        self.timeout.stop()
+        self.record.update(ok=ok, load_ms=round((time.perf_counter() - self._started) * 1000, 1),
+                           final_url=self.page.url().toString())
+        if not ok:
+            self.finish()
+            return
+        record = self.record
+        self._pending = 1
+        self.page.runJavaScript(PAGE_TIMING_JS, QWebEngineScript.ScriptWorldId.ApplicationWorld,
+                                lambda result: self.on_timing(record, result))
+
+    def on_timing(self, record: Dict[str, Any], result):
+        if record is not self.record:
+            return
+        try:
+            timing = json.loads(result)
+        except (TypeError, ValueError):
+            timing = {}
+        nav = timing.get("nav") or {}
+        record.update(resources=timing.get("resources"), resource_bytes=timing.get("resource_bytes"),
+                      ttfb=nav.get("ttfb"), fcp=timing.get("fcp"), nav=nav or None)
+        stem = f"{record['i']:04d}_{re.sub(r'[^A-Za-z0-9.-]+', '_', QUrl(record['final_url']).host() or 'sayfa')}"
+        if self.runner.html_dir:
+            self._pending += 1
+            path = os.path.join(self.runner.html_dir, stem + ".html")
+            self.page.toHtml(lambda html: self.on_html(record, path, html))
+        if self.view is not None and self.runner.screenshot_dir:
+            self._pending += 1
+            path = os.path.join(self.runner.screenshot_dir, stem + ".png")
+            # Son boyamanın bitmesi için kısa bir bekleme
+            QTimer.singleShot(self.runner.settle_ms, lambda: self.on_screenshot(record, path))
+        self.step_done(record)
+
+    def on_html(self, record: Dict[str, Any], path: str, html: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        record["html"] = path
+        self.step_done(record)
+
+    def on_screenshot(self, record: Dict[str, Any], path: str):
+        if self.view.grab().save(path):
+            record["screenshot"] = path
+        self.step_done(record)
+
+    def step_done(self, record: Dict[str, Any]):
+        if record is not self.record:
+            return
+        self._pending -= 1
+        if self._pending <= 0:
+            self.finish()
+
+    def finish(self):
+        self.timeout.stop()
+        record, self.record = self.record, None
+        self.runner.slot_done(self, record)
+
+
+class BatchRunner(QObject):
+    """Adres listesini N eşzamanlı ekran dışı sayfada yükler, sonuçları NDJSON olarak akıtır
+
+    Tüm sayfalar aynı profili paylaşır; varsayılan profil geçici bir klasörde
+    oluşturulur, böylece ölçümler kullanıcının önbelleğinden etkilenmez.
+    """
+
+    finished = Signal()
+
+    def __init__(self, urls: List[str], profile: QWebEngineProfile, out, concurrency: int = 4,
+                 timeout_s: float = 30.0, html_dir: str = "", screenshot_dir: str = "", settle_ms: int = 300):
+        super().__init__()
+        self.urls = urls
+        self.out = out
+        self.timeout_s = timeout_s
+        self.html_dir = html_dir
+        self.screenshot_dir = screenshot_dir
+        self.settle_ms = settle_ms
+        for d in (html_dir, screenshot_dir):
+            if d:
+                os.makedirs(d, exist_ok=True)
+        self.slots = [BatchSlot(self, profile, bool(screenshot_dir)) for _ in range(max(1, min(concurrency, len(urls))))]
+        self.results: List[Dict[str, Any]] = []
+        self._next = 0
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        if not self.urls:
+            self.finished.emit()
+            return
+        for slot in self.slots:
+            self.feed(slot)
+
+    def feed(self, slot: BatchSlot) -> bool:
+        if self._next >= len(self.urls):
+            return False
+        slot.start(self._next, self.urls[self._next])
+        self._next += 1
+        return True
+
+    def slot_done(self, slot: BatchSlot, record: Dict[str, Any]):
+        self.results.append(record)
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+        if not self.feed(slot) and len(self.results) == len(self.urls):
+            self.finished.emit()
+
+    def close(self):
+        # Sayfalar profilden önce yok edilmeli; olay döngüsü bittiği için silmeler elle işlenir
+        for slot in self.slots:
+            slot.timeout.stop()
+            slot.abort_grace.stop()
+            if slot.view is not None:
+                slot.view.close()
+                slot.view.deleteLater()
+            else:
+                slot.page.deleteLater()
+        self.slots.clear()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    def summary(self) -> str:
+        ok = sorted(r["load_ms"] for r in self.results if r.get("ok"))
+        text = f"{len(self.results)} sayfa, {len(ok)} başarılı, toplam {time.perf_counter() - self._started:.1f} sn"
+        if ok:
+            text += f" · yükleme medyan {ok[len(ok) // 2]:.0f} ms, p95 {ok[int(len(ok) * 0.95)]:.0f} ms, en kötü {ok[-1]:.0f} ms"
+        return text
+
+
+def run_batch(args, qt_args: List[str]) -> int:
+    import tempfile
+
+    urls = read_url_list(args.batch)
+    app = QApplication([sys.argv[0]] + qt_args)
+    cfg = dict(load_settings()["profile"])
+    if args.user_profile:
+        profile = create_profile(cfg)
+    else:
+        work = tempfile.mkdtemp(prefix="pybrowser-batch-")
+        cfg["name"] = "batch"
+        profile = create_profile(cfg, os.path.join(work, "profil"), os.path.join(work, "onbellek"))
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    runner = BatchRunner(urls, profile, out, args.concurrency, args.timeout, args.save_html or "",
+                         args.screenshot or "")
+    runner.finished.connect(app.quit)
+    QTimer.singleShot(0, runner.start)
+    app.exec()
+    runner.close()
+    profile.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    # Sonuçlar standart çıktıya akarken özet ayrı kalsın
+    print(runner.summary(), file=sys.stderr)
+    if out is not sys.stdout:
+        out.close()
+    return 0 if all(r.get("ok") for r in runner.results) else 1
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Py Tarayıcı")
+    parser.add_argument("--bench-history", type=int, metavar="N", help="N kayıtlık sentetik geçmişle öneri ölçümü")
+    parser.add_argument("--bench-adblock", metavar="DERLEM",
+                        help="Kayıtlı istek derleminde engelleme kararı süresini ölç (adblock.record_requests ile kaydedilir)")
+    parser.add_argument("--filters", nargs="*", help="Engelleme listeleri (varsayılan: ayarlardaki adblock.lists)")
+    parser.add_argument("--bench-cache", nargs="?", const="", metavar="SITE",
+                        help="Yerel sitenin soğuk/sıcak yükleme süresini ölç (SITE verilmezse örnek site üretilir)")
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="--bench-cache için istek başına yapay gecikme")
+    parser.add_argument("--batch", metavar="LISTE",
+                        help="Adres listesini (satır başına bir URL, '-' = stdin) ekran dışı sayfalarda yükle, NDJSON yaz")
+    parser.add_argument("--concurrency", type=int, default=4, help="--batch için eşzamanlı sayfa sayısı")
+    parser.add_argument("--timeout", type=float, default=30.0, help="--batch için sayfa başına zaman aşımı (sn)")
+    parser.add_argument("--save-html", metavar="KLASÖR", help="--batch: her sayfanın HTML'ini kaydet")
+    parser.add_argument("--screenshot", metavar="KLASÖR", help="--batch: her sayfanın ekran görüntüsünü kaydet")
+    parser.add_argument("--out", metavar="DOSYA", help="--batch: NDJSON çıktısı (varsayılan stdout)")
+    parser.add_argument("--user-profile", action="store_true",
+                        help="--batch: geçici profil yerine kullanıcının kalıcı profilini (çerez/önbellek) kullan")
+    # Qt'ye ait argümanlar (ör. --platform) QApplication'a bırakılır
+    args, qt_args = parser.parse_known_args()
+    if args.bench_history:
+        benchmark_history(args.bench_history)
+        return
+    if args.bench_adblock:
+        ad_cfg = load_settings()["adblock"]
+        benchmark_adblock(args.bench_adblock, args.filters or ad_cfg["lists"], os.path.expanduser(ad_cfg["cache_file"]))
+        return
+
+    # Renderer bayrakları QtWebEngine başlamadan ortamda olmalı
+    apply_renderer_flags(load_settings()["renderer"])
+    if args.batch:
+        sys.exit(run_batch(args, qt_args))
+    if args.bench_cache is not None:
+        QApplication([sys.argv[0]] + qt_args)
+        benchmark_cache(args.bench_cache or None, latency_ms=args.latency_ms)
+        return
+
+    app = QApplication([sys.argv[0]] + qt_args)
     app.setApplicationName("Py Tarayıcı")
     w = MainWindow()
     w.show()
     sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()